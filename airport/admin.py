@@ -1,4 +1,9 @@
+import json
+
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
 from airport.models import (
     Airport,
@@ -8,14 +13,127 @@ from airport.models import (
     Flight,
     Route,
     Order,
+    SeedFixture,
     Ticket
 )
 
-admin.site.register(Airport)
-admin.site.register(AirplaneType)
-admin.site.register(Airplane)
-admin.site.register(Route)
-admin.site.register(Crew)
-admin.site.register(Flight)
-admin.site.register(Order)
-admin.site.register(Ticket)
+
+class EstimatedCountPaginator(Paginator):
+    """Counts exactly up to a limit, then uses the planner's row estimate.
+
+    Keeps the changelist from running a full COUNT(*) over large tables.
+    """
+
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        bounded = queryset[: self.exact_count_limit + 1].count()
+        if bounded <= self.exact_count_limit:
+            return bounded
+
+        if connections[queryset.db].vendor != "postgresql":
+            return queryset.count()
+        plan = json.loads(queryset.explain(format="json"))
+        return max(int(plan[0]["Plan"]["Plan Rows"]), bounded)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class RouteListFilter(admin.SimpleListFilter):
+    title = "route"
+    parameter_name = "route"
+    field_path = "route_id"
+
+    def lookups(self, request, model_admin):
+        return [
+            (route.id, str(route))
+            for route in Route.objects.select_related("source", "destination")
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.field_path: self.value()})
+        return queryset
+
+
+class TicketRouteListFilter(RouteListFilter):
+    field_path = "flight__route_id"
+
+
+@admin.register(Airport)
+class AirportAdmin(admin.ModelAdmin):
+    list_display = ("name", "closest_big_city", "latitude", "longitude")
+    search_fields = ("name", "closest_big_city")
+
+
+@admin.register(AirplaneType)
+class AirplaneTypeAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Airplane)
+class AirplaneAdmin(admin.ModelAdmin):
+    list_display = ("name", "airplane_type", "rows", "seats_in_row")
+    list_select_related = ("airplane_type",)
+    search_fields = ("name",)
+    autocomplete_fields = ("airplane_type",)
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_display = ("id", "source", "destination", "distance")
+    list_select_related = ("source", "destination")
+    search_fields = ("source__name", "destination__name")
+    autocomplete_fields = ("source", "destination")
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("first_name", "last_name")
+
+
+@admin.register(Flight)
+class FlightAdmin(LargeTableAdmin):
+    list_display = ("id", "route", "airplane", "departure_time", "arrival_time", "fare")
+    list_select_related = ("route__source", "route__destination", "airplane")
+    list_filter = (("departure_time", admin.DateFieldListFilter), RouteListFilter)
+    autocomplete_fields = ("route", "airplane", "crews")
+
+
+class TicketInline(admin.TabularInline):
+    model = Ticket
+    extra = 0
+    raw_id_fields = ("flight",)
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at", "total_price")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    inlines = (TicketInline,)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "flight", "row", "seat", "order")
+    list_select_related = ("flight", "order")
+    list_filter = (
+        ("flight__departure_time", admin.DateFieldListFilter),
+        TicketRouteListFilter,
+    )
+    raw_id_fields = ("flight", "order")
+    # The model orders by (row, seat), which has no index of its own.
+    ordering = ("-id",)
+
+
+@admin.register(SeedFixture)
+class SeedFixtureAdmin(admin.ModelAdmin):
+    list_display = ("name", "checksum", "objects_count", "applied_at")
+    readonly_fields = ("name", "checksum", "objects_count", "applied_at")
@@ -0,0 +1,109 @@
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.models import Flight, FlightArchive, RouteDailyLoad, Ticket, TicketArchive
+
+
+def departure_date(flight) -> date:
+    departure_time = flight.departure_time
+    if isinstance(departure_time, str):
+        departure_time = parse_datetime(departure_time)
+    if isinstance(departure_time, datetime):
+        if timezone.is_aware(departure_time):
+            departure_time = timezone.localtime(departure_time)
+        return departure_time.date()
+    return departure_time
+
+
+def apply_load_delta(route_id, day, flights=0, seats_offered=0, seats_sold=0):
+    RouteDailyLoad.objects.get_or_create(route_id=route_id, date=day)
+    RouteDailyLoad.objects.filter(route_id=route_id, date=day).update(
+        flights=F("flights") + flights,
+        seats_offered=F("seats_offered") + seats_offered,
+        seats_sold=F("seats_sold") + seats_sold,
+    )
+
+
+# Archived flights still count towards their route's history.
+FLIGHT_SOURCES = ((Flight, Ticket), (FlightArchive, TicketArchive))
+
+
+def refresh_route_day(route_id, day):
+    totals = {"flights": 0, "seats_offered": 0, "seats_sold": 0}
+    for flight_model, ticket_model in FLIGHT_SOURCES:
+        flights = flight_model.objects.filter(route_id=route_id, departure_time__date=day)
+        flight_totals = flights.aggregate(
+            flights=Count("id"),
+            seats_offered=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+        )
+        totals["flights"] += flight_totals["flights"]
+        totals["seats_offered"] += flight_totals["seats_offered"] or 0
+        if flight_totals["flights"]:
+            totals["seats_sold"] += ticket_model.objects.filter(flight__in=flights).count()
+
+    if not totals["flights"]:
+        RouteDailyLoad.objects.filter(route_id=route_id, date=day).delete()
+        return
+
+    RouteDailyLoad.objects.update_or_create(
+        route_id=route_id, date=day, defaults=totals
+    )
+
+
+def refresh_airplane_route_days(airplane_ids):
+    """Refreshes the rollups of every day the airplanes fly, after a capacity change"""
+    route_days = set()
+    for flight_model, _ in FLIGHT_SOURCES:
+        route_days.update(
+            flight_model.objects.filter(airplane_id__in=airplane_ids)
+            .annotate(day=TruncDate("departure_time"))
+            .values_list("route_id", "day")
+            .order_by()
+            .distinct()
+        )
+    for route_id, day in route_days:
+        refresh_route_day(route_id, day)
+
+
+def rebuild_route_daily_loads() -> int:
+    rollups = {}
+
+    for flight_model, ticket_model in FLIGHT_SOURCES:
+        flight_totals = (
+            flight_model.objects.annotate(day=TruncDate("departure_time"))
+            .values("route_id", "day")
+            .annotate(
+                flights=Count("id"),
+                seats_offered=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+            )
+            .order_by()
+        )
+        for row in flight_totals:
+            rollup = rollups.setdefault(
+                (row["route_id"], row["day"]),
+                RouteDailyLoad(route_id=row["route_id"], date=row["day"]),
+            )
+            rollup.flights += row["flights"]
+            rollup.seats_offered += row["seats_offered"] or 0
+
+        ticket_totals = (
+            ticket_model.objects.annotate(day=TruncDate("flight__departure_time"))
+            .values("flight__route_id", "day")
+            .annotate(seats_sold=Count("id"))
+            .order_by()
+        )
+        for row in ticket_totals:
+            rollup = rollups.get((row["flight__route_id"], row["day"]))
+            if rollup is not None:
+                rollup.seats_sold += row["seats_sold"]
+
+    with transaction.atomic():
+        RouteDailyLoad.objects.all().delete()
+        RouteDailyLoad.objects.bulk_create(rollups.values(), batch_size=1000)
+
+    return len(rollups)
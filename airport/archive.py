@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from airport.board import airport_board
+from airport.change_feed import DELETED, record_changes
+from airport.flight_search import invalidate_availability, invalidate_flight_searches
+from airport.models import Flight, FlightArchive, Ticket, TicketArchive
+from airport.outbox import flight_payload, publish_many
+from airport.schedule import airplane_rotation, crew_roster
+
+PARTITIONED_MODELS = (FlightArchive, TicketArchive)
+
+
+def month_start(moment) -> date:
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def ensure_archive_partitions(months):
+    """Create the monthly archive partitions for the given month starts"""
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        for month in sorted(set(months)):
+            for model in PARTITIONED_MODELS:
+                table = model._meta.db_table
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table}_y{month:%Y}m{month:%m} "
+                    f"PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+                    [month.isoformat(), next_month(month).isoformat()],
+                )
+
+
+def _delete_rows(model, column, ids):
+    # Raw deletes on purpose: archiving is not a cancellation, so the
+    # post_delete handlers (load rollups, schedule indexes) must not run.
+    table = model._meta.db_table
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", ids)
+
+
+def archive_flight_batch(cutoff, batch_size) -> tuple:
+    with transaction.atomic():
+        flights = list(
+            Flight.objects.select_for_update()
+            .filter(arrival_time__lt=cutoff)
+            .order_by("id")
+            .prefetch_related("crews")[:batch_size]
+        )
+        if not flights:
+            return 0, 0
+
+        flight_ids = [flight.id for flight in flights]
+        departures = {flight.id: flight.departure_time for flight in flights}
+        tickets = list(Ticket.objects.filter(flight_id__in=flight_ids))
+
+        ensure_archive_partitions(month_start(flight.departure_time) for flight in flights)
+        FlightArchive.objects.bulk_create(
+            [
+                FlightArchive(
+                    id=flight.id,
+                    route_id=flight.route_id,
+                    airplane_id=flight.airplane_id,
+                    departure_time=flight.departure_time,
+                    arrival_time=flight.arrival_time,
+                    crew_ids=[crew.id for crew in flight.crews.all()],
+                    fare=flight.fare,
+                )
+                for flight in flights
+            ],
+            batch_size=batch_size,
+        )
+        TicketArchive.objects.bulk_create(
+            [
+                TicketArchive(
+                    id=ticket.id,
+                    row=ticket.row,
+                    seat=ticket.seat,
+                    flight_id=ticket.flight_id,
+                    order_id=ticket.order_id,
+                    departure_time=departures[ticket.flight_id],
+                )
+                for ticket in tickets
+            ],
+            batch_size=batch_size,
+        )
+
+        _delete_rows(Ticket, "flight_id", flight_ids)
+        _delete_rows(Flight.crews.through, "flight_id", flight_ids)
+        _delete_rows(Flight, "id", flight_ids)
+        record_changes(Flight, flight_ids, DELETED)
+
+        publish_many(
+            ("flight.archived", "flight", flight.id, flight_payload(flight))
+            for flight in flights
+        )
+        transaction.on_commit(crew_roster.invalidate)
+        transaction.on_commit(airplane_rotation.invalidate)
+        transaction.on_commit(airport_board.invalidate)
+        transaction.on_commit(invalidate_flight_searches)
+        transaction.on_commit(lambda: invalidate_availability(flight_ids))
+
+    return len(flights), len(tickets)
+
+
+def archive_flights(older_than_days, batch_size=500):
+    """Move completed flights and their tickets to the archive tables.
+
+    Runs in batches of batch_size flights, each in its own transaction, and
+    yields (flights, tickets) archived per batch.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    while True:
+        archived = archive_flight_batch(cutoff, batch_size)
+        if not archived[0]:
+            return
+        yield archived
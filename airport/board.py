@@ -0,0 +1,153 @@
+from bisect import bisect_right, insort
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from airport.models import Flight
+from airport.schedule import VersionedScheduleIndex
+
+DEPARTURES = "departures"
+ARRIVALS = "arrivals"
+BOARD_KINDS = (DEPARTURES, ARRIVALS)
+
+BOARD_FIELDS = (
+    "id",
+    "route_id",
+    "route__source_id",
+    "route__destination_id",
+    "route__source__name",
+    "route__destination__name",
+    "airplane__name",
+    "departure_time",
+    "arrival_time",
+)
+
+
+class AirportBoard:
+    """Per-airport departures and arrivals sorted by (time, flight id).
+
+    Each board is a sorted list of (timestamp, flight_id) keys, so a page
+    is a bisect plus a slice; the key of its last row is the cursor for the
+    next one and stays valid while flights are added or removed.
+    """
+
+    def __init__(self):
+        self._boards = {}
+        self._rows = {}
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, values):
+        flight_id = values["id"]
+        self.remove(flight_id)
+        self._rows[flight_id] = {
+            "id": flight_id,
+            "route": values["route_id"],
+            "source": values["route__source__name"],
+            "destination": values["route__destination__name"],
+            "airplane": values["airplane__name"],
+            "departure_time": values["departure_time"],
+            "arrival_time": values["arrival_time"],
+        }
+        self._keys[flight_id] = [
+            (
+                (values["route__source_id"], DEPARTURES),
+                (values["departure_time"].timestamp(), flight_id),
+            ),
+            (
+                (values["route__destination_id"], ARRIVALS),
+                (values["arrival_time"].timestamp(), flight_id),
+            ),
+        ]
+        for board, key in self._keys[flight_id]:
+            insort(self._boards.setdefault(board, []), key)
+
+    def remove(self, flight_id):
+        self._rows.pop(flight_id, None)
+        for board, key in self._keys.pop(flight_id, ()):
+            keys = self._boards[board]
+            position = bisect_right(keys, key) - 1
+            if position >= 0 and keys[position] == key:
+                del keys[position]
+
+    def page(self, airport_id, kind, after, limit) -> tuple:
+        """Return (rows, cursor of the next page or None) after the (time, id) key"""
+        keys = self._boards.get((airport_id, kind), [])
+        start = bisect_right(keys, after)
+        chunk = keys[start:start + limit]
+        following = chunk[-1] if start + limit < len(keys) else None
+        return [self._rows[flight_id] for _, flight_id in chunk], following
+
+
+def board_lookback() -> timedelta:
+    return timedelta(minutes=getattr(settings, "AIRPORT_BOARD_LOOKBACK_MINUTES", 30))
+
+
+def encode_cursor(key) -> str:
+    return f"{key[0]!r}:{key[1]}"
+
+
+def decode_cursor(cursor) -> tuple:
+    timestamp, _, flight_id = cursor.partition(":")
+    return float(timestamp), int(flight_id)
+
+
+class AirportBoardIndex(VersionedScheduleIndex):
+    """Upcoming departures and arrivals of every airport.
+
+    Holds flights that departed or arrive no earlier than
+    AIRPORT_BOARD_LOOKBACK_MINUTES before the build; rows that age out
+    later are simply never reached by a page starting at the current time.
+    """
+
+    version_key = "airport:airport_board_version"
+
+    @staticmethod
+    def rows(queryset):
+        return queryset.order_by().values(*BOARD_FIELDS)
+
+    def build(self) -> AirportBoard:
+        board = AirportBoard()
+        since = timezone.now() - board_lookback()
+        flights = Flight.objects.filter(
+            Q(departure_time__gte=since) | Q(arrival_time__gte=since)
+        )
+        for values in self.rows(flights).iterator():
+            board.add(values)
+        return board
+
+    def page(self, airport_id, kind, cursor=None, limit=50) -> dict:
+        if cursor is None:
+            after = ((timezone.now() - board_lookback()).timestamp(), 0)
+        else:
+            after = decode_cursor(cursor)
+        flights, following = self.index().page(airport_id, kind, after, limit)
+        return {
+            "airport": airport_id,
+            "kind": kind,
+            "flights": flights,
+            "next": None if following is None else encode_cursor(following),
+        }
+
+    def refresh(self, flight_ids):
+        """Reload the given flights after they were saved or deleted"""
+        flight_ids = list(flight_ids)
+        found = list(self.rows(Flight.objects.filter(id__in=flight_ids)))
+
+        def change(board):
+            for flight_id in flight_ids:
+                board.remove(flight_id)
+            for values in found:
+                board.add(values)
+
+        self.apply(change)
+
+    def remove(self, flight_id):
+        self.apply(lambda board: board.remove(flight_id))
+
+
+airport_board = AirportBoardIndex()
@@ -0,0 +1,236 @@
+import copy
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.dispatch import Signal
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+from airport.relations import prefetch_relations
+
+# Sent after bulk_create/bulk_update, which skip post_save and m2m_changed.
+# Receives instances, created and, for updates, previous: {pk: old copy}
+# and update_fields: the names of the fields and relations written.
+post_bulk_save = Signal()
+
+
+class BulkCreateUpdateMixin:
+    """Adds a /bulk/ action taking a list payload.
+
+    POST creates, PUT/PATCH update items identified by "id". The whole batch
+    is validated first and saved in one transaction with bulk_create and
+    bulk_update; if any item is invalid nothing is saved and the response
+    holds one error dict per item, in payload order.
+    """
+
+    bulk_max_items = 1000
+    bulk_batch_size = 500
+    # Unique fields checked once for the whole batch by validate_bulk_unique
+    # instead of one UniqueValidator query per item.
+    bulk_unique_fields = ()
+
+    @action(detail=False, methods=["post", "put", "patch"], url_path="bulk")
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"non_field_errors": ["Expected a non-empty list of items."]})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                {"non_field_errors": [f"At most {self.bulk_max_items} items are allowed."]}
+            )
+
+        if request.method == "POST":
+            return self.bulk_create(items)
+        return self.bulk_update(items, partial=request.method == "PATCH")
+
+    def get_bulk_serializers(self, items, instances=None, partial=False):
+        context = self.get_serializer_context()
+        context["batched_relations"] = {}
+        serializers = [
+            self.get_serializer(
+                instance=None if instances is None else instances[i],
+                data=item,
+                partial=partial,
+                context=context,
+            )
+            for i, item in enumerate(items)
+        ]
+        for serializer in serializers:
+            for name in self.bulk_unique_fields:
+                field = serializer.fields[name]
+                field.validators = [
+                    validator
+                    for validator in field.validators
+                    if not isinstance(validator, UniqueValidator)
+                ]
+        prefetch_relations(serializers[0], items)
+        return serializers
+
+    def validate_bulk(self, validated_data, instances=None) -> list:
+        """Cross-item checks; return one error dict per item"""
+        return [{} for _ in validated_data]
+
+    def validate_bulk_unique(self, validated_data, instances=None) -> list:
+        """Per-item errors for bulk_unique_fields repeated in the payload or taken.
+
+        One query per field finds the rows already holding the payload values;
+        a value is free again if its row is in the batch and gets a new one.
+        """
+        model = self.get_queryset().model
+        errors = [{} for _ in validated_data]
+        own = [instance.pk for instance in instances] if instances else [None] * len(errors)
+        for name in self.bulk_unique_fields:
+            field = model._meta.get_field(name)
+            values, new_values = {}, {}
+            for position, attrs in enumerate(validated_data):
+                if name in attrs:
+                    values.setdefault(attrs[name], []).append(position)
+                    new_values[own[position]] = attrs[name]
+            taken = {
+                value: pk
+                for pk, value in model._default_manager.filter(
+                    **{f"{name}__in": list(values)}
+                ).values_list("pk", name)
+                if new_values.get(pk, value) == value
+            }
+            for value, positions in values.items():
+                for position in positions[1:]:
+                    errors[position].setdefault(name, []).append(
+                        f"Duplicates item {positions[0]} of this payload."
+                    )
+                for position in positions:
+                    if taken.get(value, own[position]) != own[position]:
+                        errors[position].setdefault(name, []).append(
+                            f"{model._meta.verbose_name} with this "
+                            f"{field.verbose_name} already exists."
+                        )
+        return errors
+
+    def bulk_create(self, items):
+        serializers = self.get_bulk_serializers(items)
+        errors = [{} if serializer.is_valid() else serializer.errors for serializer in serializers]
+        if not any(errors):
+            validated_data = [serializer.validated_data for serializer in serializers]
+            errors = self.validate_bulk(validated_data)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        many_to_many = self._many_to_many(model)
+        objs, relations = [], []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            relations.append({name: attrs.pop(name) for name in many_to_many if name in attrs})
+            objs.append(model(**attrs))
+
+        errors = self._clean(objs)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            model.objects.bulk_create(objs, batch_size=self.bulk_batch_size)
+            self._set_many_to_many(model, objs, relations)
+            post_bulk_save.send(sender=model, instances=objs, created=True)
+
+        prefetch_related_objects(objs, *many_to_many)
+        data = self.get_serializer(objs, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items, partial=False):
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        found = self.get_queryset().filter(pk__in=[pk for pk in ids if isinstance(pk, int)])
+        found = {instance.pk: instance for instance in found}
+
+        missing = [{} if pk in found else {"id": ["Not found."]} for pk in ids]
+        if any(missing):
+            return Response(missing, status=status.HTTP_400_BAD_REQUEST)
+
+        instances = [found[pk] for pk in ids]
+        serializers = self.get_bulk_serializers(items, instances=instances, partial=partial)
+        errors = [{} if serializer.is_valid() else serializer.errors for serializer in serializers]
+        if not any(errors):
+            validated_data = [serializer.validated_data for serializer in serializers]
+            errors = self.validate_bulk(validated_data, instances=instances)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        many_to_many = self._many_to_many(model)
+        previous = {instance.pk: copy.copy(instance) for instance in instances}
+        fields, relations = set(), []
+        for instance, attrs in zip(instances, validated_data):
+            attrs = dict(attrs)
+            relations.append({name: attrs.pop(name) for name in many_to_many if name in attrs})
+            for name, value in attrs.items():
+                setattr(instance, name, value)
+                fields.add(name)
+
+        errors = self._clean(instances)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            if fields:
+                model.objects.bulk_update(instances, fields, batch_size=self.bulk_batch_size)
+            self._set_many_to_many(model, instances, relations, replace=True)
+            post_bulk_save.send(
+                sender=model,
+                instances=instances,
+                created=False,
+                previous=previous,
+                update_fields=fields | {name for relation in relations for name in relation},
+            )
+
+        for instance in instances:
+            instance._prefetched_objects_cache = {}
+        prefetch_related_objects(instances, *many_to_many)
+        data = self.get_serializer(instances, many=True).data
+        return Response(data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _many_to_many(model) -> list:
+        return [field.name for field in model._meta.many_to_many]
+
+    @staticmethod
+    def _clean(objs) -> list:
+        errors = []
+        for obj in objs:
+            try:
+                obj.clean()
+                errors.append({})
+            except DjangoValidationError as error:
+                errors.append(
+                    error.message_dict
+                    if hasattr(error, "error_dict")
+                    else {"non_field_errors": error.messages}
+                )
+        return errors
+
+    def _set_many_to_many(self, model, objs, relations, replace=False):
+        for name in self._many_to_many(model):
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+            changed = [
+                (obj, related[name]) for obj, related in zip(objs, relations) if name in related
+            ]
+            if not changed:
+                continue
+
+            if replace:
+                through.objects.filter(
+                    **{f"{source}__in": [obj.pk for obj, _ in changed]}
+                ).delete()
+            through.objects.bulk_create(
+                [
+                    through(**{source: obj.pk, target: value.pk})
+                    for obj, values in changed
+                    for value in {value.pk: value for value in values}.values()
+                ],
+                batch_size=self.bulk_batch_size,
+            )
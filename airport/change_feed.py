@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from airport.models import Airplane, Airport, ChangeLogEntry, Flight, Route
+from airport.serializers import (
+    AirplaneSerializer,
+    AirportSerializer,
+    FlightSerializer,
+    RouteSerializer,
+)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# entity name: (model, serializer for its current state)
+ENTITIES = {
+    "airport": (Airport, AirportSerializer),
+    "route": (Route, RouteSerializer),
+    "airplane": (Airplane, AirplaneSerializer),
+    "flight": (Flight, FlightSerializer),
+}
+ENTITY_NAMES = {model: name for name, (model, _) in ENTITIES.items()}
+
+
+def record_changes(model, ids, action):
+    """Log the changes once the current transaction commits.
+
+    Writing the entries on commit gives them sequence numbers in commit
+    order, however long the transaction ran, so a consumer never moves its
+    cursor past a change that is still to become visible. A process that
+    dies between the commit and the write loses those entries; the next
+    change to the same entity carries its current state again.
+    """
+    entity = ENTITY_NAMES[model]
+    ids = list(ids)
+
+    def write():
+        now = timezone.now()
+        ChangeLogEntry.objects.bulk_create(
+            [
+                ChangeLogEntry(entity=entity, entity_id=entity_id, action=action, created_at=now)
+                for entity_id in ids
+            ]
+        )
+
+    if ids:
+        transaction.on_commit(write)
+
+
+def settle_delay() -> timedelta:
+    return timedelta(seconds=getattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 5))
+
+
+def read_changes(since, limit, now=None) -> dict:
+    """Entity deltas after the since cursor, oldest first.
+
+    Entries are written right after their transaction commits, each in a
+    short transaction of its own, so a lower number can only appear after a
+    higher one was read while two of those writes overlap. Entries younger
+    than CHANGE_FEED_SETTLE_SECONDS are held back until any such write has
+    finished.
+
+    Several changes to one entity within the page are collapsed into its
+    latest action, and non-deleted entities carry their current state.
+    """
+    now = now or timezone.now()
+    entries = list(
+        ChangeLogEntry.objects.filter(id__gt=since, created_at__lte=now - settle_delay())
+        .order_by("id")
+        .values_list("id", "entity", "entity_id", "action")[:limit]
+    )
+
+    latest = {}
+    for seq, entity, entity_id, action in entries:
+        previous = latest.pop((entity, entity_id), None)
+        if previous and previous[1] == CREATED and action == UPDATED:
+            action = CREATED
+        latest[(entity, entity_id)] = (seq, action)
+
+    current = {}
+    for entity, (model, serializer_class) in ENTITIES.items():
+        ids = [
+            entity_id
+            for (name, entity_id), (_, action) in latest.items()
+            if name == entity and action != DELETED
+        ]
+        if ids:
+            instances = model.objects.filter(pk__in=ids)
+            if model is Flight:
+                instances = instances.prefetch_related("crews")
+            current[entity] = {
+                data["id"]: data
+                for data in serializer_class(instances, many=True).data
+            }
+
+    changes = []
+    for (entity, entity_id), (seq, action) in latest.items():
+        data = current.get(entity, {}).get(entity_id)
+        if data is None:
+            action = DELETED
+        changes.append(
+            {"seq": seq, "entity": entity, "id": entity_id, "action": action, "data": data}
+        )
+
+    return {
+        "changes": changes,
+        "next": entries[-1][0] if entries else since,
+        "has_more": len(entries) == limit,
+    }
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the default cache is not shared between worker processes.
+
+    The crew roster, airplane rotation, airport board and reference tables
+    keep their version counters there, and the single-flight lock and
+    idempotency keys live there too; with a process-local backend a change
+    made in one worker is never seen by the others.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process.",
+            hint=(
+                "Set REDIS_URL or configure a shared backend such as DatabaseCache, "
+                "or workers will serve stale rosters, reference tables and boards "
+                "and compute coalesced values in parallel."
+            ),
+            id="airport.W001",
+        )
+    ]
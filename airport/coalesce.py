@@ -0,0 +1,125 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Computes each cached value once per key, however many requests miss it.
+
+    Concurrent misses in one process wait on the thread already computing
+    the key. Across processes the computing request holds a short lock in
+    the shared cache and the others poll the cache for its result, falling
+    back to computing it themselves after SINGLE_FLIGHT_WAIT_TIMEOUT seconds.
+
+    Entries stay in the cache for stale_ttl seconds after they go stale;
+    a stale hit is returned as is while the one request that wins the lock
+    recomputes it.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def get(self, key, compute, ttl, stale_ttl=0):
+        entry = cache.get(key)
+        if entry is not None:
+            if entry["fresh_until"] > time.time():
+                return entry["value"]
+            if key in self._calls or not cache.add(
+                self.lock_key(key), 1, self.lock_timeout()
+            ):
+                return entry["value"]
+            return self._coalesced(key, lambda: self._refresh(key, compute, ttl, stale_ttl))
+        return self._coalesced(key, lambda: self._fill(key, compute, ttl, stale_ttl))
+
+    def expire(self, key, stale_ttl=0):
+        """Marks an entry stale, so it is served only while it is recomputed"""
+        entry = cache.get(key)
+        if entry is not None:
+            entry["fresh_until"] = 0
+            cache.set(key, entry, stale_ttl)
+
+    @staticmethod
+    def lock_key(key) -> str:
+        return f"{key}:lock"
+
+    @staticmethod
+    def lock_timeout():
+        return _setting("SINGLE_FLIGHT_LOCK_TIMEOUT", 10)
+
+    def _coalesced(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def _fill(self, key, compute, ttl, stale_ttl):
+        if cache.add(self.lock_key(key), 1, self.lock_timeout()):
+            return self._refresh(key, compute, ttl, stale_ttl)
+
+        deadline = time.monotonic() + _setting("SINGLE_FLIGHT_WAIT_TIMEOUT", 5)
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry["value"]
+        return self._store(key, compute(), ttl, stale_ttl)
+
+    def _refresh(self, key, compute, ttl, stale_ttl):
+        """Computes and stores the value, releasing the lock this request holds"""
+        try:
+            return self._store(key, compute(), ttl, stale_ttl)
+        finally:
+            cache.delete(self.lock_key(key))
+
+    @staticmethod
+    def _store(key, value, ttl, stale_ttl):
+        cache.set(key, {"value": value, "fresh_until": time.time() + ttl}, ttl + stale_ttl)
+        return value
+
+
+single_flight = SingleFlight()
+
+
+def flight_detail_cache_key(flight_id) -> str:
+    return f"airport:flight_detail:{flight_id}"
+
+
+def flight_detail_ttls() -> tuple:
+    return (
+        _setting("FLIGHT_DETAIL_CACHE_TTL", 30),
+        _setting("FLIGHT_DETAIL_STALE_TTL", 30),
+    )
@@ -0,0 +1,414 @@
+import csv
+import heapq
+import io
+import json
+import math
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from airport.analytics import rebuild_route_daily_loads
+from airport.board import airport_board
+from airport.flight_search import invalidate_flight_searches
+from airport.geo import airport_index, haversine_km
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.pricing import compute_fares
+from airport.reference_data import REFERENCE_TABLES
+from airport.schedule import airplane_rotation, crew_roster
+
+# name: (rows, seats_in_row, cruise speed km/h, longest route km)
+AIRPLANE_TYPES = {
+    "Regional jet": (20, 4, 700, 1500),
+    "Narrow-body": (30, 6, 800, 5000),
+    "Wide-body": (45, 9, 880, math.inf),
+}
+ORDER_SIZES = np.array([1, 2, 3, 4])
+ORDER_SIZE_WEIGHTS = np.array([0.55, 0.25, 0.12, 0.08])
+DATASET_PASSWORD = "password"
+
+
+class TableWriter:
+    """Batched inserts of plain rows: COPY on PostgreSQL, executemany elsewhere"""
+
+    def __init__(self, model, fields, batch_size):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.batch_size = batch_size
+        self.rows = []
+        self.written = 0
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in self.fields)
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.copy_expert(
+                    f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                    self._csv(self.rows),
+                )
+            else:
+                placeholders = ", ".join(["%s"] * len(self.fields))
+                cursor.executemany(
+                    f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                    self._prepared(self.rows, cursor.db),
+                )
+        self.written += len(self.rows)
+        self.rows = []
+
+    def _prepared(self, rows, db):
+        # Only dates and decimals need adapting; ints and strings pass as is.
+        adapt = [
+            (position, field)
+            for position, field in enumerate(self.fields)
+            if isinstance(field, (models.DateTimeField, models.DecimalField))
+        ]
+        if not adapt:
+            return rows
+        prepared = []
+        for row in rows:
+            row = list(row)
+            for position, field in adapt:
+                row[position] = field.get_db_prep_value(row[position], db)
+            prepared.append(row)
+        return prepared
+
+    @staticmethod
+    def _csv(rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                [
+                    "\\N" if value is None
+                    else json.dumps(value) if isinstance(value, (list, dict))
+                    else value.isoformat() if isinstance(value, datetime)
+                    else value
+                    for value in row
+                ]
+            )
+        buffer.seek(0)
+        return buffer
+
+
+def next_id(model) -> int:
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+def hub_and_spoke_routes(rng, latitudes, longitudes, hubs):
+    """Hubs are fully connected; each spoke links to its nearest hub and
+    sometimes to a second one. Every route is flown in both directions."""
+    airports = len(latitudes)
+    pairs = {(a, b) for a in range(hubs) for b in range(hubs) if a != b}
+    for spoke in range(hubs, airports):
+        distances = haversine_km(
+            np.full(hubs, latitudes[spoke]),
+            np.full(hubs, longitudes[spoke]),
+            latitudes[:hubs],
+            longitudes[:hubs],
+        )
+        linked = [int(np.argmin(distances))]
+        if hubs > 1 and rng.random() < 0.3:
+            linked.append(int(rng.choice([hub for hub in range(hubs) if hub != linked[0]])))
+        for hub in linked:
+            pairs.update({(spoke, hub), (hub, spoke)})
+
+    pairs = sorted(pairs)
+    sources = np.array([source for source, _ in pairs])
+    destinations = np.array([destination for _, destination in pairs])
+    distances = np.maximum(
+        np.rint(
+            haversine_km(
+                latitudes[sources],
+                longitudes[sources],
+                latitudes[destinations],
+                longitudes[destinations],
+            )
+        ),
+        50,
+    ).astype(int)
+    weights = np.where((sources < hubs) & (destinations < hubs), 4.0, 1.0)
+    return sources, destinations, distances, weights / weights.sum()
+
+
+def distribute_tickets(rng, capacities, tickets) -> np.ndarray:
+    """Seats sold per flight, left-skewed load factors summing to tickets"""
+    tickets = min(tickets, int(capacities.sum()))
+    sold = np.minimum(np.rint(capacities * rng.beta(5, 2, len(capacities))), capacities)
+    if sold.sum():
+        sold = np.minimum(np.rint(sold * tickets / sold.sum()), capacities)
+    sold = sold.astype(int)
+
+    difference = tickets - int(sold.sum())
+    while difference:
+        step = 1 if difference > 0 else -1
+        candidates = np.flatnonzero(sold < capacities if step > 0 else sold > 0)
+        chosen = rng.choice(candidates, min(abs(difference), len(candidates)), replace=False)
+        sold[chosen] += step
+        difference -= step * len(chosen)
+    return sold
+
+
+def generate_dataset(
+    airports=50,
+    flights=10000,
+    tickets=200000,
+    users=None,
+    days=30,
+    start=None,
+    seed=42,
+    batch_size=10000,
+    log=None,
+) -> dict:
+    """Write a synthetic network straight into the tables.
+
+    The same arguments and seed produce the same network on an empty
+    database. Model signals are skipped, so the load rollups and in-process
+    indexes are rebuilt at the end.
+    """
+    log = log or (lambda message: None)
+    rng = np.random.default_rng(seed)
+    airports = max(airports, 2)
+    users = max(users or tickets // 6, 1)
+    start = start or timezone.localdate()
+    start = timezone.make_aware(datetime.combine(start, datetime.min.time()))
+    now = timezone.now()
+    started = time.monotonic()
+    written = {}
+
+    def writer(model, *fields):
+        return TableWriter(model, fields, batch_size)
+
+    def finish(name, table):
+        table.flush()
+        written[name] = table.written
+        log(f"{name}: {table.written}")
+
+    with transaction.atomic():
+        airport_ids = np.arange(airports) + next_id(Airport)
+        latitudes = np.degrees(np.arcsin(rng.uniform(-0.85, 0.85, airports)))
+        longitudes = rng.uniform(-180, 180, airports)
+        table = writer(Airport, "id", "name", "closest_big_city", "latitude", "longitude")
+        for airport_id, latitude, longitude in zip(airport_ids, latitudes, longitudes):
+            table.add(
+                (
+                    int(airport_id),
+                    f"Airport {airport_id:06d}",
+                    f"City {airport_id:06d}",
+                    round(float(latitude), 4),
+                    round(float(longitude), 4),
+                )
+            )
+        finish("airports", table)
+
+        hubs = max(1, round(math.sqrt(airports) / 2))
+        sources, destinations, distances, route_weights = hub_and_spoke_routes(
+            rng, latitudes, longitudes, hubs
+        )
+        route_ids = np.arange(len(sources)) + next_id(Route)
+        table = writer(Route, "id", "source_id", "destination_id", "distance")
+        for row in zip(route_ids, airport_ids[sources], airport_ids[destinations], distances):
+            table.add(tuple(int(value) for value in row))
+        finish("routes", table)
+
+        airplane_types = {}
+        for name, (rows, seats_in_row, speed, reach) in AIRPLANE_TYPES.items():
+            airplane_type, _ = AirplaneType.objects.get_or_create(name=name)
+            airplane_types[name] = (airplane_type.id, rows, seats_in_row, speed, reach)
+
+        # Flights: weighted routes, random days, departures 06:00-22:00.
+        route_of = rng.choice(len(route_ids), flights, p=route_weights)
+        departure_minutes = (
+            rng.integers(0, days, flights) * 1440 + 360 + rng.integers(0, 193, flights) * 5
+        )
+        order = np.lexsort((route_of, departure_minutes))
+        route_of, departure_minutes = route_of[order], departure_minutes[order]
+        route_types = [
+            next(name for name, spec in AIRPLANE_TYPES.items() if distance <= spec[3])
+            for distance in distances
+        ]
+        type_of = [route_types[route] for route in route_of]
+        speeds = np.array([airplane_types[name][3] for name in type_of], dtype=float)
+        durations = np.rint((distances[route_of] / speeds * 60 + 30) / 5) * 5
+        arrival_minutes = departure_minutes + durations.astype(int)
+
+        # Tail assignment: an airplane takes the next leg out of the airport
+        # it landed at once turnaround and crew rest have passed.
+        ground_minutes = math.ceil(
+            max(airplane_rotation.min_turnaround(), crew_roster.min_rest()) / 60
+        )
+        ready = {}
+        airplane_of = np.empty(flights, dtype=int)
+        airplanes = []
+        for position in range(flights):
+            route = route_of[position]
+            pool = ready.setdefault((type_of[position], sources[route]), [])
+            if pool and pool[0][0] <= departure_minutes[position]:
+                airplane = heapq.heappop(pool)[1]
+            else:
+                airplane = len(airplanes)
+                airplanes.append(type_of[position])
+            airplane_of[position] = airplane
+            heapq.heappush(
+                ready.setdefault((type_of[position], destinations[route]), []),
+                (arrival_minutes[position] + ground_minutes, airplane),
+            )
+
+        airplane_ids = np.arange(len(airplanes)) + next_id(Airplane)
+        table = writer(Airplane, "id", "name", "rows", "seats_in_row", "airplane_type_id")
+        for airplane_id, name in zip(airplane_ids, airplanes):
+            type_id, rows, seats_in_row, _, _ = airplane_types[name]
+            table.add(
+                (int(airplane_id), f"{name} {airplane_id:06d}", rows, seats_in_row, type_id)
+            )
+        finish("airplanes", table)
+
+        # Two dedicated crew members per airplane never overlap.
+        crew_ids = np.arange(len(airplanes) * 2) + next_id(Crew)
+        table = writer(Crew, "id", "first_name", "last_name")
+        for crew_id in crew_ids:
+            table.add((int(crew_id), "Crew", f"Member {crew_id:06d}"))
+        finish("crews", table)
+
+        capacities = np.array(
+            [airplane_types[name][1] * airplane_types[name][2] for name in type_of]
+        )
+        sold = distribute_tickets(rng, capacities, tickets)
+        departures = [start + timedelta(minutes=int(minute)) for minute in departure_minutes]
+        fares = compute_fares(
+            distances[route_of],
+            sold,
+            capacities,
+            [(departure - now).total_seconds() / 86400 for departure in departures],
+        )
+
+        flight_ids = np.arange(flights) + next_id(Flight)
+        table = writer(
+            Flight, "id", "route_id", "airplane_id", "departure_time", "arrival_time", "fare"
+        )
+        crew_table = writer(Flight.crews.through, "flight_id", "crew_id")
+        for position, flight_id in enumerate(flight_ids):
+            airplane = airplane_of[position]
+            table.add(
+                (
+                    int(flight_id),
+                    int(route_ids[route_of[position]]),
+                    int(airplane_ids[airplane]),
+                    departures[position],
+                    start + timedelta(minutes=int(arrival_minutes[position])),
+                    Decimal(str(fares[position])),
+                )
+            )
+            crew_table.add((int(flight_id), int(crew_ids[2 * airplane])))
+            crew_table.add((int(flight_id), int(crew_ids[2 * airplane + 1])))
+        finish("flights", table)
+        finish("flight crews", crew_table)
+
+        # Users and order histories: a few frequent flyers, a long tail.
+        user_model = get_user_model()
+        user_ids = np.arange(users) + next_id(user_model)
+        password = make_password(DATASET_PASSWORD)
+        table = writer(
+            user_model,
+            "id", "password", "email", "first_name", "last_name",
+            "is_superuser", "is_staff", "is_active", "date_joined",
+        )
+        for user_id in user_ids:
+            table.add(
+                (
+                    int(user_id), password, f"user{user_id:07d}@example.com", "", "",
+                    False, False, True, start - timedelta(days=365),
+                )
+            )
+        finish("users", table)
+
+        # Every order needs at least one ticket, so tickets bounds the
+        # number of orders; draw sizes, buyers and booking times up front.
+        user_weights = 1 / np.arange(1, users + 1) ** 0.8
+        user_weights /= user_weights.sum()
+        total_sold = int(sold.sum())
+        sizes = rng.choice(ORDER_SIZES, total_sold, p=ORDER_SIZE_WEIGHTS)
+        buyers = rng.choice(user_ids, total_sold, p=user_weights)
+        booked_before = rng.uniform(0.5, 60, total_sold)
+
+        order_table = writer(Order, "id", "created_at", "user_id", "total_price")
+        ticket_table = writer(Ticket, "id", "row", "seat", "flight_id", "order_id")
+        first_order, ticket_id = next_id(Order), next_id(Ticket)
+        orders = 0
+        for position in np.flatnonzero(sold):
+            seats_in_row = airplane_types[type_of[position]][2]
+            seats = rng.permutation(capacities[position])[: sold[position]]
+            fare = Decimal(str(fares[position]))
+            flight_id = int(flight_ids[position])
+            taken = 0
+            while taken < len(seats):
+                group = seats[taken: taken + sizes[orders]]
+                taken += len(group)
+                order_id = first_order + orders
+                order_table.add(
+                    (
+                        order_id,
+                        departures[position] - timedelta(days=float(booked_before[orders])),
+                        int(buyers[orders]),
+                        fare * len(group),
+                    )
+                )
+                for index in group.tolist():
+                    ticket_table.add(
+                        (
+                            ticket_id,
+                            index // seats_in_row + 1,
+                            index % seats_in_row + 1,
+                            flight_id,
+                            order_id,
+                        )
+                    )
+                    ticket_id += 1
+                orders += 1
+        finish("orders", order_table)
+        finish("tickets", ticket_table)
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [Airport, Route, Airplane, Crew, Flight, user_model, Order, Ticket]
+            ):
+                cursor.execute(sql)
+
+        rebuild_route_daily_loads()
+        indexes = (
+            crew_roster,
+            airplane_rotation,
+            airport_index,
+            airport_board,
+            *REFERENCE_TABLES.values(),
+        )
+        for index in indexes:
+            transaction.on_commit(index.invalidate)
+        transaction.on_commit(invalidate_flight_searches)
+
+    elapsed = time.monotonic() - started
+    written["seconds"] = round(elapsed, 2)
+    return written
@@ -0,0 +1,156 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from airport.models import Flight, Ticket
+
+SEARCH_VERSION_KEY = "airport:flight_search_version"
+
+
+def tickets_available_expression():
+    return F("airplane__rows") * F("airplane__seats_in_row") - Count("tickets")
+
+
+def _search_date(name, value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        pass
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValidationError({name: "A date as YYYY-MM-DD is required."})
+    if timezone.is_aware(moment):
+        moment = timezone.localtime(moment)
+    return moment.date()
+
+
+def search_params(query_params) -> dict:
+    """The flight list filters in canonical form, None where not given"""
+    params = {"departure_time": None, "arrival_time": None, "airplane": None}
+    for name in ("departure_time", "arrival_time"):
+        value = query_params.get(name, "").strip()
+        if value:
+            params[name] = _search_date(name, value)
+    airplane = query_params.get("airplane", "").strip()
+    if airplane:
+        try:
+            params["airplane"] = int(airplane)
+        except ValueError:
+            raise ValidationError({"airplane": "An integer is required."})
+    return params
+
+
+def search_version() -> int:
+    version = cache.get(SEARCH_VERSION_KEY)
+    if version is None:
+        cache.add(SEARCH_VERSION_KEY, 0, timeout=None)
+        version = cache.get(SEARCH_VERSION_KEY, 0)
+    return version
+
+
+def search_cache_key(params, version) -> str:
+    parts = [
+        "" if params[name] is None else str(params[name])
+        for name in ("departure_time", "arrival_time", "airplane")
+    ]
+    return f"airport:flight_search:{version}:{':'.join(parts)}"
+
+
+def invalidate_flight_searches():
+    try:
+        cache.incr(SEARCH_VERSION_KEY)
+    except ValueError:
+        cache.add(SEARCH_VERSION_KEY, 0, timeout=None)
+        cache.incr(SEARCH_VERSION_KEY)
+
+
+def availability_cache_key(flight_id) -> str:
+    return f"airport:flight_availability:{flight_id}"
+
+
+def invalidate_availability(flight_ids):
+    cache.delete_many([availability_cache_key(flight_id) for flight_id in flight_ids])
+
+
+def tickets_available(flight_ids) -> dict:
+    """{flight_id: tickets_available}, one cache read plus one query for misses"""
+    flight_ids = list(flight_ids)
+    cached = {}
+    if not connection.in_atomic_block:
+        keys = {availability_cache_key(flight_id): flight_id for flight_id in flight_ids}
+        cached = {keys[key]: value for key, value in cache.get_many(keys).items()}
+
+    missing = [flight_id for flight_id in flight_ids if flight_id not in cached]
+    if missing:
+        found = dict(
+            Flight.objects.filter(id__in=missing)
+            .order_by()
+            .annotate(tickets_available=tickets_available_expression())
+            .values_list("id", "tickets_available")
+        )
+        if not connection.in_atomic_block:
+            cache.set_many(
+                {availability_cache_key(flight_id): value for flight_id, value in found.items()},
+                getattr(settings, "FLIGHT_AVAILABILITY_CACHE_TTL", 60),
+            )
+        cached.update(found)
+    return cached
+
+
+def cached_search(params, compute) -> list:
+    """Flight list rows for the search, with availability filled in per flight.
+
+    The rows only depend on flights, routes, airports and airplanes and are
+    cached under a version bumped when any of those change; ticket sales
+    only drop the availability of their own flight. Inside a transaction
+    both are read from the database and never stored, since they could see
+    rows that are later rolled back.
+    """
+    if connection.in_atomic_block:
+        rows = compute()
+    else:
+        key = search_cache_key(params, search_version())
+        rows = cache.get(key)
+        if rows is None:
+            rows = compute()
+            cache.set(key, rows, getattr(settings, "FLIGHT_SEARCH_CACHE_TTL", 300))
+
+    available = tickets_available(row["id"] for row in rows)
+    return [{**row, "tickets_available": available.get(row["id"])} for row in rows]
+
+
+def flight_availability(flight_ids, seats=False) -> list:
+    """Availability of many flights in the order asked, unknown ids left out.
+
+    One grouped query counts the tickets of every flight and, with seats,
+    one more fetches their taken seats as compact [row, seat] pairs.
+    """
+    found = {
+        flight_id: {
+            "id": flight_id,
+            "capacity": rows * seats_in_row,
+            "tickets_available": available,
+            **({"rows": rows, "seats_in_row": seats_in_row, "taken": []} if seats else {}),
+        }
+        for flight_id, rows, seats_in_row, available in (
+            Flight.objects.filter(id__in=flight_ids)
+            .order_by()
+            .annotate(tickets_available=tickets_available_expression())
+            .values_list("id", "airplane__rows", "airplane__seats_in_row", "tickets_available")
+        )
+    }
+    if seats and found:
+        taken = (
+            Ticket.objects.filter(flight_id__in=found)
+            .order_by("flight_id", "row", "seat")
+            .values_list("flight_id", "row", "seat")
+        )
+        for flight_id, row, seat in taken:
+            found[flight_id]["taken"].append([row, seat])
+    return [found[flight_id] for flight_id in flight_ids if flight_id in found]
@@ -0,0 +1,179 @@
+import copy
+import heapq
+import math
+
+import numpy as np
+from django.db import transaction
+
+from airport.bulk import post_bulk_save
+from airport.models import Airport, Route
+from airport.schedule import VersionedScheduleIndex
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(latitudes_a, longitudes_a, latitudes_b, longitudes_b) -> np.ndarray:
+    """Great-circle distances between pairs of points, element-wise"""
+    lat_a = np.radians(np.asarray(latitudes_a, dtype=float))
+    lat_b = np.radians(np.asarray(latitudes_b, dtype=float))
+    d_lat = lat_b - lat_a
+    d_lon = np.radians(np.asarray(longitudes_b, dtype=float)) - np.radians(
+        np.asarray(longitudes_a, dtype=float)
+    )
+    h = np.sin(d_lat / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+def unit_vectors(latitudes, longitudes) -> np.ndarray:
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    return np.column_stack(
+        (np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat))
+    )
+
+
+def chord_to_km(chord) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+def km_to_chord(km) -> float:
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def recompute_route_distances(batch_size=1000, dry_run=False) -> tuple:
+    """Set Route.distance from airport coordinates; return (changed, checked)"""
+    rows = list(
+        Route.objects.filter(
+            source__latitude__isnull=False,
+            source__longitude__isnull=False,
+            destination__latitude__isnull=False,
+            destination__longitude__isnull=False,
+        )
+        .order_by("id")
+        .values_list(
+            "id",
+            "distance",
+            "source__latitude",
+            "source__longitude",
+            "destination__latitude",
+            "destination__longitude",
+        )
+    )
+    if not rows:
+        return 0, 0
+
+    ids, distances, *coordinates = (np.array(column) for column in zip(*rows))
+    computed = np.rint(haversine_km(*coordinates)).astype(int)
+    changed = np.flatnonzero(computed != distances)
+
+    if not dry_run and changed.size:
+        distances = {int(ids[position]): int(computed[position]) for position in changed}
+        routes = list(Route.objects.filter(id__in=distances))
+        previous = {route.pk: copy.copy(route) for route in routes}
+        for route in routes:
+            route.distance = distances[route.id]
+        with transaction.atomic():
+            Route.objects.bulk_update(routes, ["distance"], batch_size=batch_size)
+            post_bulk_save.send(
+                sender=Route,
+                instances=routes,
+                created=False,
+                previous=previous,
+                update_fields={"distance"},
+            )
+    return int(changed.size), len(rows)
+
+
+class SphericalKDTree:
+    """k-d tree over points on the unit sphere.
+
+    Points are stored as 3D unit vectors, so straight-line (chord) distance
+    orders them exactly like great-circle distance and there is no special
+    case for the poles or the antimeridian.
+    """
+
+    def __init__(self, latitudes, longitudes, items):
+        self.items = list(items)
+        self.points = [tuple(point) for point in unit_vectors(latitudes, longitudes)]
+        # node: (point position, split axis, left node, right node)
+        self.nodes = []
+        self.root = self._build(np.arange(len(self.points)), np.asarray(self.points))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, positions, coordinates):
+        if not positions.size:
+            return None
+        subset = coordinates[positions]
+        axis = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+        positions = positions[np.argsort(subset[:, axis], kind="stable")]
+        middle = len(positions) // 2
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(positions[:middle], coordinates)
+        right = self._build(positions[middle + 1:], coordinates)
+        self.nodes[node] = (int(positions[middle]), axis, left, right)
+        return node
+
+    def nearest(self, latitude, longitude, limit=5, max_km=None) -> list:
+        """Return [(item, distance_km), ...] closest first"""
+        target = tuple(unit_vectors([latitude], [longitude])[0])
+        bound = km_to_chord(max_km) ** 2 if max_km is not None else math.inf
+        best = []  # max-heap of (-squared chord, position)
+        stack = [(self.root, 0.0)]
+        while stack:
+            node, plane = stack.pop()
+            if node is None or plane > bound:
+                continue
+            position, axis, left, right = self.nodes[node]
+            point = self.points[position]
+            squared = (
+                (point[0] - target[0]) ** 2
+                + (point[1] - target[1]) ** 2
+                + (point[2] - target[2]) ** 2
+            )
+            if squared <= bound:
+                if len(best) < limit:
+                    heapq.heappush(best, (-squared, position))
+                elif squared < -best[0][0]:
+                    heapq.heapreplace(best, (-squared, position))
+                if len(best) == limit:
+                    bound = min(bound, -best[0][0])
+
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append((far, offset * offset))
+            stack.append((near, 0.0))
+
+        return [
+            (self.items[position], chord_to_km(math.sqrt(-squared)))
+            for squared, position in sorted(best, reverse=True)
+        ]
+
+
+class NearestAirportIndex(VersionedScheduleIndex):
+    version_key = "airport:airport_index_version"
+
+    def build(self) -> SphericalKDTree:
+        rows = list(
+            Airport.objects.filter(latitude__isnull=False, longitude__isnull=False)
+            .order_by("id")
+            .values("id", "name", "closest_big_city", "latitude", "longitude")
+        )
+        return SphericalKDTree(
+            [row["latitude"] for row in rows],
+            [row["longitude"] for row in rows],
+            rows,
+        )
+
+    def nearest(self, latitude, longitude, limit=5, max_km=None) -> list:
+        return [
+            {**airport, "distance_km": round(distance, 1)}
+            for airport, distance in self.index().nearest(
+                latitude, longitude, limit=limit, max_km=max_km
+            )
+        ]
+
+
+airport_index = NearestAirportIndex()
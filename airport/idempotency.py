@@ -0,0 +1,101 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "HTTP_IDEMPOTENCY_KEY"
+PENDING = "pending"
+DONE = "done"
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class IdempotentCreateMixin:
+    """Replays the stored response for a repeated Idempotency-Key.
+
+    The first request with a key claims it in the shared cache; concurrent
+    duplicates wait briefly for that request to finish and are then either
+    replayed or rejected with 409. Completed responses (other than 5xx) are
+    kept for IDEMPOTENCY_KEY_TTL seconds per user and key.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        if len(key) > 255:
+            return Response(
+                {"detail": "Idempotency-Key must be at most 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = self._idempotency_cache_key(request, key)
+        fingerprint = hashlib.sha256(
+            json.dumps(request.data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        lock_timeout = _setting("IDEMPOTENCY_LOCK_TIMEOUT", 30)
+
+        if not cache.add(
+            cache_key, {"state": PENDING, "fingerprint": fingerprint}, lock_timeout
+        ):
+            return self._replay(cache_key, fingerprint)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if response.status_code >= 500:
+            cache.delete(cache_key)
+            return response
+
+        cache.set(
+            cache_key,
+            {
+                "state": DONE,
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "data": response.data,
+            },
+            _setting("IDEMPOTENCY_KEY_TTL", 60 * 60 * 24),
+        )
+        return response
+
+    @staticmethod
+    def _idempotency_cache_key(request, key) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f"airport:idempotency:{request.user.pk}:{digest}"
+
+    @staticmethod
+    def _replay(cache_key, fingerprint):
+        deadline = time.monotonic() + _setting("IDEMPOTENCY_WAIT_TIMEOUT", 5)
+        record = cache.get(cache_key)
+        while record and record["state"] == PENDING and time.monotonic() < deadline:
+            time.sleep(0.05)
+            record = cache.get(cache_key)
+
+        if record is None or record["state"] == PENDING:
+            response = Response(
+                {"detail": "A request with this Idempotency-Key is in progress."},
+                status=status.HTTP_409_CONFLICT,
+            )
+            response["Retry-After"] = "1"
+            return response
+
+        if record["fingerprint"] != fingerprint:
+            return Response(
+                {"detail": "Idempotency-Key was already used with a different payload."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        response = Response(record["data"], status=record["status"])
+        response["Idempotent-Replayed"] = "true"
+        return response
@@ -0,0 +1,191 @@
+import asyncio
+import math
+import re
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+CRITICAL = "critical"
+DEFAULT = "default"
+LOW = "low"
+PRIORITIES = (CRITICAL, DEFAULT, LOW)
+
+DEFAULT_LOAD_SHEDDING = {
+    "ENABLED": True,
+    # Requests in flight in this process, across all classes.
+    "MAX_CONCURRENCY": 64,
+    # Share of MAX_CONCURRENCY a class may fill; critical requests are never held.
+    "SHARES": {DEFAULT: 0.85, LOW: 0.6},
+    # Seconds a request may wait for a slot before it is shed.
+    "MAX_QUEUE_TIME": {DEFAULT: 1.0, LOW: 0.2},
+    "RETRY_AFTER": 2,
+    "CRITICAL": [
+        ("POST", r"^/api/airport/orders/"),
+        (None, r"^/api/user/(token|register)"),
+        (None, r"^/api/metrics/"),
+    ],
+    "LOW": [("GET", r"^/api/airport/"), ("HEAD", r"^/api/airport/")],
+}
+
+
+def load_shedding_settings() -> dict:
+    return {**DEFAULT_LOAD_SHEDDING, **getattr(settings, "LOAD_SHEDDING", {})}
+
+
+def _matches(rules, request) -> bool:
+    return any(
+        (method is None or request.method == method) and re.match(pattern, request.path)
+        for method, pattern in rules
+    )
+
+
+def priority_of(request, config) -> str:
+    if _matches(config["CRITICAL"], request):
+        return CRITICAL
+    if _matches(config["LOW"], request):
+        return LOW
+    return DEFAULT
+
+
+class PriorityStats:
+    window = 500
+
+    def __init__(self):
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.latencies = deque(maxlen=self.window)
+        self.queue_times = deque(maxlen=self.window)
+
+    @staticmethod
+    def _percentile(samples, q):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    def as_dict(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "latency_p50": self._percentile(self.latencies, 0.5),
+            "latency_p95": self._percentile(self.latencies, 0.95),
+            "queue_time_p95": self._percentile(self.queue_times, 0.95),
+        }
+
+
+class LoadShedder:
+    """Per-process admission control by priority class.
+
+    Every class counts against one concurrency limit, but lower classes are
+    only admitted while the total stays under their share of it, so order
+    creation and auth keep getting through when browse traffic is shed.
+    Held requests wait up to their class's MAX_QUEUE_TIME for a slot.
+    """
+
+    poll_interval = 0.01
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.reset()
+
+    def reset(self):
+        with self._condition:
+            self.stats = {priority: PriorityStats() for priority in PRIORITIES}
+
+    def in_flight(self) -> int:
+        return sum(stats.in_flight for stats in self.stats.values())
+
+    @staticmethod
+    def limit(priority, config):
+        if priority == CRITICAL:
+            return math.inf
+        return max(1, math.floor(config["MAX_CONCURRENCY"] * config["SHARES"][priority]))
+
+    def _try_admit(self, priority, config) -> bool:
+        if self.in_flight() >= self.limit(priority, config):
+            return False
+        self.stats[priority].in_flight += 1
+        self.stats[priority].admitted += 1
+        return True
+
+    def _queue_result(self, priority, admitted, waited) -> bool:
+        stats = self.stats[priority]
+        stats.queue_times.append(waited)
+        if not admitted:
+            stats.shed += 1
+        return admitted
+
+    def admit(self, priority, config) -> bool:
+        started = time.monotonic()
+        deadline = started + config["MAX_QUEUE_TIME"].get(priority, 0)
+        with self._condition:
+            admitted = self._try_admit(priority, config)
+            if not admitted:
+                self.stats[priority].queued += 1
+                while not admitted and time.monotonic() < deadline:
+                    self._condition.wait(deadline - time.monotonic())
+                    admitted = self._try_admit(priority, config)
+                self.stats[priority].queued -= 1
+            return self._queue_result(priority, admitted, time.monotonic() - started)
+
+    async def aadmit(self, priority, config) -> bool:
+        # The event loop must not block on the condition, so poll instead.
+        started = time.monotonic()
+        deadline = started + config["MAX_QUEUE_TIME"].get(priority, 0)
+        with self._condition:
+            admitted = self._try_admit(priority, config)
+            queued = not admitted
+            if queued:
+                self.stats[priority].queued += 1
+        while not admitted and time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            with self._condition:
+                admitted = self._try_admit(priority, config)
+        with self._condition:
+            if queued:
+                self.stats[priority].queued -= 1
+            return self._queue_result(priority, admitted, time.monotonic() - started)
+
+    def release(self, priority, latency):
+        with self._condition:
+            self.stats[priority].in_flight -= 1
+            self.stats[priority].latencies.append(latency)
+            self._condition.notify_all()
+
+    def metrics(self, config=None) -> dict:
+        config = config or load_shedding_settings()
+        with self._condition:
+            return {
+                "max_concurrency": config["MAX_CONCURRENCY"],
+                "in_flight": self.in_flight(),
+                "classes": {
+                    priority: {
+                        **stats.as_dict(),
+                        "limit": None
+                        if priority == CRITICAL
+                        else self.limit(priority, config),
+                    }
+                    for priority, stats in self.stats.items()
+                },
+            }
+
+
+load_shedder = LoadShedder()
+
+
+@extend_schema(exclude=True)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+@throttle_classes([])
+def load_shedding_metrics(request):
+    return Response(load_shedder.metrics())
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from airport.archive import archive_flights
+
+
+class Command(BaseCommand):
+    """Django command that moves completed flights into the archive tables"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=90,
+            help="Archive flights that arrived more than this many days ago",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Archiving completed flights...")
+        total_flights = total_tickets = 0
+        for flights, tickets in archive_flights(
+            options["older_than_days"], batch_size=options["batch_size"]
+        ):
+            total_flights += flights
+            total_tickets += tickets
+            self.stdout.write(f"Archived {flights} flights, {tickets} tickets")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {total_flights} flights and {total_tickets} tickets!"
+            )
+        )
@@ -0,0 +1,46 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.tail_assignment import apply_tail_assignment, optimize_tail_assignment
+
+
+class Command(BaseCommand):
+    """Django command that reassigns airplanes to a day's flights"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", required=True, help="Departure date, YYYY-MM-DD")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the assignment without saving it",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        try:
+            day = datetime.strptime(options["date"], "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError("--date must be in YYYY-MM-DD format")
+
+        started = time.monotonic()
+        result = optimize_tail_assignment(day)
+        self.stdout.write(
+            f"Planned {len(result['assignments'])} of {result['flights']} flights "
+            f"in {time.monotonic() - started:.2f}s, unused seats "
+            f"{result['unused_seats_before']} -> {result['unused_seats_after']}"
+        )
+        if result["unassigned"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No airplane available for flights {result['unassigned']}, "
+                    f"keeping their current assignment"
+                )
+            )
+
+        if options["dry_run"]:
+            return
+
+        changed = apply_tail_assignment(result["assignments"])
+        self.stdout.write(self.style.SUCCESS(f"Reassigned {changed} flights!"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from airport.openapi import schema_cache
+
+
+class Command(BaseCommand):
+    """Django command that pre-builds the served OpenAPI schema"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate even if a schema for this version is already stored",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Building OpenAPI schema...")
+        fingerprint = schema_cache.build(force=options["force"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Schema {fingerprint} stored in {schema_cache.directory()}!"
+            )
+        )
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airport.outbox import dispatch_batch, outbox_settings, outbox_stats
+
+
+class Command(BaseCommand):
+    """Django command that delivers pending outbox events to the consumers"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new events instead of exiting when drained",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when there is nothing to deliver",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Dispatching outbox events...")
+        if not outbox_settings()["ENDPOINTS"]:
+            self.stdout.write(
+                self.style.WARNING("OUTBOX ENDPOINTS is empty; events are kept pending.")
+            )
+        delivered = failed = 0
+        while True:
+            result = dispatch_batch(batch_size=options["batch_size"])
+            delivered += result["delivered"]
+            failed += result["failed"]
+            if result["claimed"]:
+                self.stdout.write(
+                    f"Delivered {result['delivered']}, failed {result['failed']}, "
+                    f"lag {result['lag_seconds']:.3f}s"
+                )
+            if result["claimed"] and not result["failed"]:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        stats = outbox_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Delivered {delivered} events, {failed} failed; "
+                f"{stats['pending']} pending, oldest "
+                f"{stats['oldest_pending_seconds']:.1f}s!"
+            )
+        )
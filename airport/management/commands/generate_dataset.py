@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from airport.dataset import generate_dataset
+
+
+class Command(BaseCommand):
+    """Django command that writes a reproducible synthetic dataset for benchmarks"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--airports", type=int, default=50)
+        parser.add_argument("--flights", type=int, default=10000)
+        parser.add_argument("--tickets", type=int, default=200000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=None,
+            help="Number of users, a sixth of --tickets by default",
+        )
+        parser.add_argument("--days", type=int, default=30, help="Schedule length")
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            default=None,
+            help="First day of the schedule (YYYY-MM-DD), today by default",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Generating dataset...")
+        written = generate_dataset(
+            airports=options["airports"],
+            flights=options["flights"],
+            tickets=options["tickets"],
+            users=options["users"],
+            days=options["days"],
+            start=options["start_date"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        )
+        seconds = written.pop("seconds")
+        rows = sum(written.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {rows} rows in {seconds:.2f}s "
+                f"({rows / max(seconds, 0.001):.0f} rows/s)!"
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from airport.analytics import rebuild_route_daily_loads
+
+
+class Command(BaseCommand):
+    """Django command that rebuilds per route and day load factor rollups"""
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Rebuilding route daily load rollups...")
+        count = rebuild_route_daily_loads()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup rows!"))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from airport.geo import recompute_route_distances
+
+
+class Command(BaseCommand):
+    """Django command that recomputes route distances from airport coordinates"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many routes would change",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Recomputing route distances...")
+        changed, checked = recompute_route_distances(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        verb = "Would update" if options["dry_run"] else "Updated"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {changed} of {checked} routes with coordinates!")
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airport.pricing import reprice_upcoming_flights
+
+
+class Command(BaseCommand):
+    """Django command that recomputes fares for all upcoming flights"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.stdout.write("Repricing upcoming flights...")
+        started = time.monotonic()
+        count = reprice_upcoming_flights(batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Repriced {count} flights in {elapsed:.2f}s!")
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from airport.seeding import seed_fixture
+
+
+class Command(BaseCommand):
+    """Django command that applies seed fixtures whose content has changed"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixtures", nargs="+", help="Paths to JSON fixtures")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Apply fixtures even if their checksum is unchanged",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        for path in options["fixtures"]:
+            written = seed_fixture(
+                path, force=options["force"], batch_size=options["batch_size"]
+            )
+            if written is None:
+                self.stdout.write(f"{path} is unchanged, skipping.")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Applied {written} objects from {path}!"))
@@ -0,0 +1,136 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import OperationalError, connection
+from django.http import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+
+from airport.load_shedding import load_shedder, load_shedding_settings, priority_of
+from airport.query_budget import QueryBudgetTracker, budget_for, query_budget_settings
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL error code for a statement cancelled by statement_timeout.
+QUERY_CANCELED = "57014"
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """Compress only bodies larger than settings.GZIP_MIN_LENGTH bytes"""
+
+    def process_response(self, request, response):
+        # Compressing an event stream would hold events back in the buffer.
+        if response.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+
+        min_length = getattr(settings, "GZIP_MIN_LENGTH", 1024)
+        if not response.streaming and len(response.content) < min_length:
+            return response
+
+        return super().process_response(request, response)
+
+
+class LoadSheddingMiddleware:
+    """Admit requests by priority and shed the rest with 503 and Retry-After
+
+    See airport.load_shedding.LoadShedder for the admission rules.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        config = load_shedding_settings()
+        if not config["ENABLED"]:
+            return self.get_response(request)
+
+        priority = priority_of(request, config)
+        if not load_shedder.admit(priority, config):
+            return self.overloaded(config)
+        started = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            load_shedder.release(priority, time.monotonic() - started)
+
+    async def __acall__(self, request):
+        config = load_shedding_settings()
+        if not config["ENABLED"]:
+            return await self.get_response(request)
+
+        priority = priority_of(request, config)
+        if not await load_shedder.aadmit(priority, config):
+            return self.overloaded(config)
+        started = time.monotonic()
+        try:
+            return await self.get_response(request)
+        finally:
+            load_shedder.release(priority, time.monotonic() - started)
+
+    @staticmethod
+    def overloaded(config):
+        response = JsonResponse(
+            {"detail": "Service is overloaded, please retry later."}, status=503
+        )
+        response["Retry-After"] = str(config["RETRY_AFTER"])
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Enforces the query budget declared by the resolved view.
+
+    A budget with max_db_time also sets statement_timeout on PostgreSQL for
+    the rest of the request, so a runaway query is cancelled by the server
+    and answered with 503 instead of tying up the worker.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tracker = request._query_budget_tracker = QueryBudgetTracker(query_budget_settings())
+        request._statement_timeout_set = False
+        try:
+            with connection.execute_wrapper(tracker):
+                return self.get_response(request)
+        finally:
+            if request._statement_timeout_set:
+                with connection.cursor() as cursor:
+                    cursor.execute("RESET statement_timeout")
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        budget = budget_for(view_func, request)
+        if budget is None:
+            return None
+
+        if budget.max_db_time is not None and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET statement_timeout = %s", [max(1, int(budget.max_db_time * 1000))]
+                )
+            request._statement_timeout_set = True
+
+        label = f"{request.method} {request.path}"
+        request._query_budget_tracker.start(budget, label)
+        return None
+
+    def process_exception(self, request, exception):
+        cause = exception.__cause__
+        if isinstance(exception, OperationalError) and (
+            getattr(cause, "pgcode", None) == QUERY_CANCELED
+        ):
+            logger.warning("%s %s hit statement_timeout", request.method, request.path)
+            return JsonResponse(
+                {"detail": "The request took too long and was cancelled."}, status=503
+            )
+        return None
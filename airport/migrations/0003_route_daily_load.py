@@ -0,0 +1,44 @@
+# Generated by Django 4.2.3 on 2026-10-19 08:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RouteDailyLoad",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("flights", models.IntegerField(default=0)),
+                ("seats_offered", models.IntegerField(default=0)),
+                ("seats_sold", models.IntegerField(default=0)),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_loads",
+                        to="airport.route",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date", "route"],
+                "unique_together": {("route", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.3 on 2026-10-19 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0003_route_daily_load"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="fare",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="total_price",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+    ]
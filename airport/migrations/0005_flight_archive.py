@@ -0,0 +1,137 @@
+# Generated by Django 4.2.3 on 2026-10-19 08:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+PARTITIONED_ARCHIVE_TABLES = """
+DROP TABLE airport_ticketarchive;
+DROP TABLE airport_flightarchive;
+
+CREATE TABLE airport_flightarchive (
+    id bigint NOT NULL,
+    route_id bigint NOT NULL
+        REFERENCES airport_route (id) DEFERRABLE INITIALLY DEFERRED,
+    airplane_id bigint NOT NULL
+        REFERENCES airport_airplane (id) DEFERRABLE INITIALLY DEFERRED,
+    departure_time timestamp with time zone NOT NULL,
+    arrival_time timestamp with time zone NOT NULL,
+    crew_ids jsonb NOT NULL,
+    fare numeric(10, 2) NULL,
+    archived_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, departure_time)
+) PARTITION BY RANGE (departure_time);
+CREATE TABLE airport_flightarchive_default
+    PARTITION OF airport_flightarchive DEFAULT;
+CREATE INDEX airport_flightarchive_route_id_idx ON airport_flightarchive (route_id);
+CREATE INDEX airport_flightarchive_airplane_id_idx ON airport_flightarchive (airplane_id);
+
+CREATE TABLE airport_ticketarchive (
+    id bigint NOT NULL,
+    "row" integer NOT NULL,
+    seat integer NOT NULL,
+    flight_id bigint NOT NULL,
+    order_id bigint NOT NULL
+        REFERENCES airport_order (id) DEFERRABLE INITIALLY DEFERRED,
+    departure_time timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, departure_time)
+) PARTITION BY RANGE (departure_time);
+CREATE TABLE airport_ticketarchive_default
+    PARTITION OF airport_ticketarchive DEFAULT;
+CREATE INDEX airport_ticketarchive_flight_id_idx ON airport_ticketarchive (flight_id);
+CREATE INDEX airport_ticketarchive_order_id_idx ON airport_ticketarchive (order_id);
+"""
+
+
+def partition_archive_tables(apps, schema_editor):
+    """Recreate the (still empty) archive tables range-partitioned by month.
+
+    Only PostgreSQL supports declarative partitioning; other backends keep
+    the plain tables created above.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(PARTITIONED_ARCHIVE_TABLES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0004_flight_fare_order_total_price"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("departure_time", models.DateTimeField()),
+                ("arrival_time", models.DateTimeField()),
+                ("crew_ids", models.JSONField(default=list)),
+                (
+                    "fare",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-departure_time"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TicketArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("row", models.IntegerField()),
+                ("seat", models.IntegerField()),
+                ("departure_time", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["row", "seat"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["departure_time"], name="airport_fli_departu_abe547_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticketarchive",
+            name="flight",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="tickets",
+                to="airport.flightarchive",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticketarchive",
+            name="order",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_tickets",
+                to="airport.order",
+            ),
+        ),
+        migrations.AddField(
+            model_name="flightarchive",
+            name="airplane",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_flights",
+                to="airport.airplane",
+            ),
+        ),
+        migrations.AddField(
+            model_name="flightarchive",
+            name="route",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_flights",
+                to="airport.route",
+            ),
+        ),
+        migrations.RunPython(partition_archive_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.3 on 2026-10-19 09:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0009_change_log_entry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("endpoint", models.CharField(max_length=500)),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("delivered_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["event_id"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="outboxevent",
+            name="airport_outbox_pending_idx",
+        ),
+        migrations.RemoveField(
+            model_name="outboxevent",
+            name="attempts",
+        ),
+        migrations.RemoveField(
+            model_name="outboxevent",
+            name="available_at",
+        ),
+        migrations.RemoveField(
+            model_name="outboxevent",
+            name="last_error",
+        ),
+        migrations.AddIndex(
+            model_name="outboxevent",
+            index=models.Index(
+                condition=models.Q(("delivered_at__isnull", True)),
+                fields=["id"],
+                name="airport_outbox_pending_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxdelivery",
+            name="event",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="deliveries",
+                to="airport.outboxevent",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outboxdelivery",
+            index=models.Index(
+                condition=models.Q(("delivered_at__isnull", True)),
+                fields=["endpoint", "available_at"],
+                name="airport_outbox_delivery_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="outboxdelivery",
+            constraint=models.UniqueConstraint(
+                fields=("event", "endpoint"), name="airport_outbox_delivery_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0010_outbox_delivery"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="route",
+            name="base_fare",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+    ]
@@ -1,11 +1,23 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 
 class Airport(models.Model):
     name = models.CharField(max_length=255, unique=True)
     closest_big_city = models.CharField(max_length=255)
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
 
     def __str__(self):
         return self.name
@@ -20,6 +32,8 @@ class Route(models.Model):
     source = models.ForeignKey(Airport, on_delete=models.CASCADE, related_name="outgoing_routes")
     destination = models.ForeignKey(Airport, on_delete=models.CASCADE, related_name="incoming_routes")
     distance = models.IntegerField()
+    # Overrides PRICING["BASE_FARE"] for the route; the per-km part still applies.
+    base_fare = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
     def __str__(self):
         return f"{self.source} - {self.destination}. "
@@ -68,9 +82,11 @@ class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crews = models.ManyToManyField(Crew, blank=True)
+    fare = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
     class Meta:
         ordering = ["-departure_time"]
+        indexes = [models.Index(fields=["departure_time"])]
 
     def __str__(self):
         return str(self.departure_time) + "-" + str(self.arrival_time)
@@ -81,6 +97,7 @@ class Order(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
     def __str__(self):
         return str(self.created_at)
@@ -113,6 +130,10 @@ class Ticket(models.Model):
                 )
 
     def clean(self):
+        # Imported here because reference_data imports these models.
+        from airport.reference_data import attach_reference_data
+
+        attach_reference_data([self.flight], depth=0)
         Ticket.validate_ticket(
             self.row,
             self.seat,
@@ -140,3 +161,143 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("flight", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class FlightArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="archived_flights")
+    airplane = models.ForeignKey(
+        Airplane, on_delete=models.CASCADE, related_name="archived_flights"
+    )
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+    crew_ids = models.JSONField(default=list)
+    fare = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-departure_time"]
+
+    def __str__(self):
+        return str(self.departure_time) + "-" + str(self.arrival_time)
+
+
+class TicketArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(
+        FlightArchive,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="tickets",
+    )
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="archived_tickets")
+    departure_time = models.DateTimeField()
+
+    class Meta:
+        ordering = ["row", "seat"]
+
+    def __str__(self):
+        return (
+            f"{str(self.flight)} (row: {self.row}, seat: {self.seat})"
+        )
+
+
+class RouteDailyLoad(models.Model):
+    route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="daily_loads")
+    date = models.DateField()
+    flights = models.IntegerField(default=0)
+    seats_offered = models.IntegerField(default=0)
+    seats_sold = models.IntegerField(default=0)
+
+    @property
+    def load_factor(self) -> float:
+        if not self.seats_offered:
+            return 0.0
+        return round(self.seats_sold / self.seats_offered, 4)
+
+    def __str__(self):
+        return f"{self.route} {self.date}"
+
+    class Meta:
+        unique_together = ("route", "date")
+        ordering = ["date", "route"]
+
+
+class OutboxEvent(models.Model):
+    event_type = models.CharField(max_length=64)
+    aggregate_type = models.CharField(max_length=64)
+    aggregate_id = models.BigIntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set once every endpoint has received the event.
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.event_type} #{self.aggregate_id}"
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(delivered_at__isnull=True),
+                name="airport_outbox_pending_idx",
+            )
+        ]
+
+
+class OutboxDelivery(models.Model):
+    event = models.ForeignKey(
+        OutboxEvent, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    endpoint = models.CharField(max_length=500)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.event} to {self.endpoint}"
+
+    class Meta:
+        ordering = ["event_id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "endpoint"], name="airport_outbox_delivery_unique"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["endpoint", "available_at"],
+                condition=models.Q(delivered_at__isnull=True),
+                name="airport_outbox_delivery_idx",
+            )
+        ]
+
+
+class SeedFixture(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    checksum = models.CharField(max_length=64)
+    objects_count = models.IntegerField(default=0)
+    applied_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.checksum[:12]})"
+
+    class Meta:
+        ordering = ["name"]
+
+
+class ChangeLogEntry(models.Model):
+    entity = models.CharField(max_length=32)
+    entity_id = models.BigIntegerField()
+    action = models.CharField(max_length=16)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"#{self.id} {self.entity} {self.entity_id} {self.action}"
+
+    class Meta:
+        ordering = ["id"]
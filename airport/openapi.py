@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import logging
+import tempfile
+import threading
+from functools import lru_cache
+from importlib import import_module
+from pathlib import Path
+
+import drf_spectacular
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import etag, require_safe
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FORMATS = {
+    "yaml": OpenApiYamlRenderer,
+    "json": OpenApiJsonRenderer,
+}
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint() -> str:
+    """Hash of everything the generated schema depends on.
+
+    Covers the project's own source files (viewsets, serializers, urls,
+    settings), the drf-spectacular version and its settings, so a deploy
+    that changes any of them gets a new schema instead of a stale one.
+    """
+    digest = hashlib.sha256()
+    digest.update(drf_spectacular.__version__.encode())
+    digest.update(
+        repr(sorted(getattr(settings, "SPECTACULAR_SETTINGS", {}).items())).encode()
+    )
+
+    base_dir = Path(settings.BASE_DIR).resolve()
+    roots = {Path(import_module(settings.ROOT_URLCONF).__file__).resolve().parent}
+    roots.update(
+        Path(app_config.path).resolve()
+        for app_config in apps.get_app_configs()
+        if base_dir in Path(app_config.path).resolve().parents
+    )
+    for root in sorted(roots):
+        for path in sorted(root.rglob("*.py")):
+            if {"migrations", "management"} & set(path.relative_to(root).parts):
+                continue
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema() -> dict:
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        urlconf=spectacular_settings.SERVE_URLCONF
+    )
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {
+        name: gzip.compress(renderer().render(schema, renderer_context={}), mtime=0)
+        for name, renderer in SCHEMA_FORMATS.items()
+    }
+
+
+class SchemaCache:
+    """Generated OpenAPI documents, gzipped, in memory and on disk.
+
+    Files are named after the schema fingerprint; a process that finds no
+    file for its fingerprint generates the schema once and replaces the
+    files of older versions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._documents = {}
+        self._plain = {}
+
+    @staticmethod
+    def directory() -> Path:
+        return Path(
+            getattr(
+                settings,
+                "OPENAPI_SCHEMA_DIR",
+                Path(tempfile.gettempdir()) / "airport_openapi",
+            )
+        )
+
+    def path(self, fingerprint, name) -> Path:
+        return self.directory() / f"openapi-{fingerprint}.{name}.gz"
+
+    def _load(self, fingerprint):
+        try:
+            return {
+                name: self.path(fingerprint, name).read_bytes() for name in SCHEMA_FORMATS
+            }
+        except OSError:
+            return None
+
+    def _store(self, fingerprint, documents):
+        try:
+            self.directory().mkdir(parents=True, exist_ok=True)
+            for stale in self.directory().glob("openapi-*.gz"):
+                if not stale.name.startswith(f"openapi-{fingerprint}."):
+                    stale.unlink(missing_ok=True)
+            for name, content in documents.items():
+                partial = self.path(fingerprint, name).with_suffix(".tmp")
+                partial.write_bytes(content)
+                partial.replace(self.path(fingerprint, name))
+        except OSError as exc:
+            logger.warning("Could not store the OpenAPI schema on disk: %s", exc)
+
+    def build(self, force=False) -> str:
+        """Make sure the current schema is in memory; return its fingerprint"""
+        fingerprint = schema_fingerprint()
+        with self._lock:
+            if self._fingerprint == fingerprint and not force:
+                return fingerprint
+            documents = None if force else self._load(fingerprint)
+            if documents is None:
+                documents = generate_schema()
+                self._store(fingerprint, documents)
+            self._documents = documents
+            self._plain = {}
+            self._fingerprint = fingerprint
+        return fingerprint
+
+    def reset(self):
+        with self._lock:
+            self._fingerprint = None
+            self._documents = {}
+            self._plain = {}
+
+    def etag(self, name) -> str:
+        return f"{self.build()}-{name}"
+
+    def compressed(self, name) -> bytes:
+        self.build()
+        return self._documents[name]
+
+    def plain(self, name) -> bytes:
+        if name not in self._plain:
+            self._plain[name] = gzip.decompress(self.compressed(name))
+        return self._plain[name]
+
+
+schema_cache = SchemaCache()
+
+
+def representation(request) -> tuple:
+    name = request.GET.get("format")
+    if name not in SCHEMA_FORMATS:
+        name = "json" if "json" in request.META.get("HTTP_ACCEPT", "") else "yaml"
+    compressed = bool(re_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+    return name, compressed
+
+
+def schema_etag(request) -> str:
+    name, compressed = representation(request)
+    return schema_cache.etag(name) + ("-gzip" if compressed else "")
+
+
+@require_safe
+@etag(schema_etag)
+def schema_view(request):
+    """Serve the pre-built OpenAPI document as stored bytes"""
+    name, compressed = representation(request)
+    renderer = SCHEMA_FORMATS[name]
+    if compressed:
+        response = HttpResponse(schema_cache.compressed(name), content_type=renderer.media_type)
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(schema_cache.plain(name), content_type=renderer.media_type)
+
+    response["Content-Disposition"] = (
+        f'inline; filename="{spectacular_settings.TITLE or "schema"}.{name}"'
+    )
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    patch_cache_control(
+        response, public=True, max_age=getattr(settings, "OPENAPI_SCHEMA_MAX_AGE", 300)
+    )
+    return response
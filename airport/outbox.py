@@ -0,0 +1,239 @@
+import json
+import logging
+import urllib.error
+import urllib.request
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from airport.models import OutboxDelivery, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX = {
+    "ENDPOINTS": [],
+    "TIMEOUT": 5,
+    "MAX_ATTEMPTS": 10,
+    "BACKOFF_BASE": 2,
+    "BACKOFF_MAX": 60 * 60,
+}
+
+
+def outbox_settings() -> dict:
+    return {**DEFAULT_OUTBOX, **getattr(settings, "OUTBOX", {})}
+
+
+def _jsonable(payload):
+    return json.loads(json.dumps(payload, cls=DjangoJSONEncoder))
+
+
+def publish(event_type, aggregate_type, aggregate_id, payload) -> OutboxEvent:
+    """Record an event; call inside the transaction that made the change"""
+    return OutboxEvent.objects.create(
+        event_type=event_type,
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        payload=_jsonable(payload),
+    )
+
+
+def publish_many(events) -> list:
+    """events: iterable of (event_type, aggregate_type, aggregate_id, payload)"""
+    return OutboxEvent.objects.bulk_create(
+        [
+            OutboxEvent(
+                event_type=event_type,
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                payload=_jsonable(payload),
+            )
+            for event_type, aggregate_type, aggregate_id, payload in events
+        ],
+        batch_size=500,
+    )
+
+
+def flight_payload(flight) -> dict:
+    return {
+        "id": flight.id,
+        "route": flight.route_id,
+        "airplane": flight.airplane_id,
+        "departure_time": flight.departure_time,
+        "arrival_time": flight.arrival_time,
+    }
+
+
+def ticket_payload(ticket) -> dict:
+    return {
+        "id": ticket.id,
+        "flight": ticket.flight_id,
+        "row": ticket.row,
+        "seat": ticket.seat,
+    }
+
+
+def order_payload(order, tickets) -> dict:
+    return {
+        "id": order.id,
+        "user": order.user_id,
+        "created_at": order.created_at,
+        "total_price": order.total_price,
+        "tickets": [ticket_payload(ticket) for ticket in tickets],
+    }
+
+
+def serialize_event(event) -> dict:
+    return {
+        "id": event.id,
+        "type": event.event_type,
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": event.aggregate_id,
+        "created_at": event.created_at.isoformat(),
+        "payload": event.payload,
+    }
+
+
+def post_events(url, events, timeout):
+    body = json.dumps({"events": [serialize_event(event) for event in events]}).encode()
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if not 200 <= response.status < 300:
+            raise urllib.error.HTTPError(url, response.status, "Delivery failed", None, None)
+
+
+def backoff(attempts, config) -> timedelta:
+    return timedelta(seconds=min(config["BACKOFF_BASE"] ** attempts, config["BACKOFF_MAX"]))
+
+
+def _add_deliveries(endpoints, batch_size, now):
+    """Creates the missing delivery rows of the oldest undelivered events"""
+    for url in endpoints:
+        event_ids = (
+            OutboxEvent.objects.filter(delivered_at__isnull=True)
+            .exclude(deliveries__endpoint=url)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        OutboxDelivery.objects.bulk_create(
+            [
+                OutboxDelivery(event_id=event_id, endpoint=url, available_at=now)
+                for event_id in event_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def _complete_events(event_ids, endpoints, now):
+    """Marks the events every endpoint has received as delivered"""
+    done = (
+        OutboxEvent.objects.filter(id__in=event_ids, delivered_at__isnull=True)
+        .annotate(
+            delivered=Count(
+                "deliveries",
+                filter=Q(
+                    deliveries__endpoint__in=endpoints,
+                    deliveries__delivered_at__isnull=False,
+                ),
+            )
+        )
+        .filter(delivered=len(endpoints))
+        .values_list("id", flat=True)
+    )
+    OutboxEvent.objects.filter(id__in=list(done)).update(delivered_at=now)
+
+
+def dispatch_batch(batch_size=100, now=None) -> dict:
+    """Claim and deliver one batch of pending deliveries.
+
+    Every endpoint has its own delivery row per event, with its own attempts
+    and backoff, so a consumer that is down neither holds back the others
+    nor makes them receive duplicates. Rows are claimed with SKIP LOCKED and
+    leased for the length of the HTTP calls, which run outside the
+    transaction; a dispatcher that dies mid-call leaves its rows to be
+    claimed again when the lease runs out. Delivery is at least once and
+    consumers should deduplicate by event id.
+    """
+    config = outbox_settings()
+    endpoints = config["ENDPOINTS"]
+    now = now or timezone.now()
+    empty = {"claimed": 0, "delivered": 0, "failed": 0, "lag_seconds": 0.0}
+
+    if not endpoints:
+        # Nobody to deliver to yet; events wait until endpoints are configured.
+        return empty
+
+    _add_deliveries(endpoints, batch_size, now)
+    lease = timedelta(seconds=config["TIMEOUT"] * (len(endpoints) + 1))
+    with transaction.atomic():
+        deliveries = list(
+            OutboxDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("event")
+            .filter(
+                endpoint__in=endpoints,
+                delivered_at__isnull=True,
+                available_at__lte=now,
+                attempts__lt=config["MAX_ATTEMPTS"],
+            )
+            .order_by("event_id", "id")[:batch_size]
+        )
+        for delivery in deliveries:
+            delivery.attempts += 1
+            delivery.available_at = now + lease
+        OutboxDelivery.objects.bulk_update(deliveries, ["attempts", "available_at"])
+    if not deliveries:
+        return empty
+
+    by_endpoint = {}
+    for delivery in deliveries:
+        by_endpoint.setdefault(delivery.endpoint, []).append(delivery)
+    errors = {}
+    for url, batch in by_endpoint.items():
+        try:
+            post_events(url, [delivery.event for delivery in batch], config["TIMEOUT"])
+        except (urllib.error.URLError, OSError, ValueError) as exc:
+            errors[url] = f"{url}: {exc}"
+            logger.warning("Outbox delivery of %s events failed: %s", len(batch), errors[url])
+
+    finished = timezone.now()
+    for delivery in deliveries:
+        error = errors.get(delivery.endpoint)
+        if error is None:
+            delivery.delivered_at = finished
+        else:
+            delivery.last_error = error
+            delivery.available_at = finished + backoff(delivery.attempts, config)
+    OutboxDelivery.objects.bulk_update(
+        deliveries, ["delivered_at", "last_error", "available_at"]
+    )
+    delivered = [delivery for delivery in deliveries if delivery.delivered_at]
+    _complete_events({delivery.event_id for delivery in delivered}, endpoints, finished)
+
+    lag = (finished - min(delivery.event.created_at for delivery in deliveries)).total_seconds()
+    if delivered:
+        logger.info("Delivered %s outbox events, lag %.3fs", len(delivered), lag)
+
+    return {
+        "claimed": len(deliveries),
+        "delivered": len(delivered),
+        "failed": len(deliveries) - len(delivered),
+        "lag_seconds": lag,
+    }
+
+
+def outbox_stats(now=None) -> dict:
+    now = now or timezone.now()
+    pending = OutboxEvent.objects.filter(delivered_at__isnull=True)
+    oldest = pending.aggregate(oldest=Min("created_at"))["oldest"]
+    return {
+        "pending": pending.count(),
+        "dead": OutboxDelivery.objects.filter(
+            delivered_at__isnull=True, attempts__gte=outbox_settings()["MAX_ATTEMPTS"]
+        ).count(),
+        "oldest_pending_seconds": (now - oldest).total_seconds() if oldest else 0.0,
+    }
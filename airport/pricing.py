@@ -0,0 +1,145 @@
+import copy
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from airport.bulk import post_bulk_save
+from airport.models import Flight
+
+DEFAULT_PRICING = {
+    "BASE_FARE": 20.0,
+    "FARE_PER_KM": 0.08,
+    "LOAD_FACTOR_WEIGHT": 1.5,
+    "URGENCY_WEIGHT": 0.6,
+    "URGENCY_DAYS": 14.0,
+    "MAX_MULTIPLIER": 4.0,
+}
+
+
+def pricing_settings() -> dict:
+    return {**DEFAULT_PRICING, **getattr(settings, "PRICING", {})}
+
+
+def base_fares(distances, route_base_fares=None) -> np.ndarray:
+    """Route base fare (PRICING["BASE_FARE"] where a route has none) plus the per-km part"""
+    config = pricing_settings()
+    distances = np.asarray(distances, dtype=np.float64)
+    base = np.full_like(distances, config["BASE_FARE"])
+    if route_base_fares is not None:
+        route_base = np.array(
+            [np.nan if fare is None else float(fare) for fare in route_base_fares],
+            dtype=np.float64,
+        )
+        base = np.where(np.isnan(route_base), base, route_base)
+    return base + config["FARE_PER_KM"] * distances
+
+
+def compute_fares(
+    distances, seats_sold, capacities, days_to_departure, route_base_fares=None
+) -> np.ndarray:
+    config = pricing_settings()
+    seats_sold = np.asarray(seats_sold, dtype=np.float64)
+    capacities = np.asarray(capacities, dtype=np.float64)
+    days = np.clip(np.asarray(days_to_departure, dtype=np.float64), 0, None)
+
+    load_factor = np.divide(
+        seats_sold,
+        capacities,
+        out=np.ones_like(seats_sold),
+        where=capacities > 0,
+    )
+    multiplier = (
+        1
+        + config["LOAD_FACTOR_WEIGHT"] * np.square(load_factor)
+        + config["URGENCY_WEIGHT"] * np.exp(-days / config["URGENCY_DAYS"])
+    )
+    multiplier = np.minimum(multiplier, config["MAX_MULTIPLIER"])
+
+    return np.round(base_fares(distances, route_base_fares) * multiplier, 2)
+
+
+def _flight_pricing_rows(queryset, now):
+    rows = list(
+        queryset.annotate(seats_sold=Count("tickets"))
+        .order_by()
+        .values_list(
+            "id",
+            "route__distance",
+            "route__base_fare",
+            "airplane__rows",
+            "airplane__seats_in_row",
+            "departure_time",
+            "seats_sold",
+        )
+    )
+    if not rows:
+        return [], np.empty(0)
+
+    ids, distances, route_base_fares, airplane_rows, seats_in_row, departures, seats_sold = zip(
+        *rows
+    )
+    capacities = np.asarray(airplane_rows) * np.asarray(seats_in_row)
+    days_to_departure = np.fromiter(
+        ((departure - now).total_seconds() / 86400 for departure in departures),
+        dtype=np.float64,
+        count=len(departures),
+    )
+    fares = compute_fares(
+        distances, seats_sold, capacities, days_to_departure, route_base_fares
+    )
+    return list(ids), fares
+
+
+def quote_flights(flights, now=None) -> dict:
+    """Return {flight_id: Decimal fare}, using stored quotes where present"""
+    quotes = {
+        flight.id: flight.fare for flight in flights if flight.fare is not None
+    }
+    missing_ids = [flight.id for flight in flights if flight.id not in quotes]
+
+    if missing_ids:
+        ids, fares = _flight_pricing_rows(
+            Flight.objects.filter(id__in=missing_ids), now or timezone.now()
+        )
+        quotes.update(
+            (flight_id, Decimal(f"{fare:.2f}")) for flight_id, fare in zip(ids, fares)
+        )
+
+    return quotes
+
+
+def reprice_upcoming_flights(now=None, batch_size=1000) -> int:
+    """Store a fresh quote on every upcoming flight; return how many were priced.
+
+    Only flights whose fare moved are written, and post_bulk_save is sent
+    for them so the caches, board and change feed pick up the new fares.
+    """
+    now = now or timezone.now()
+    ids, fares = _flight_pricing_rows(
+        Flight.objects.filter(departure_time__gt=now), now
+    )
+    quotes = {flight_id: Decimal(f"{fare:.2f}") for flight_id, fare in zip(ids, fares)}
+
+    with transaction.atomic():
+        for start in range(0, len(ids), batch_size):
+            changed, previous = [], {}
+            for flight in Flight.objects.filter(id__in=ids[start:start + batch_size]):
+                if flight.fare != quotes[flight.id]:
+                    previous[flight.pk] = copy.copy(flight)
+                    flight.fare = quotes[flight.id]
+                    changed.append(flight)
+            if changed:
+                Flight.objects.bulk_update(changed, ["fare"], batch_size=batch_size)
+                post_bulk_save.send(
+                    sender=Flight,
+                    instances=changed,
+                    created=False,
+                    previous=previous,
+                    update_fields={"fare"},
+                )
+
+    return len(ids)
@@ -0,0 +1,106 @@
+import logging
+import random
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RAISE = "raise"
+LOG = "log"
+
+DEFAULT_QUERY_BUDGET = {
+    # What to do when a request goes over its budget: "raise" or "log".
+    "ACTION": LOG,
+    # Share of over-budget requests that are logged.
+    "SAMPLE_RATE": 1.0,
+}
+
+
+def query_budget_settings() -> dict:
+    return {**DEFAULT_QUERY_BUDGET, **getattr(settings, "QUERY_BUDGET", {})}
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudget:
+    """Most queries and seconds of database time a view may use per request"""
+
+    def __init__(self, max_queries=None, max_db_time=None):
+        self.max_queries = max_queries
+        self.max_db_time = max_db_time
+
+    def __repr__(self):
+        return f"QueryBudget(max_queries={self.max_queries}, max_db_time={self.max_db_time})"
+
+
+def query_budget(max_queries=None, max_db_time=None):
+    """Declares the budget of a function view"""
+
+    def decorator(view):
+        view.query_budget = QueryBudget(max_queries, max_db_time)
+        return view
+
+    return decorator
+
+
+def budget_for(view_func, request):
+    """The budget a view declares, either directly or per viewset action.
+
+    Views set ``query_budget`` to a QueryBudget, or to a dict of them keyed
+    by action name.
+    """
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view_func, "cls", None), "query_budget", None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, "actions", None) or {}
+        budget = budget.get(actions.get(request.method.lower()))
+    return budget
+
+
+class QueryBudgetTracker:
+    """Connection execute wrapper counting the queries and time of one request"""
+
+    def __init__(self, config):
+        self.config = config
+        self.budget = None
+        self.label = ""
+        self.queries = 0
+        self.db_time = 0.0
+        self.reported = False
+
+    def start(self, budget, label):
+        self.budget = budget
+        self.label = label
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.budget is None:
+            return execute(sql, params, many, context)
+
+        self.queries += 1
+        max_queries = self.budget.max_queries
+        if max_queries is not None and self.queries > max_queries:
+            self.exceeded(f"{self.label} ran more than {max_queries} queries: {sql[:200]}")
+
+        started = time.monotonic()
+        result = execute(sql, params, many, context)
+        self.db_time += time.monotonic() - started
+
+        max_db_time = self.budget.max_db_time
+        if max_db_time is not None and self.db_time > max_db_time:
+            self.exceeded(
+                f"{self.label} spent {self.db_time:.3f}s in the database, "
+                f"over its {max_db_time}s budget"
+            )
+        return result
+
+    def exceeded(self, message):
+        if self.config["ACTION"] == RAISE:
+            raise QueryBudgetExceeded(message)
+        # Log once per request, for a sample of requests.
+        if not self.reported and random.random() < self.config["SAMPLE_RATE"]:
+            logger.warning(message)
+        self.reported = True
@@ -0,0 +1,131 @@
+from django.db import connection
+
+from airport.models import Airplane, AirplaneType, Airport, Crew
+from airport.schedule import VersionedScheduleIndex
+
+
+class ReferenceTable(VersionedScheduleIndex):
+    """In-process identity map of a small, rarely changing table.
+
+    The whole table is loaded in one query and shared by every request in
+    the worker, so the instances it hands out must be treated as read-only.
+    Inside a transaction a stale copy is never rebuilt, since it could pick
+    up rows that are later rolled back; lookups fall back to the database
+    until the copy is rebuilt outside one.
+    """
+
+    def __init__(self, model, select_related=()):
+        super().__init__()
+        self.model = model
+        self.select_related = select_related
+        self.version_key = f"airport:reference:{model._meta.label_lower}:version"
+
+    def build(self) -> dict:
+        queryset = self.model.objects.select_related(*self.select_related).order_by()
+        return {instance.pk: instance for instance in queryset.iterator()}
+
+    def table(self):
+        with self._lock:
+            version = self._shared_version()
+            if self._index is not None and version == self._version:
+                return self._index
+            if connection.in_atomic_block:
+                return None
+            self._index = self.build()
+            self._version = version
+            return self._index
+
+    def get(self, pk):
+        table = self.table()
+        instance = table.get(pk) if table is not None else None
+        if instance is None:
+            instance = (
+                self.model.objects.select_related(*self.select_related).filter(pk=pk).first()
+            )
+        return instance
+
+    def get_many(self, pks) -> dict:
+        pks = set(pks)
+        table = self.table() or {}
+        found = {pk: table[pk] for pk in pks if pk in table}
+        missing = pks - found.keys()
+        if missing:
+            found.update(
+                self.model.objects.select_related(*self.select_related).in_bulk(missing)
+            )
+        return found
+
+
+airports = ReferenceTable(Airport)
+airplane_types = ReferenceTable(AirplaneType)
+airplanes = ReferenceTable(Airplane, select_related=("airplane_type",))
+crews = ReferenceTable(Crew)
+
+REFERENCE_TABLES = {
+    Airport: airports,
+    AirplaneType: airplane_types,
+    Airplane: airplanes,
+    Crew: crews,
+}
+
+
+def warm_reference_data():
+    for table in REFERENCE_TABLES.values():
+        table.table()
+
+
+def reference_table_for(queryset):
+    """The reference table an unfiltered queryset can be answered from"""
+    if queryset.query.where:
+        return None
+    return REFERENCE_TABLES.get(queryset.model)
+
+
+def attach_reference_data(instances, depth=3):
+    """Points foreign keys to reference data at the shared cached instances.
+
+    Walks already loaded relations and prefetched collections up to depth
+    levels down, so serializers reading e.g. flight.route.source or
+    order.tickets[].flight.airplane do not query for them. Rows missing from
+    the cache are fetched with one query per table and level.
+    """
+    level = list(instances)
+    while level:
+        wanted = {}
+        links = []
+        below = []
+        for instance in level:
+            for field in instance._meta.concrete_fields:
+                if not field.is_relation:
+                    continue
+                table = REFERENCE_TABLES.get(field.related_model)
+                if table is not None:
+                    pk = getattr(instance, field.attname)
+                    if pk is not None and not field.is_cached(instance):
+                        wanted.setdefault(table, set()).add(pk)
+                        links.append((instance, field, table, pk))
+                elif field.is_cached(instance) and field.get_cached_value(instance) is not None:
+                    below.append(field.get_cached_value(instance))
+            for related in getattr(instance, "_prefetched_objects_cache", {}).values():
+                if related.model not in REFERENCE_TABLES:
+                    below.extend(related)
+
+        found = {table: table.get_many(pks) for table, pks in wanted.items()}
+        for instance, field, table, pk in links:
+            if pk in found[table]:
+                field.set_cached_value(instance, found[table][pk])
+
+        if not depth:
+            break
+        depth -= 1
+        level = below
+
+
+class ReferenceDataMixin:
+    """Attaches cached reference data to the instances a view serializes"""
+
+    def get_serializer(self, *args, **kwargs):
+        instance = args[0] if args else kwargs.get("instance")
+        if instance is not None:
+            attach_reference_data(instance if kwargs.get("many") else [instance])
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,114 @@
+from collections.abc import Mapping
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
+
+from airport.reference_data import reference_table_for
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that resolves many referenced objects in one query.
+
+    Resolved instances are shared through the root serializer, or through
+    context["batched_relations"] when several root serializers validate one
+    payload, so every serializer involved reuses the same lookups.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def _resolved(self) -> dict:
+        shared = self.context.get("batched_relations")
+        if shared is not None:
+            return shared
+
+        root = self.root
+        if not hasattr(root, "_batched_relations"):
+            root._batched_relations = {}
+        return root._batched_relations
+
+    def _normalize(self, value):
+        if isinstance(value, bool):
+            return None
+        try:
+            if self.pk_field is not None:
+                value = self.pk_field.to_internal_value(value)
+            return self.get_queryset().model._meta.pk.to_python(value)
+        except (TypeError, ValueError, DjangoValidationError, serializers.ValidationError):
+            return None
+
+    def resolve(self, values):
+        queryset = self.get_queryset()
+        resolved = self._resolved()
+        pks = {
+            pk
+            for pk in map(self._normalize, values)
+            if pk is not None and (queryset.model, pk) not in resolved
+        }
+        if not pks:
+            return
+
+        for pk in pks:
+            resolved[(queryset.model, pk)] = None
+        table = reference_table_for(queryset)
+        if table is not None:
+            instances = table.get_many(pks).values()
+        else:
+            instances = queryset.filter(pk__in=pks)
+        for instance in instances:
+            resolved[(queryset.model, instance.pk)] = instance
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        key = (queryset.model, self._normalize(data))
+        resolved = self._resolved()
+        if key[1] is not None and key not in resolved and reference_table_for(queryset):
+            self.resolve([data])
+        if key[1] is not None and key in resolved:
+            if resolved[key] is None:
+                self.fail("does_not_exist", pk_value=data)
+            return resolved[key]
+
+        return super().to_internal_value(data)
+
+
+class BatchedManyRelatedField(ManyRelatedField):
+    def to_internal_value(self, data):
+        if not isinstance(data, str) and hasattr(data, "__iter__"):
+            data = list(data)
+            self.child_relation.resolve(data)
+        return super().to_internal_value(data)
+
+
+def prefetch_relations(serializer, items):
+    """Resolve the serializer's batched relations for all items at once"""
+    items = [item for item in items if isinstance(item, Mapping)]
+    for field in serializer.fields.values():
+        if field.read_only:
+            continue
+        if isinstance(field, BatchedPrimaryKeyRelatedField):
+            field.resolve(
+                item[field.field_name] for item in items if field.field_name in item
+            )
+        elif isinstance(field, BatchedManyRelatedField):
+            field.child_relation.resolve(
+                pk
+                for item in items
+                if isinstance(item.get(field.field_name), list)
+                for pk in item[field.field_name]
+            )
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """List serializer that resolves the child's batched relations upfront"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            prefetch_relations(self.child, data)
+        return super().to_internal_value(data)
@@ -0,0 +1,55 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import msgpack
+import orjson
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+def default_encoder(obj):
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+
+    if isinstance(obj, Decimal):
+        return str(obj)
+
+    if isinstance(obj, Promise):
+        return str(obj)
+
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+
+    if hasattr(obj, "__iter__"):
+        return list(obj)
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson, which encodes datetimes natively."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+        if self.get_indent(accepted_media_type, renderer_context):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=default_encoder, option=option)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        return msgpack.packb(data, default=default_encoder, use_bin_type=True)
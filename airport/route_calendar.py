@@ -0,0 +1,78 @@
+import calendar
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from airport.models import Flight, Ticket
+
+
+def calendar_cache_key(route_id, month: date) -> str:
+    return f"airport:route_calendar:{route_id}:{month:%Y-%m}"
+
+
+def invalidate_route_calendar(route_id, day: date):
+    cache.delete(calendar_cache_key(route_id, day.replace(day=1)))
+
+
+def month_bounds(month: date) -> tuple:
+    days = calendar.monthrange(month.year, month.month)[1]
+    start = timezone.make_aware(datetime.combine(month, time.min))
+    end = timezone.make_aware(datetime.combine(month + timedelta(days=days), time.min))
+    return start, end, days
+
+
+def compute_route_calendar(route_id, month: date) -> list:
+    start, end, days = month_bounds(month)
+    tickets_sold = (
+        Ticket.objects.filter(flight=OuterRef("pk"))
+        .values("flight")
+        .annotate(sold=Count("id"))
+        .values("sold")
+    )
+    rows = (
+        Flight.objects.filter(
+            route_id=route_id, departure_time__gte=start, departure_time__lt=end
+        )
+        .annotate(day=TruncDate("departure_time"))
+        .values("day")
+        .annotate(
+            flights=Count("id"),
+            min_tickets_available=Min(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - Coalesce(Subquery(tickets_sold), Value(0))
+            ),
+            min_fare=Min("fare"),
+            earliest_departure=Min("departure_time"),
+        )
+        .order_by("day")
+    )
+    by_day = {row["day"]: row for row in rows}
+
+    result = []
+    for offset in range(days):
+        day = month + timedelta(days=offset)
+        row = by_day.get(day)
+        result.append(
+            {
+                "date": day,
+                "flights": row["flights"] if row else 0,
+                "min_tickets_available": row["min_tickets_available"] if row else None,
+                "min_fare": row["min_fare"] if row else None,
+                "earliest_departure": row["earliest_departure"] if row else None,
+            }
+        )
+    return result
+
+
+def route_calendar(route_id, month: date) -> list:
+    """Per-day flights, seats and fares for a route month, cached per month"""
+    key = calendar_cache_key(route_id, month)
+    days = cache.get(key)
+    if days is None:
+        days = compute_route_calendar(route_id, month)
+        cache.set(key, days, getattr(settings, "ROUTE_CALENDAR_CACHE_TTL", 60 * 10))
+    return days
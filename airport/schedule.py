@@ -0,0 +1,350 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.models import Flight
+
+
+def as_datetime(value) -> datetime:
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def as_timestamp(value) -> float:
+    return as_datetime(value).timestamp()
+
+
+class IntervalIndex:
+    """Per-key intervals kept sorted by start time.
+
+    Lookups bisect on the start times and use the longest interval stored
+    under the key to bound how far back an overlapping interval can begin,
+    so a conflict check is O(log n + k) instead of a scan.
+    """
+
+    def __init__(self):
+        self._starts = {}
+        self._entries = {}
+        self._max_length = {}
+        self._keys_by_item = {}
+        self._data = {}
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def add(self, key, start, end, item, data=None):
+        self.remove(key, item)
+        if data is not None:
+            self._data[item] = data
+        starts = self._starts.setdefault(key, [])
+        entries = self._entries.setdefault(key, [])
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        entries.insert(position, (start, end, item))
+        self._max_length[key] = max(self._max_length.get(key, 0), end - start)
+        self._keys_by_item.setdefault(item, set()).add(key)
+
+    def remove(self, key, item):
+        entries = self._entries.get(key)
+        if not entries:
+            return
+        for position, entry in enumerate(entries):
+            if entry[2] == item:
+                del entries[position]
+                del self._starts[key][position]
+                break
+        keys = self._keys_by_item.get(item)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_item[item]
+                self._data.pop(item, None)
+
+    def remove_item(self, item):
+        for key in list(self._keys_by_item.get(item, ())):
+            self.remove(key, item)
+
+    def keys(self) -> list:
+        return [key for key, entries in self._entries.items() if entries]
+
+    def keys_for(self, item) -> set:
+        return set(self._keys_by_item.get(item, ()))
+
+    def entries(self, key) -> list:
+        return list(self._entries.get(key, ()))
+
+    def data(self, item):
+        return self._data.get(item)
+
+    def previous(self, key, start, exclude=None):
+        """Return the last entry under key starting before start"""
+        entries = self._entries.get(key, [])
+        position = bisect_left(self._starts.get(key, []), start)
+        for candidate in range(position - 1, -1, -1):
+            if entries[candidate][2] != exclude:
+                return entries[candidate]
+        return None
+
+    def following(self, key, start, exclude=None):
+        """Return the first entry under key starting at or after start"""
+        entries = self._entries.get(key, [])
+        position = bisect_left(self._starts.get(key, []), start)
+        for candidate in range(position, len(entries)):
+            if entries[candidate][2] != exclude:
+                return entries[candidate]
+        return None
+
+    def overlapping(self, key, start, end, gap=0.0, exclude=None) -> list:
+        """Return items under key closer than gap seconds to [start, end)"""
+        starts = self._starts.get(key)
+        if not starts:
+            return []
+
+        entries = self._entries[key]
+        low = bisect_left(starts, start - gap - self._max_length[key])
+        high = bisect_left(starts, end + gap)
+        return [
+            item
+            for entry_start, entry_end, item in entries[low:high]
+            if entry_end + gap > start and item != exclude
+        ]
+
+
+class VersionedScheduleIndex:
+    """Lazily built in-process index kept in sync across workers.
+
+    Local changes are applied incrementally and bump a version counter in
+    the shared cache; a worker that finds a version it did not produce
+    rebuilds its copy from the database on next use. The counter is read
+    at most once per SCHEDULE_VERSION_CHECK_SECONDS, so reads served from a
+    warm index make no cache round-trip and changes made by other workers
+    show up within that interval. An index built inside a transaction may
+    contain rows that are later rolled back, so it is used for that lookup
+    only and never kept.
+    """
+
+    version_key = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._index = None
+        self._version = None
+        self._seen_version = None
+        self._checked_at = None
+
+    def build(self) -> IntervalIndex:
+        raise NotImplementedError
+
+    def reset(self):
+        with self._lock:
+            self._index = None
+            self._version = None
+            self._seen_version = None
+            self._checked_at = None
+
+    def invalidate(self):
+        with self._lock:
+            self._saw_version(self._incr_version())
+            self._index = None
+
+    @staticmethod
+    def version_check_interval() -> float:
+        return getattr(settings, "SCHEDULE_VERSION_CHECK_SECONDS", 1.0)
+
+    def _saw_version(self, version):
+        self._seen_version = version
+        self._checked_at = time.monotonic()
+
+    def _incr_version(self) -> int:
+        try:
+            return cache.incr(self.version_key)
+        except ValueError:
+            cache.add(self.version_key, 0, timeout=None)
+            return cache.incr(self.version_key)
+
+    def _shared_version(self) -> int:
+        if (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.version_check_interval()
+        ):
+            return self._seen_version
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 0, timeout=None)
+            version = cache.get(self.version_key, 0)
+        self._saw_version(version)
+        return version
+
+    def index(self) -> IntervalIndex:
+        with self._lock:
+            version = self._shared_version()
+            if self._index is not None and version == self._version:
+                return self._index
+            if connection.in_atomic_block:
+                return self.build()
+            self._index = self.build()
+            self._version = version
+            return self._index
+
+    def apply(self, change):
+        with self._lock:
+            version = self._incr_version()
+            self._saw_version(version)
+            if self._index is None or version != self._version + 1:
+                self._index = None
+                return
+            change(self._index)
+            self._version = version
+
+
+class CrewRoster(VersionedScheduleIndex):
+    version_key = "airport:crew_roster_version"
+
+    @staticmethod
+    def min_rest() -> float:
+        minutes = getattr(settings, "CREW_MIN_REST_MINUTES", 60)
+        return timedelta(minutes=minutes).total_seconds()
+
+    def build(self) -> IntervalIndex:
+        index = IntervalIndex()
+        assignments = Flight.crews.through.objects.values_list(
+            "crew_id", "flight_id", "flight__departure_time", "flight__arrival_time"
+        )
+        for crew_id, flight_id, departure_time, arrival_time in assignments.iterator():
+            index.add(
+                crew_id,
+                departure_time.timestamp(),
+                arrival_time.timestamp(),
+                flight_id,
+            )
+        return index
+
+    def conflicts(self, crew_ids, departure_time, arrival_time, exclude=None) -> dict:
+        """Return {crew_id: [flight_id, ...]} for crew members that are busy"""
+        index = self.index()
+        start = as_timestamp(departure_time)
+        end = as_timestamp(arrival_time)
+        gap = self.min_rest()
+        conflicts = {}
+        for crew_id in crew_ids:
+            flight_ids = index.overlapping(crew_id, start, end, gap=gap, exclude=exclude)
+            if flight_ids:
+                conflicts[crew_id] = flight_ids
+        return conflicts
+
+    def available(self, crew_ids, departure_time, arrival_time) -> list:
+        busy = self.conflicts(crew_ids, departure_time, arrival_time)
+        return [crew_id for crew_id in crew_ids if crew_id not in busy]
+
+    def assign(self, flight, crew_ids):
+        start = as_timestamp(flight.departure_time)
+        end = as_timestamp(flight.arrival_time)
+
+        def change(index):
+            for crew_id in crew_ids:
+                index.add(crew_id, start, end, flight.id)
+
+        self.apply(change)
+
+    def unassign(self, flight_id, crew_ids=None):
+        def change(index):
+            if crew_ids is None:
+                index.remove_item(flight_id)
+                return
+            for crew_id in crew_ids:
+                index.remove(crew_id, flight_id)
+
+        self.apply(change)
+
+    def reschedule(self, flight):
+        start = as_timestamp(flight.departure_time)
+        end = as_timestamp(flight.arrival_time)
+
+        def change(index):
+            for crew_id in index.keys_for(flight.id):
+                index.add(crew_id, start, end, flight.id)
+
+        self.apply(change)
+
+
+class AirplaneRotation(VersionedScheduleIndex):
+    """Per-airplane legs with their (source, destination) airport ids"""
+
+    version_key = "airport:airplane_rotation_version"
+
+    @staticmethod
+    def min_turnaround() -> float:
+        minutes = getattr(settings, "AIRPLANE_MIN_TURNAROUND_MINUTES", 30)
+        return timedelta(minutes=minutes).total_seconds()
+
+    def build(self) -> IntervalIndex:
+        index = IntervalIndex()
+        legs = Flight.objects.order_by().values_list(
+            "id",
+            "airplane_id",
+            "departure_time",
+            "arrival_time",
+            "route__source_id",
+            "route__destination_id",
+        )
+        for flight_id, airplane_id, departure, arrival, source_id, destination_id in (
+            legs.iterator()
+        ):
+            index.add(
+                airplane_id,
+                departure.timestamp(),
+                arrival.timestamp(),
+                flight_id,
+                data=(source_id, destination_id),
+            )
+        return index
+
+    def conflicts(self, airplane_id, departure_time, arrival_time, exclude=None) -> list:
+        return self.index().overlapping(
+            airplane_id,
+            as_timestamp(departure_time),
+            as_timestamp(arrival_time),
+            gap=self.min_turnaround(),
+            exclude=exclude,
+        )
+
+    def adjacent_legs(self, airplane_id, departure_time, exclude=None) -> tuple:
+        """Return ((flight_id, source_id, destination_id) | None) before and after"""
+        index = self.index()
+        start = as_timestamp(departure_time)
+        legs = []
+        for entry in (
+            index.previous(airplane_id, start, exclude=exclude),
+            index.following(airplane_id, start, exclude=exclude),
+        ):
+            legs.append(None if entry is None else (entry[2], *index.data(entry[2])))
+        return tuple(legs)
+
+    def place(self, flight, source_id, destination_id):
+        start = as_timestamp(flight.departure_time)
+        end = as_timestamp(flight.arrival_time)
+
+        def change(index):
+            index.remove_item(flight.id)
+            index.add(
+                flight.airplane_id, start, end, flight.id, data=(source_id, destination_id)
+            )
+
+        self.apply(change)
+
+    def remove(self, flight_id):
+        self.apply(lambda index: index.remove_item(flight_id))
+
+
+crew_roster = CrewRoster()
+airplane_rotation = AirplaneRotation()
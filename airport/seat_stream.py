@@ -0,0 +1,216 @@
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from airport.models import Flight
+
+TAKEN = "taken"
+RELEASED = "released"
+
+
+class Subscription:
+    def __init__(self, flight_id, loop, max_size):
+        self.flight_id = flight_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    def push(self, change):
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # The client is too slow; drop deltas and resend a snapshot.
+            self.overflowed = True
+
+
+class SeatBroker:
+    """In-process fan-out of committed seat changes to open streams.
+
+    Publishing happens in request threads after commit, subscribers live on
+    the ASGI event loop, so changes are handed over with
+    call_soon_threadsafe. Only streams served by this process see changes
+    made by this process; run the ASGI app and the writers together, or put
+    a shared broker in front of it when scaling out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, flight_id) -> Subscription:
+        subscription = Subscription(
+            flight_id,
+            asyncio.get_running_loop(),
+            getattr(settings, "SEAT_STREAM_QUEUE_SIZE", 1000),
+        )
+        with self._lock:
+            self._subscriptions.setdefault(flight_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.flight_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.flight_id, None)
+
+    def subscriber_count(self, flight_id) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(flight_id, ()))
+
+    def publish(self, flight_id, kind, ticket_id, row, seat):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(flight_id, ()))
+        change = (kind, ticket_id, row, seat)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, change)
+            except RuntimeError:
+                # Event loop already closed; the stream is going away.
+                self.unsubscribe(subscription)
+
+
+seat_broker = SeatBroker()
+
+
+def format_event(event, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+@sync_to_async
+def load_seat_snapshot(flight_id):
+    flight = Flight.objects.select_related("airplane").filter(pk=flight_id).first()
+    if flight is None:
+        return None
+    taken = {
+        (row, seat): ticket_id
+        for ticket_id, row, seat in flight.tickets.values_list("id", "row", "seat")
+    }
+    return flight.airplane.capacity, taken
+
+
+def seats(keys) -> list:
+    return [{"row": row, "seat": seat} for row, seat in sorted(keys)]
+
+
+def snapshot_event(flight_id, capacity, taken) -> bytes:
+    return format_event(
+        "snapshot",
+        {
+            "flight": flight_id,
+            "capacity": capacity,
+            "tickets_available": capacity - len(taken),
+            "taken_places": seats(taken),
+        },
+    )
+
+
+async def seat_events(flight_id, subscription, capacity, taken):
+    """Yield a snapshot, then merged seat deltas as they are committed.
+
+    Changes queued while the snapshot was loading are reconciled against
+    ticket ids, so a seat is never reported twice or released early. The
+    subscription is dropped however the stream ends, including when a
+    client disconnect cancels the task.
+    """
+    heartbeat = getattr(settings, "SEAT_STREAM_HEARTBEAT", 15)
+    try:
+        yield snapshot_event(flight_id, capacity, taken)
+
+        while True:
+            try:
+                changes = [await asyncio.wait_for(subscription.queue.get(), heartbeat)]
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+
+            while not subscription.queue.empty():
+                changes.append(subscription.queue.get_nowait())
+
+            if subscription.overflowed:
+                subscription.overflowed = False
+                snapshot = await load_seat_snapshot(flight_id)
+                if snapshot is None:
+                    yield format_event("closed", {"flight": flight_id})
+                    return
+                capacity, taken = snapshot
+                yield snapshot_event(flight_id, capacity, taken)
+                continue
+
+            newly_taken, released = set(), set()
+            for kind, ticket_id, row, seat in changes:
+                key = (row, seat)
+                if kind == TAKEN and taken.get(key) != ticket_id:
+                    taken[key] = ticket_id
+                    newly_taken.add(key)
+                    released.discard(key)
+                elif kind == RELEASED and taken.get(key) == ticket_id:
+                    del taken[key]
+                    released.add(key)
+                    newly_taken.discard(key)
+
+            if newly_taken or released:
+                yield format_event(
+                    "seats",
+                    {
+                        "taken": seats(newly_taken),
+                        "released": seats(released),
+                        "tickets_available": capacity - len(taken),
+                    },
+                )
+    finally:
+        seat_broker.unsubscribe(subscription)
+
+
+@sync_to_async
+def is_authenticated(request) -> bool:
+    try:
+        if JWTAuthentication().authenticate(request) is not None:
+            return True
+    except AuthenticationFailed:
+        return False
+    return request.user.is_authenticated
+
+
+class SeatEventStream:
+    """Streaming content that drops its subscription when the response closes"""
+
+    def __init__(self, flight_id, subscription, capacity, taken):
+        self.subscription = subscription
+        self.events = seat_events(flight_id, subscription, capacity, taken)
+
+    def __aiter__(self):
+        return self.events
+
+    def close(self):
+        seat_broker.unsubscribe(self.subscription)
+
+
+async def flight_seat_stream(request, pk):
+    """Server-Sent Events stream of seat changes for one flight"""
+    if not await is_authenticated(request):
+        return HttpResponse(
+            json.dumps({"detail": "Authentication credentials were not provided."}),
+            status=401,
+            content_type="application/json",
+        )
+
+    subscription = seat_broker.subscribe(pk)
+    snapshot = await load_seat_snapshot(pk)
+    if snapshot is None:
+        seat_broker.unsubscribe(subscription)
+        raise Http404
+
+    response = StreamingHttpResponse(
+        SeatEventStream(pk, subscription, *snapshot),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
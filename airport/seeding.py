@@ -0,0 +1,202 @@
+import hashlib
+from pathlib import Path
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from airport.analytics import departure_date, rebuild_route_daily_loads
+from airport.board import airport_board
+from airport.change_feed import ENTITY_NAMES, UPDATED, record_changes
+from airport.flight_search import invalidate_availability, invalidate_flight_searches
+from airport.geo import airport_index
+from airport.models import Flight, SeedFixture, Ticket
+from airport.reference_data import REFERENCE_TABLES
+from airport.route_calendar import invalidate_route_calendar
+from airport.schedule import airplane_rotation, crew_roster
+
+# Rows of these models are matched on a unique field instead of the fixture pk,
+# so seeding works on databases where the same rows got different ids.
+NATURAL_KEYS = {
+    "airport.airport": "name",
+    "airport.airplanetype": "name",
+    "user.user": "email",
+}
+
+
+def fixture_checksum(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def dependency_order(models) -> list:
+    """Models sorted so that every model comes after the ones it references"""
+    pending = list(models)
+    ordered = []
+    while pending:
+        for model in pending:
+            references = {
+                field.related_model
+                for field in model._meta.concrete_fields + model._meta.many_to_many
+                if field.is_relation and field.related_model is not model
+            }
+            if not references & set(pending):
+                break
+        else:
+            raise ValueError("Fixture models have circular references.")
+        pending.remove(model)
+        ordered.append(model)
+    return ordered
+
+
+def remap_references(obj, m2m_data, pk_map):
+    for field in obj._meta.concrete_fields:
+        ids = pk_map.get(field.related_model) if field.is_relation else None
+        value = getattr(obj, field.attname)
+        if ids and value in ids:
+            setattr(obj, field.attname, ids[value])
+    for name, values in m2m_data.items():
+        ids = pk_map.get(obj._meta.get_field(name).related_model)
+        if ids:
+            m2m_data[name] = [ids.get(value, value) for value in values]
+
+
+def upsert(model, items, pk_map, batch_size):
+    """Inserts or updates the fixture rows of one model in batches.
+
+    Rows are matched on the model's natural key or, failing that, on the
+    fixture pk. Fills pk_map with {fixture pk: database pk} for natural keys.
+    """
+    opts = model._meta
+    key = NATURAL_KEYS.get(opts.label_lower, opts.pk.name)
+    instances = [item.object for item in items]
+    for item in items:
+        remap_references(item.object, item.m2m_data, pk_map)
+
+    # bulk_create stamps auto_now fields; the fixture values are restored below.
+    stamped = [
+        field
+        for field in opts.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    stamps = [[getattr(obj, field.attname) for field in stamped] for obj in instances]
+
+    fixture_pks = [obj.pk for obj in instances]
+    if key != opts.pk.name:
+        for obj in instances:
+            obj.pk = None
+    update_fields = [
+        field.name
+        for field in opts.concrete_fields
+        if not field.primary_key and field.name != key
+    ]
+    model.objects.bulk_create(
+        instances,
+        batch_size=batch_size,
+        update_conflicts=bool(update_fields),
+        ignore_conflicts=not update_fields,
+        unique_fields=[key] if update_fields else None,
+        update_fields=update_fields or None,
+    )
+
+    if key != opts.pk.name:
+        ids = {}
+        values = [getattr(obj, key) for obj in instances]
+        for start in range(0, len(values), batch_size):
+            ids.update(
+                model.objects.filter(**{f"{key}__in": values[start:start + batch_size]})
+                .values_list(key, "pk")
+            )
+        for obj in instances:
+            obj.pk = ids[getattr(obj, key)]
+        pk_map[model] = {
+            fixture_pk: obj.pk
+            for fixture_pk, obj in zip(fixture_pks, instances)
+            if fixture_pk is not None
+        }
+
+    if stamped:
+        for obj, values in zip(instances, stamps):
+            for field, value in zip(stamped, values):
+                setattr(obj, field.attname, value)
+        model.objects.bulk_update(
+            instances, [field.name for field in stamped], batch_size=batch_size
+        )
+
+    for name in {name for item in items for name in item.m2m_data}:
+        set_m2m(opts.get_field(name), items, name, batch_size)
+
+
+def set_m2m(field, items, name, batch_size):
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+    owners = [item.object.pk for item in items if name in item.m2m_data]
+    for start in range(0, len(owners), batch_size):
+        through.objects.filter(**{f"{source}__in": owners[start:start + batch_size]}).delete()
+    through.objects.bulk_create(
+        [
+            through(**{source: item.object.pk, target: value})
+            for item in items
+            for value in item.m2m_data.get(name, ())
+        ],
+        batch_size=batch_size,
+    )
+
+
+def seed_fixture(path, force=False, batch_size=500):
+    """Applies a JSON fixture unless this exact content was applied before.
+
+    Returns the number of objects written, or None if the fixture was skipped.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    checksum = fixture_checksum(data)
+    if not force and SeedFixture.objects.filter(name=path.name, checksum=checksum).exists():
+        return None
+
+    with transaction.atomic():
+        groups = {}
+        for item in serializers.deserialize("json", data):
+            groups.setdefault(type(item.object), []).append(item)
+
+        pk_map = {}
+        for model in dependency_order(groups):
+            upsert(model, groups[model], pk_map, batch_size)
+            if model in ENTITY_NAMES:
+                record_changes(model, [item.object.pk for item in groups[model]], UPDATED)
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), list(groups)):
+                cursor.execute(sql)
+
+        rebuild_route_daily_loads()
+        flight_days = {
+            (item.object.route_id, departure_date(item.object))
+            for item in groups.get(Flight, ())
+        }
+
+        def invalidate_calendars():
+            for route_id, day in flight_days:
+                invalidate_route_calendar(route_id, day)
+
+        indexes = (
+            crew_roster,
+            airplane_rotation,
+            airport_index,
+            airport_board,
+            *REFERENCE_TABLES.values(),
+        )
+        for index in indexes:
+            transaction.on_commit(index.invalidate)
+        transaction.on_commit(invalidate_flight_searches)
+        seeded_flight_ids = {item.object.pk for item in groups.get(Flight, ())} | {
+            item.object.flight_id for item in groups.get(Ticket, ())
+        }
+        transaction.on_commit(lambda: invalidate_availability(seeded_flight_ids))
+        transaction.on_commit(invalidate_calendars)
+
+        written = sum(len(items) for items in groups.values())
+        SeedFixture.objects.update_or_create(
+            name=path.name, defaults={"checksum": checksum, "objects_count": written}
+        )
+    return written
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
@@ -10,14 +12,19 @@ from airport.models import (
     Route,
     Flight,
     Ticket,
-    Order
+    Order,
+    RouteDailyLoad,
 )
+from airport.outbox import order_payload, publish
+from airport.pricing import quote_flights
+from airport.relations import BatchedListSerializer, BatchedPrimaryKeyRelatedField
+from airport.schedule import airplane_rotation, crew_roster
 
 
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ("id", "name", "closest_big_city")
+        fields = ("id", "name", "closest_big_city", "latitude", "longitude")
 
 
 class AirplaneTypeSerializer(serializers.ModelSerializer):
@@ -33,15 +40,20 @@ class CrewSerializer(serializers.ModelSerializer):
 
 
 class AirplaneSerializer(serializers.ModelSerializer):
+    airplane_type = BatchedPrimaryKeyRelatedField(queryset=AirplaneType.objects.all())
+
     class Meta:
         model = Airplane
         fields = ("id", "name", "rows", "seats_in_row", "airplane_type", "capacity")
 
 
 class RouteSerializer(serializers.ModelSerializer):
+    source = BatchedPrimaryKeyRelatedField(queryset=Airport.objects.all())
+    destination = BatchedPrimaryKeyRelatedField(queryset=Airport.objects.all())
+
     class Meta:
         model = Route
-        fields = ("id", "source", "destination", "distance")
+        fields = ("id", "source", "destination", "distance", "base_fare")
 
 
 class RouteListSerializer(RouteSerializer):
@@ -54,7 +66,7 @@ class RouteListSerializer(RouteSerializer):
 
     class Meta:
         model = Route
-        fields = ("id", "source", "destination", "distance")
+        fields = ("id", "source", "destination", "distance", "base_fare")
 
 
 class RouteDetailSerializer(RouteSerializer):
@@ -63,13 +75,96 @@ class RouteDetailSerializer(RouteSerializer):
 
     class Meta:
         model = Route
-        fields = ("id", "source", "destination", "distance")
+        fields = ("id", "source", "destination", "distance", "base_fare")
 
 
 class FlightSerializer(serializers.ModelSerializer):
+    route = BatchedPrimaryKeyRelatedField(queryset=Route.objects.all())
+    airplane = BatchedPrimaryKeyRelatedField(queryset=Airplane.objects.all())
+    crews = BatchedPrimaryKeyRelatedField(
+        many=True, queryset=Crew.objects.all(), required=False
+    )
+
+    def validate(self, attrs):
+        data = super(FlightSerializer, self).validate(attrs=attrs)
+        instance = self.instance
+        flight_id = getattr(instance, "id", None)
+        departure_time = attrs.get(
+            "departure_time", getattr(instance, "departure_time", None)
+        )
+        arrival_time = attrs.get(
+            "arrival_time", getattr(instance, "arrival_time", None)
+        )
+        crews = attrs.get("crews")
+        if crews is None and instance is not None:
+            crews = list(instance.crews.all())
+
+        self.validate_crews_availability(
+            crews or (), departure_time, arrival_time, flight_id
+        )
+        self.validate_airplane_rotation(
+            attrs.get("airplane", getattr(instance, "airplane", None)),
+            attrs.get("route", getattr(instance, "route", None)),
+            departure_time,
+            arrival_time,
+            flight_id,
+        )
+        return data
+
+    @staticmethod
+    def validate_crews_availability(crews, departure_time, arrival_time, flight_id):
+        conflicts = crew_roster.conflicts(
+            [crew.id for crew in crews], departure_time, arrival_time, exclude=flight_id
+        )
+        for crew in crews:
+            if crew.id in conflicts:
+                raise ValidationError(
+                    {
+                        "crews": f"{crew} is already assigned to flight(s) "
+                                 f"{sorted(conflicts[crew.id])} within the minimum rest period"
+                    }
+                )
+
+    @staticmethod
+    def validate_airplane_rotation(airplane, route, departure_time, arrival_time, flight_id):
+        if airplane is None or route is None:
+            return
+
+        conflicts = airplane_rotation.conflicts(
+            airplane.id, departure_time, arrival_time, exclude=flight_id
+        )
+        if conflicts:
+            raise ValidationError(
+                {
+                    "airplane": f"Airplane is already assigned to flight(s) "
+                                f"{sorted(conflicts)} within the minimum turnaround"
+                }
+            )
+
+        previous_leg, next_leg = airplane_rotation.adjacent_legs(
+            airplane.id, departure_time, exclude=flight_id
+        )
+        if previous_leg and previous_leg[2] != route.source_id:
+            raise ValidationError(
+                {
+                    "route": f"Airplane's previous flight {previous_leg[0]} "
+                             f"does not land at the source airport"
+                }
+            )
+        if next_leg and next_leg[1] != route.destination_id:
+            raise ValidationError(
+                {
+                    "route": f"Airplane's next flight {next_leg[0]} "
+                             f"does not depart from the destination airport"
+                }
+            )
+
     class Meta:
         model = Flight
-        fields = ("id", "route", "airplane", "departure_time", "arrival_time", "crews")
+        fields = (
+            "id", "route", "airplane", "departure_time", "arrival_time", "crews", "fare"
+        )
+        read_only_fields = ("fare",)
 
 
 class FlightListSerializer(FlightSerializer):
@@ -98,10 +193,15 @@ class FlightListSerializer(FlightSerializer):
             "airplane_capacity",
             "crews_fullname",
             "tickets_available",
+            "fare",
         )
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    flight = BatchedPrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
@@ -115,6 +215,8 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight")
+        list_serializer_class = BatchedListSerializer
+        validators = []
 
 
 class TicketListSerializer(TicketSerializer):
@@ -144,7 +246,8 @@ class FlightDetailSerializer(FlightSerializer):
             "departure_time",
             "arrival_time",
             "crews",
-            "taken_places"
+            "taken_places",
+            "fare",
         )
 
 
@@ -153,16 +256,72 @@ class OrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "tickets", "created_at", "total_price")
+        read_only_fields = ("total_price",)
+
+    def validate_tickets(self, tickets):
+        seats = [
+            (ticket["flight"].id, ticket["row"], ticket["seat"]) for ticket in tickets
+        ]
+        if len(set(seats)) != len(seats):
+            raise ValidationError("The same seat is ordered more than once.")
+
+        taken = Ticket.objects.filter(
+            flight_id__in={flight_id for flight_id, _, _ in seats},
+            row__in={row for _, row, _ in seats},
+        ).values_list("flight_id", "row", "seat")
+        taken = set(taken) & set(seats)
+        if taken:
+            raise ValidationError(
+                [
+                    f"Seat (row: {row}, seat: {seat}) on flight {flight_id} "
+                    f"is already taken."
+                    for flight_id, row, seat in sorted(taken)
+                ]
+            )
+        return tickets
 
     def create(self, validated_data):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
+            flights = {
+                ticket_data["flight"].id: ticket_data["flight"]
+                for ticket_data in tickets_data
+            }
+            quotes = quote_flights(list(flights.values()))
+            validated_data["total_price"] = sum(
+                (quotes[ticket_data["flight"].id] for ticket_data in tickets_data),
+                Decimal("0"),
+            )
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
+            tickets = [
                 Ticket.objects.create(order=order, **ticket_data)
+                for ticket_data in tickets_data
+            ]
+            publish("order.created", "order", order.id, order_payload(order, tickets))
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+    archived_tickets = TicketListSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ("id", "tickets", "archived_tickets", "created_at", "total_price")
+
+
+class RouteDailyLoadSerializer(serializers.ModelSerializer):
+    route = RouteListSerializer(many=False, read_only=True)
+
+    class Meta:
+        model = RouteDailyLoad
+        fields = (
+            "id",
+            "route",
+            "date",
+            "flights",
+            "seats_offered",
+            "seats_sold",
+            "load_factor",
+        )
@@ -0,0 +1,460 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from airport.analytics import (
+    apply_load_delta,
+    departure_date,
+    refresh_airplane_route_days,
+    refresh_route_day,
+)
+from airport.board import airport_board
+from airport.bulk import post_bulk_save
+from airport.change_feed import CREATED, DELETED, UPDATED, record_changes
+from airport.coalesce import flight_detail_cache_key, flight_detail_ttls, single_flight
+from airport.flight_search import invalidate_availability, invalidate_flight_searches
+from airport.geo import airport_index
+from airport.models import Airplane, AirplaneType, Airport, Crew, Flight, Order, Route, Ticket
+from airport.outbox import flight_payload, publish, publish_many, ticket_payload
+from airport.reference_data import REFERENCE_TABLES, airplanes
+from airport.route_calendar import invalidate_route_calendar
+from airport.schedule import airplane_rotation, crew_roster
+from airport.seat_stream import RELEASED, TAKEN, seat_broker
+
+
+@receiver(pre_save, sender=Flight)
+def remember_flight_load_key(sender, instance, **kwargs):
+    instance._previous_load_key = None
+    if instance.pk:
+        previous = Flight.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._previous_load_key = (
+                previous.route_id, departure_date(previous)
+            )
+
+
+@receiver(post_save, sender=Flight)
+def update_load_on_flight_save(sender, instance, created, **kwargs):
+    day = departure_date(instance)
+    if created:
+        apply_load_delta(
+            instance.route_id,
+            day,
+            flights=1,
+            seats_offered=instance.airplane.capacity,
+        )
+        return
+
+    previous_key = getattr(instance, "_previous_load_key", None)
+    if previous_key and previous_key != (instance.route_id, day):
+        refresh_route_day(*previous_key)
+    refresh_route_day(instance.route_id, day)
+
+
+@receiver(post_delete, sender=Flight)
+def update_load_on_flight_delete(sender, instance, **kwargs):
+    refresh_route_day(instance.route_id, departure_date(instance))
+
+
+@receiver(post_save, sender=Ticket)
+def update_load_on_ticket_save(sender, instance, created, **kwargs):
+    if created:
+        apply_load_delta(
+            instance.flight.route_id, departure_date(instance.flight), seats_sold=1
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def update_load_on_ticket_delete(sender, instance, **kwargs):
+    apply_load_delta(
+        instance.flight.route_id, departure_date(instance.flight), seats_sold=-1
+    )
+
+
+@receiver(m2m_changed, sender=Flight.crews.through)
+def update_crew_roster_on_crews_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        transaction.on_commit(crew_roster.invalidate)
+        return
+
+    crew_ids = set(pk_set or ())
+    if action == "post_add":
+        transaction.on_commit(lambda: crew_roster.assign(instance, crew_ids))
+    elif action == "post_remove":
+        transaction.on_commit(lambda: crew_roster.unassign(instance.id, crew_ids))
+    else:
+        transaction.on_commit(lambda: crew_roster.unassign(instance.id))
+
+
+@receiver(post_save, sender=Flight)
+def update_crew_roster_on_flight_save(sender, instance, created, **kwargs):
+    if not created:
+        transaction.on_commit(lambda: crew_roster.reschedule(instance))
+
+
+@receiver(post_delete, sender=Flight)
+def update_crew_roster_on_flight_delete(sender, instance, **kwargs):
+    flight_id = instance.id
+    transaction.on_commit(lambda: crew_roster.unassign(flight_id))
+
+
+@receiver(post_save, sender=Flight)
+def update_airplane_rotation_on_flight_save(sender, instance, **kwargs):
+    source_id = instance.route.source_id
+    destination_id = instance.route.destination_id
+    transaction.on_commit(
+        lambda: airplane_rotation.place(instance, source_id, destination_id)
+    )
+
+
+@receiver(post_delete, sender=Flight)
+def update_airplane_rotation_on_flight_delete(sender, instance, **kwargs):
+    flight_id = instance.id
+    transaction.on_commit(lambda: airplane_rotation.remove(flight_id))
+
+
+# Flight fields the load rollups, crew roster and airplane rotation depend on.
+SCHEDULE_FIELDS = ("route", "airplane", "departure_time", "arrival_time")
+
+
+def rescheduled_flights(instances, previous, update_fields) -> list:
+    """Bulk-saved flights whose schedule fields or crews may have changed"""
+    if update_fields is not None and {*SCHEDULE_FIELDS, "crews"}.isdisjoint(update_fields):
+        return []
+    if previous is None or update_fields is None or "crews" in update_fields:
+        return list(instances)
+    attnames = [Flight._meta.get_field(name).attname for name in SCHEDULE_FIELDS]
+    return [
+        flight
+        for flight in instances
+        if flight.pk not in previous
+        or any(getattr(flight, name) != getattr(previous[flight.pk], name) for name in attnames)
+    ]
+
+
+@receiver(post_bulk_save, sender=Flight)
+def update_schedule_on_flight_bulk_save(
+    sender, instances, previous=None, update_fields=None, **kwargs
+):
+    # Fare-only writes such as repricing leave the rollups and indexes alone.
+    flights = rescheduled_flights(instances, previous, update_fields)
+    if not flights:
+        return
+
+    previous = previous or {}
+    flights += [previous[flight.pk] for flight in flights if flight.pk in previous]
+    for route_id, day in {
+        (flight.route_id, departure_date(flight)) for flight in flights
+    }:
+        refresh_route_day(route_id, day)
+
+    transaction.on_commit(crew_roster.invalidate)
+    transaction.on_commit(airplane_rotation.invalidate)
+
+
+# Airplane fields that set the seats offered on every flight of the airplane.
+CAPACITY_FIELDS = ("rows", "seats_in_row")
+
+
+@receiver(pre_save, sender=Airplane)
+def remember_airplane_capacity(sender, instance, update_fields=None, **kwargs):
+    instance._previous_capacity = None
+    if instance.pk and (update_fields is None or not set(CAPACITY_FIELDS).isdisjoint(update_fields)):
+        instance._previous_capacity = (
+            Airplane.objects.filter(pk=instance.pk).values_list(*CAPACITY_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Airplane)
+def update_load_on_airplane_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_capacity", None)
+    if not created and previous is not None and previous != (
+        instance.rows, instance.seats_in_row
+    ):
+        refresh_airplane_route_days([instance.id])
+
+
+@receiver(post_bulk_save, sender=Airplane)
+def update_load_on_airplane_bulk_save(sender, instances, created, previous=None, **kwargs):
+    if created:
+        return
+    previous = previous or {}
+    resized = [
+        airplane.id
+        for airplane in instances
+        if airplane.pk not in previous
+        or any(
+            getattr(airplane, name) != getattr(previous[airplane.pk], name)
+            for name in CAPACITY_FIELDS
+        )
+    ]
+    if resized:
+        refresh_airplane_route_days(resized)
+
+
+@receiver(post_save, sender=Flight)
+def publish_flight_save(sender, instance, created, **kwargs):
+    publish(
+        "flight.created" if created else "flight.updated",
+        "flight",
+        instance.id,
+        flight_payload(instance),
+    )
+
+
+@receiver(post_delete, sender=Flight)
+def publish_flight_delete(sender, instance, **kwargs):
+    publish("flight.deleted", "flight", instance.id, flight_payload(instance))
+
+
+@receiver(post_bulk_save, sender=Flight)
+def publish_flight_bulk_save(sender, instances, created, **kwargs):
+    event_type = "flight.created" if created else "flight.updated"
+    publish_many(
+        (event_type, "flight", flight.id, flight_payload(flight))
+        for flight in instances
+    )
+
+
+@receiver(post_delete, sender=Ticket)
+def publish_ticket_delete(sender, instance, **kwargs):
+    publish(
+        "ticket.deleted",
+        "ticket",
+        instance.id,
+        {**ticket_payload(instance), "order": instance.order_id},
+    )
+
+
+@receiver(post_delete, sender=Order)
+def publish_order_delete(sender, instance, **kwargs):
+    publish("order.deleted", "order", instance.id, {"id": instance.id, "user": instance.user_id})
+
+
+@receiver(post_save, sender=Ticket)
+def publish_seat_taken(sender, instance, created, **kwargs):
+    if created:
+        change = (instance.flight_id, TAKEN, instance.id, instance.row, instance.seat)
+        transaction.on_commit(lambda: seat_broker.publish(*change))
+
+
+@receiver(post_delete, sender=Ticket)
+def publish_seat_released(sender, instance, **kwargs):
+    change = (instance.flight_id, RELEASED, instance.id, instance.row, instance.seat)
+    transaction.on_commit(lambda: seat_broker.publish(*change))
+
+
+def invalidate_calendar_on_commit(*keys):
+    keys = {key for key in keys if key}
+
+    def invalidate():
+        for route_id, day in keys:
+            invalidate_route_calendar(route_id, day)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Flight)
+def invalidate_calendar_on_flight_save(sender, instance, **kwargs):
+    invalidate_calendar_on_commit(
+        getattr(instance, "_previous_load_key", None),
+        (instance.route_id, departure_date(instance)),
+    )
+
+
+@receiver(post_delete, sender=Flight)
+def invalidate_calendar_on_flight_delete(sender, instance, **kwargs):
+    invalidate_calendar_on_commit((instance.route_id, departure_date(instance)))
+
+
+@receiver(post_bulk_save, sender=Flight)
+def invalidate_calendar_on_flight_bulk_save(sender, instances, previous=None, **kwargs):
+    flights = list(instances) + list((previous or {}).values())
+    invalidate_calendar_on_commit(
+        *((flight.route_id, departure_date(flight)) for flight in flights)
+    )
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_calendar_on_ticket_change(sender, instance, **kwargs):
+    invalidate_calendar_on_commit(
+        (instance.flight.route_id, departure_date(instance.flight))
+    )
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_bulk_save, sender=Airport)
+def invalidate_airport_index(sender, **kwargs):
+    transaction.on_commit(airport_index.invalidate)
+
+
+@receiver(post_save, sender=Flight)
+def update_airport_board_on_flight_save(sender, instance, **kwargs):
+    flight_id = instance.id
+    transaction.on_commit(lambda: airport_board.refresh([flight_id]))
+
+
+@receiver(post_delete, sender=Flight)
+def update_airport_board_on_flight_delete(sender, instance, **kwargs):
+    flight_id = instance.id
+    transaction.on_commit(lambda: airport_board.remove(flight_id))
+
+
+@receiver(post_bulk_save, sender=Flight)
+def update_airport_board_on_flight_bulk_save(sender, instances, **kwargs):
+    flight_ids = [flight.id for flight in instances]
+    transaction.on_commit(lambda: airport_board.refresh(flight_ids))
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_bulk_save, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_bulk_save, sender=Route)
+@receiver(post_save, sender=Airplane)
+@receiver(post_bulk_save, sender=Airplane)
+def invalidate_airport_board(sender, **kwargs):
+    # Board rows carry airport and airplane names and the route endpoints.
+    transaction.on_commit(airport_board.invalidate)
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def invalidate_flight_search_on_flight_change(sender, instance, **kwargs):
+    flight_ids = [instance.id]
+    transaction.on_commit(invalidate_flight_searches)
+    transaction.on_commit(lambda: invalidate_availability(flight_ids))
+
+
+@receiver(post_bulk_save, sender=Flight)
+def invalidate_flight_search_on_flight_bulk_save(sender, instances, **kwargs):
+    flight_ids = [flight.id for flight in instances]
+    transaction.on_commit(invalidate_flight_searches)
+    transaction.on_commit(lambda: invalidate_availability(flight_ids))
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_bulk_save, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_bulk_save, sender=Route)
+@receiver(post_delete, sender=Airplane)
+def invalidate_flight_search(sender, **kwargs):
+    transaction.on_commit(invalidate_flight_searches)
+
+
+@receiver(post_save, sender=Airplane)
+@receiver(post_bulk_save, sender=Airplane)
+def invalidate_flight_search_on_airplane_save(sender, instance=None, instances=(), **kwargs):
+    # The capacity of every flight of the airplane may have changed.
+    airplane_ids = [instance.id] if instance is not None else [
+        airplane.id for airplane in instances
+    ]
+
+    def invalidate():
+        invalidate_flight_searches()
+        invalidate_availability(
+            Flight.objects.filter(airplane_id__in=airplane_ids).values_list("id", flat=True)
+        )
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_flight_availability(sender, instance, **kwargs):
+    flight_ids = [instance.flight_id]
+    transaction.on_commit(lambda: invalidate_availability(flight_ids))
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def invalidate_flight_detail(sender, instance, **kwargs):
+    key = flight_detail_cache_key(instance.id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_bulk_save, sender=Flight)
+def invalidate_flight_details_on_bulk_save(sender, instances, **kwargs):
+    keys = [flight_detail_cache_key(flight.id) for flight in instances]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def expire_flight_detail(sender, instance, **kwargs):
+    # Seat changes only mark the entry stale: readers keep getting it while
+    # one request recomputes it.
+    key = flight_detail_cache_key(instance.flight_id)
+    stale_ttl = flight_detail_ttls()[1]
+    transaction.on_commit(lambda: single_flight.expire(key, stale_ttl))
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_bulk_save, sender=Airport)
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_delete, sender=AirplaneType)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_bulk_save, sender=Airplane)
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+@receiver(post_bulk_save, sender=Crew)
+def invalidate_reference_data(sender, **kwargs):
+    tables = [REFERENCE_TABLES[sender]]
+    if sender is AirplaneType:
+        # Cached airplanes carry their type.
+        tables.append(airplanes)
+    for table in tables:
+        # Dropped now so this transaction reads its own writes from the
+        # database, and again on commit for the other workers.
+        table.invalidate()
+        transaction.on_commit(table.invalidate)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_save, sender=Airplane)
+@receiver(post_save, sender=Flight)
+def record_change_on_save(sender, instance, created, **kwargs):
+    record_changes(sender, [instance.id], CREATED if created else UPDATED)
+
+
+@receiver(post_delete, sender=Airport)
+@receiver(post_delete, sender=Route)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_delete, sender=Flight)
+def record_change_on_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.id], DELETED)
+
+
+@receiver(post_bulk_save, sender=Airport)
+@receiver(post_bulk_save, sender=Route)
+@receiver(post_bulk_save, sender=Airplane)
+@receiver(post_bulk_save, sender=Flight)
+def record_changes_on_bulk_save(sender, instances, created, **kwargs):
+    record_changes(sender, [instance.id for instance in instances], CREATED if created else UPDATED)
+
+
+@receiver(m2m_changed, sender=Flight.crews.through)
+def record_change_on_crews_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            record_changes(Flight, [instance.id], UPDATED)
+        return
+
+    # From the crew side pk_set holds flights, except for clear.
+    if action == "pre_clear":
+        instance._cleared_flight_ids = list(instance.flight_set.values_list("id", flat=True))
+    elif action == "post_clear":
+        record_changes(Flight, getattr(instance, "_cleared_flight_ids", []), UPDATED)
+    elif action in ("post_add", "post_remove"):
+        record_changes(Flight, pk_set or (), UPDATED)
@@ -0,0 +1,201 @@
+import copy
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils import timezone
+
+from airport.bulk import post_bulk_save
+from airport.models import Airplane, Flight
+from airport.schedule import airplane_rotation
+
+ANY_AIRPORT = -1
+
+
+def optimize_tail_assignment(day, turnaround=None) -> dict:
+    """Greedily reassign airplanes to the flights departing on day.
+
+    Flights are taken in departure order and each gets the smallest airplane
+    that is free, positioned at the flight's source airport, big enough for
+    the tickets already sold and still in time for its next leg after the
+    day from the flight's destination, which keeps unused seats low. Flights
+    no airplane can serve keep their current assignment, and so do the
+    flights of any airplane whose rotation the plan would break.
+    """
+    turnaround = airplane_rotation.min_turnaround() if turnaround is None else turnaround
+    day_start = timezone.make_aware(datetime.combine(day, time.min))
+    day_end = day_start + timedelta(days=1)
+
+    flights = list(
+        Flight.objects.filter(departure_time__gte=day_start, departure_time__lt=day_end)
+        .annotate(
+            seats_sold=Count("tickets"),
+            max_row=Max("tickets__row"),
+            max_seat=Max("tickets__seat"),
+        )
+        .select_related("route")
+        .order_by("departure_time")
+    )
+    latest_leg = Flight.objects.filter(
+        airplane=OuterRef("pk"), departure_time__lt=day_start
+    ).order_by("-departure_time")
+    next_leg = Flight.objects.filter(
+        airplane=OuterRef("pk"), departure_time__gte=day_end
+    ).order_by("departure_time")
+    airplanes = list(
+        Airplane.objects.annotate(
+            last_arrival=Subquery(latest_leg.values("arrival_time")[:1]),
+            last_destination=Subquery(latest_leg.values("route__destination_id")[:1]),
+            next_departure=Subquery(next_leg.values("departure_time")[:1]),
+            next_source=Subquery(next_leg.values("route__source_id")[:1]),
+        )
+        .order_by("id")
+        .values_list(
+            "id",
+            "rows",
+            "seats_in_row",
+            "last_arrival",
+            "last_destination",
+            "next_departure",
+            "next_source",
+        )
+    )
+    if not flights or not airplanes:
+        return {
+            "flights": len(flights),
+            "assignments": {},
+            "unassigned": [flight.id for flight in flights],
+            "unused_seats_before": 0,
+            "unused_seats_after": 0,
+        }
+
+    airplane_ids = np.array([airplane[0] for airplane in airplanes])
+    rows = np.array([airplane[1] for airplane in airplanes])
+    seats_in_row = np.array([airplane[2] for airplane in airplanes])
+    capacity = rows * seats_in_row
+    position = {airplane_id: i for i, airplane_id in enumerate(airplane_ids.tolist())}
+    available_at = np.array(
+        [
+            max(day_start.timestamp(), airplane[3].timestamp() if airplane[3] else 0)
+            for airplane in airplanes
+        ]
+    )
+    location = np.array(
+        [
+            ANY_AIRPORT if airplane[4] is None else airplane[4]
+            for airplane in airplanes
+        ]
+    )
+    needed_by = np.array(
+        [airplane[5].timestamp() if airplane[5] else np.inf for airplane in airplanes]
+    )
+    needed_at = np.array(
+        [ANY_AIRPORT if airplane[6] is None else airplane[6] for airplane in airplanes]
+    )
+
+    assignments = {}
+    unassigned = []
+    for flight in flights:
+        departure = flight.departure_time.timestamp()
+        candidates = (
+            (available_at + turnaround <= departure)
+            & ((location == flight.route.source_id) | (location == ANY_AIRPORT))
+            & (flight.arrival_time.timestamp() + turnaround <= needed_by)
+            & ((needed_at == flight.route.destination_id) | (needed_at == ANY_AIRPORT))
+            & (rows >= (flight.max_row or 0))
+            & (seats_in_row >= (flight.max_seat or 0))
+        )
+        if candidates.any():
+            chosen = int(np.argmin(np.where(candidates, capacity, np.iinfo(capacity.dtype).max)))
+            assignments[flight.id] = int(airplane_ids[chosen])
+        else:
+            chosen = position[flight.airplane_id]
+            unassigned.append(flight.id)
+
+        available_at[chosen] = flight.arrival_time.timestamp()
+        location[chosen] = flight.route.destination_id
+
+    # An airplane that gives its flights away stays where it was, which may
+    # not be where its next leg departs; such moves are undone until every
+    # rotation the plan touches holds again.
+    states = {airplane[0]: airplane[3:] for airplane in airplanes}
+    while True:
+        plan = {
+            flight.id: assignments.get(flight.id, flight.airplane_id) for flight in flights
+        }
+        broken = _broken_rotations(flights, plan, states, turnaround)
+        reverted = {
+            flight.id
+            for flight in flights
+            if plan[flight.id] != flight.airplane_id
+            and (plan[flight.id] in broken or flight.airplane_id in broken)
+        }
+        if not reverted:
+            break
+        for flight in flights:
+            if flight.id in reverted:
+                assignments[flight.id] = flight.airplane_id
+
+    capacity_by_airplane = dict(zip(airplane_ids.tolist(), capacity.tolist()))
+    seats_sold = sum(flight.seats_sold for flight in flights)
+    return {
+        "flights": len(flights),
+        "assignments": assignments,
+        "unassigned": unassigned,
+        "unused_seats_before": sum(
+            capacity_by_airplane[flight.airplane_id] for flight in flights
+        ) - seats_sold,
+        "unused_seats_after": sum(
+            capacity_by_airplane[assignments.get(flight.id, flight.airplane_id)]
+            for flight in flights
+        ) - seats_sold,
+    }
+
+
+def _broken_rotations(flights, plan, states, turnaround) -> set:
+    """Airplanes whose legs under plan do not chain from and into their other legs"""
+    legs = {}
+    for flight in flights:
+        legs.setdefault(plan[flight.id], []).append(flight)
+
+    broken = set()
+    for airplane_id, (last_arrival, location, next_departure, next_source) in states.items():
+        ready = last_arrival.timestamp() if last_arrival else None
+        for flight in legs.get(airplane_id, ()):
+            departure = flight.departure_time.timestamp()
+            if (location is not None and location != flight.route.source_id) or (
+                ready is not None and ready + turnaround > departure
+            ):
+                broken.add(airplane_id)
+            ready = flight.arrival_time.timestamp()
+            location = flight.route.destination_id
+        if next_departure is not None and (
+            (location is not None and location != next_source)
+            or (ready is not None and ready + turnaround > next_departure.timestamp())
+        ):
+            broken.add(airplane_id)
+    return broken
+
+
+def apply_tail_assignment(assignments: dict) -> int:
+    flights = list(Flight.objects.filter(id__in=assignments.keys()))
+    changed = [
+        flight for flight in flights if flight.airplane_id != assignments[flight.id]
+    ]
+    previous = {flight.pk: copy.copy(flight) for flight in changed}
+    for flight in changed:
+        flight.airplane_id = assignments[flight.id]
+
+    with transaction.atomic():
+        Flight.objects.bulk_update(changed, ["airplane"], batch_size=1000)
+        # Rollups, indexes, caches and feeds follow the airplane change.
+        post_bulk_save.send(
+            sender=Flight,
+            instances=changed,
+            created=False,
+            previous=previous,
+            update_fields={"airplane"},
+        )
+
+    return len(changed)
@@ -0,0 +1,15 @@
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework import throttling
+
+# Request history lives in its own cache alias, so a database-backed
+# default cache does not add queries to every throttled request.
+throttle_cache = ConnectionProxy(caches, "throttle")
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle):
+    cache = throttle_cache
+
+
+class UserRateThrottle(throttling.UserRateThrottle):
+    cache = throttle_cache
@@ -5,11 +5,14 @@ from airport.views import (
     AirportViewSet,
     AirplaneTypeViewSet,
     AirplaneViewSet,
+    ChangeViewSet,
     RouteViewSet,
     CrewViewSet,
     FlightViewSet,
-    OrderViewSet
+    OrderViewSet,
+    RouteDailyLoadViewSet,
 )
+from airport.seat_stream import flight_seat_stream
 
 router = routers.DefaultRouter()
 router.register("airports", AirportViewSet)
@@ -19,7 +22,16 @@ router.register("routes", RouteViewSet)
 router.register("crews", CrewViewSet)
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
+router.register("load_factors", RouteDailyLoadViewSet)
+router.register("changes", ChangeViewSet, basename="change")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path(
+        "flights/<int:pk>/seats/stream/",
+        flight_seat_stream,
+        name="flight-seat-stream",
+    ),
+    path("", include(router.urls)),
+]
 
 app_name = "airport"
@@ -1,22 +1,45 @@
+import math
 from datetime import datetime
 
-from django.db.models import F, Count
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Value
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from airport.board import BOARD_KINDS, DEPARTURES, airport_board
+from airport.bulk import BulkCreateUpdateMixin
+from airport.change_feed import read_changes
+from airport.coalesce import flight_detail_cache_key, flight_detail_ttls, single_flight
+from airport.flight_search import (
+    cached_search,
+    flight_availability,
+    search_params,
+    tickets_available_expression,
+)
+from airport.geo import EARTH_RADIUS_KM, airport_index
+from airport.idempotency import IdempotentCreateMixin
 from airport.models import (
     Airport,
     AirplaneType,
     Airplane,
     Crew,
     Flight,
-    Route, Order
+    Route, Order, RouteDailyLoad
 )
 from airport.permissions import IsAdminOrIfAuthenticatedReadOnly
+from airport.query_budget import QueryBudget
+from airport.reference_data import ReferenceDataMixin, airports
+from airport.route_calendar import route_calendar
+from airport.schedule import IntervalIndex, airplane_rotation, as_timestamp, crew_roster
 from airport.serializers import (
     AirportSerializer,
     AirplaneTypeSerializer,
@@ -29,11 +52,13 @@ from airport.serializers import (
     RouteDetailSerializer,
     FlightDetailSerializer,
     OrderSerializer,
-    OrderListSerializer
+    OrderListSerializer,
+    RouteDailyLoadSerializer,
 )
 
 
 class AirportViewSet(
+    BulkCreateUpdateMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -41,6 +66,104 @@ class AirportViewSet(
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    bulk_unique_fields = ("name",)
+    # A board page only queries to rebuild its indexes after a change.
+    query_budget = {"board": QueryBudget(max_queries=2, max_db_time=1)}
+
+    def validate_bulk(self, validated_data, instances=None):
+        return self.validate_bulk_unique(validated_data, instances)
+
+    @staticmethod
+    def _float_param(request, name, low, high, required=True):
+        value = request.query_params.get(name)
+        if value is None and not required:
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError({name: "A number is required."})
+        if not low <= value <= high:
+            raise ValidationError({name: f"Must be between {low} and {high}."})
+        return value
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "latitude",
+                type=OpenApiTypes.FLOAT,
+                description="Latitude in degrees (ex. ?latitude=50.45)",
+                required=True,
+            ),
+            OpenApiParameter(
+                "longitude",
+                type=OpenApiTypes.FLOAT,
+                description="Longitude in degrees (ex. ?longitude=30.52)",
+                required=True,
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Number of airports to return, 5 by default (ex. ?limit=3)",
+            ),
+            OpenApiParameter(
+                "radius_km",
+                type=OpenApiTypes.FLOAT,
+                description="Only airports within this distance (ex. ?radius_km=300)",
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"])
+    def nearest(self, request):
+        latitude = self._float_param(request, "latitude", -90, 90)
+        longitude = self._float_param(request, "longitude", -180, 180)
+        limit = int(self._float_param(request, "limit", 1, 50, required=False) or 5)
+        radius_km = self._float_param(
+            request, "radius_km", 0, math.pi * EARTH_RADIUS_KM, required=False
+        )
+        return Response(
+            airport_index.nearest(latitude, longitude, limit=limit, max_km=radius_km)
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "kind",
+                type=OpenApiTypes.STR,
+                enum=BOARD_KINDS,
+                description="Board to show, departures by default (ex. ?kind=arrivals)",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Number of flights to return, 50 by default (ex. ?limit=20)",
+            ),
+            OpenApiParameter(
+                "cursor",
+                type=OpenApiTypes.STR,
+                description="The next value of the previous page (ex. ?cursor=1689832800.0:12)",
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=True, methods=["get"])
+    def board(self, request, pk=None):
+        # Answered from the in-process indexes, without touching the database.
+        try:
+            airport_id = int(pk)
+        except ValueError:
+            raise NotFound()
+        if airports.get(airport_id) is None:
+            raise NotFound()
+
+        kind = request.query_params.get("kind", DEPARTURES)
+        if kind not in BOARD_KINDS:
+            raise ValidationError({"kind": f"Must be one of {', '.join(BOARD_KINDS)}."})
+        limit = int(self._float_param(request, "limit", 1, 200, required=False) or 50)
+        cursor = request.query_params.get("cursor")
+        try:
+            return Response(airport_board.page(airport_id, kind, cursor=cursor, limit=limit))
+        except ValueError:
+            raise ValidationError({"cursor": "Invalid cursor."})
 
 
 class AirplaneTypeViewSet(
@@ -54,6 +177,7 @@ class AirplaneTypeViewSet(
 
 
 class AirplaneViewSet(
+    BulkCreateUpdateMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -64,6 +188,7 @@ class AirplaneViewSet(
 
 
 class CrewViewSet(
+    BulkCreateUpdateMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -72,14 +197,54 @@ class CrewViewSet(
     serializer_class = CrewSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "departure_time",
+                type=OpenApiTypes.DATETIME,
+                description="Window start (ex. ?departure_time=2023-07-25T10:00:00Z)",
+                required=True,
+            ),
+            OpenApiParameter(
+                "arrival_time",
+                type=OpenApiTypes.DATETIME,
+                description="Window end (ex. ?arrival_time=2023-07-25T15:00:00Z)",
+                required=True,
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"])
+    def available(self, request):
+        window = {}
+        for param in ("departure_time", "arrival_time"):
+            value = parse_datetime(request.query_params.get(param, ""))
+            if value is None:
+                raise ValidationError({param: "A valid ISO 8601 datetime is required."})
+            window[param] = value
+
+        crews = list(self.get_queryset())
+        available_ids = set(
+            crew_roster.available(
+                [crew.id for crew in crews],
+                window["departure_time"],
+                window["arrival_time"],
+            )
+        )
+        serializer = self.get_serializer(
+            [crew for crew in crews if crew.id in available_ids], many=True
+        )
+        return Response(serializer.data)
+
 
 class RouteViewSet(
+    ReferenceDataMixin,
+    BulkCreateUpdateMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = Route.objects.select_related("source", "destination")
+    queryset = Route.objects.all()
     serializer_class = RouteSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
@@ -123,42 +288,180 @@ class RouteViewSet(
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-
-class FlightViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "month",
+                type=OpenApiTypes.STR,
+                description="Month as YYYY-MM, current month by default (ex. ?month=2023-07)",
+            ),
+        ]
+    )
+    @action(detail=True, methods=["get"])
+    def calendar(self, request, pk=None):
+        month = request.query_params.get("month")
+        if month:
+            try:
+                month = datetime.strptime(month, "%Y-%m").date()
+            except ValueError:
+                raise ValidationError({"month": "Expected a month as YYYY-MM."})
+        else:
+            month = timezone.localdate().replace(day=1)
+
+        route = self.get_object()
+        return Response({"route": route.id, "days": route_calendar(route.id, month)})
+
+
+class FlightViewSet(ReferenceDataMixin, BulkCreateUpdateMixin, viewsets.ModelViewSet):
     queryset = (
         Flight.objects.all()
-        .select_related("route", "airplane")
-        .prefetch_related("crews")
-        .annotate(
-            tickets_available=(
-                F("airplane__rows") * F("airplane__seats_in_row")
-                - Count("tickets")
-            )
-        )
+        .select_related("route")
+        .annotate(tickets_available=tickets_available_expression())
     )
     serializer_class = FlightSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    query_budget = {
+        "list": QueryBudget(max_queries=8, max_db_time=2),
+        "retrieve": QueryBudget(max_queries=8, max_db_time=1),
+        "availability": QueryBudget(max_queries=2, max_db_time=1),
+    }
+    max_availability_batch = 50
 
     def get_queryset(self):
-        departure_date = self.request.query_params.get("departure_time")
-        arrival_date = self.request.query_params.get("arrival_time")
-        airplane_id_str = self.request.query_params.get("airplane")
+        params = search_params(self.request.query_params)
 
-        queryset = self.queryset
+        if self.action == "list":
+            # The list serializer shows no crews, and availability is
+            # filled in per flight by cached_search.
+            queryset = Flight.objects.select_related("route").annotate(
+                tickets_available=Value(None, output_field=IntegerField())
+            )
+        else:
+            queryset = self.queryset.prefetch_related("crews")
 
-        if departure_date:
-            departure_date = datetime.strptime(departure_date, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__date=departure_date)
+        if params["departure_time"]:
+            queryset = queryset.filter(departure_time__date=params["departure_time"])
 
-        if arrival_date:
-            arrival_date = datetime.strptime(arrival_date, "%Y-%m-%d").date()
-            queryset = queryset.filter(arrival_time__date=arrival_date)
+        if params["arrival_time"]:
+            queryset = queryset.filter(arrival_time__date=params["arrival_time"])
 
-        if airplane_id_str:
-            queryset = queryset.filter(airplane_id=int(airplane_id_str))
+        if params["airplane"]:
+            queryset = queryset.filter(airplane_id=params["airplane"])
 
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        # Concurrent misses for a popular flight share one query and serializer pass.
+        # The key uses the integer id, which /flights/05/ and /flights/5/ share
+        # and which invalidation uses.
+        try:
+            flight_id = int(kwargs["pk"])
+        except ValueError:
+            raise NotFound()
+        ttl, stale_ttl = flight_detail_ttls()
+        data = single_flight.get(
+            flight_detail_cache_key(flight_id),
+            lambda: self.get_serializer(self.get_object()).data,
+            ttl,
+            stale_ttl,
+        )
+        return Response(data)
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+    def validate_bulk(self, validated_data, instances=None):
+        airplanes = IntervalIndex()
+        crews = IntervalIndex()
+        turnaround = airplane_rotation.min_turnaround()
+        rest = crew_roster.min_rest()
+        errors = []
+        for position, attrs in enumerate(validated_data):
+            instance = instances[position] if instances else None
+            start = as_timestamp(
+                attrs.get("departure_time", getattr(instance, "departure_time", None))
+            )
+            end = as_timestamp(
+                attrs.get("arrival_time", getattr(instance, "arrival_time", None))
+            )
+            airplane = attrs.get("airplane", getattr(instance, "airplane", None))
+            route = attrs.get("route", getattr(instance, "route", None))
+            flight_crews = attrs.get(
+                "crews", list(instance.crews.all()) if instance else []
+            )
+
+            error = {}
+            if airplanes.overlapping(airplane.id, start, end, gap=turnaround):
+                error["airplane"] = [
+                    "Airplane is assigned to another flight in this payload "
+                    "within the minimum turnaround."
+                ]
+            busy = [
+                str(crew)
+                for crew in flight_crews
+                if crews.overlapping(crew.id, start, end, gap=rest)
+            ]
+            if busy:
+                error["crews"] = [
+                    f"{', '.join(busy)} assigned to another flight in this payload "
+                    f"within the minimum rest period."
+                ]
+            errors.append(error)
+
+            airplanes.add(
+                airplane.id, start, end, position, data=(route.source_id, route.destination_id)
+            )
+            for crew in flight_crews:
+                crews.add(crew.id, start, end, position)
+
+        self.validate_bulk_rotations(airplanes, errors, instances)
+        return errors
+
+    @staticmethod
+    def validate_bulk_rotations(payload_legs, errors, instances=None):
+        """Payload legs must chain by airport with each other and the scheduled legs"""
+        replaced = {instance.id for instance in instances or ()}
+        scheduled = airplane_rotation.index()
+        for airplane_id in payload_legs.keys():
+            # (start, source, destination, payload position or None, flight id or None)
+            legs = [
+                (start, *payload_legs.data(position), position, None)
+                for start, _, position in payload_legs.entries(airplane_id)
+            ] + [
+                (start, *scheduled.data(flight_id), None, flight_id)
+                for start, _, flight_id in scheduled.entries(airplane_id)
+                if flight_id not in replaced
+            ]
+            legs.sort(key=lambda leg: leg[0])
+            for previous, following in zip(legs, legs[1:]):
+                if previous[2] == following[1]:
+                    continue
+                if following[3] is not None:
+                    other = previous
+                    position = following[3]
+                    message = "Airplane's previous flight {} does not land at the source airport."
+                elif previous[3] is not None:
+                    other = following
+                    position = previous[3]
+                    message = (
+                        "Airplane's next flight {} does not depart from the destination airport."
+                    )
+                else:
+                    continue
+                flight = (
+                    f"in this payload (item {other[3]})" if other[3] is not None else other[4]
+                )
+                errors[position].setdefault("route", []).append(message.format(flight))
+
     def get_serializer_class(self):
         if self.action == "list":
             return FlightListSerializer
@@ -194,7 +497,46 @@ class FlightViewSet(viewsets.ModelViewSet):
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Same filters in any order or date format share one cached result.
+        return Response(
+            cached_search(
+                search_params(request.query_params),
+                lambda: [
+                    dict(row)
+                    for row in self.get_serializer(self.get_queryset(), many=True).data
+                ],
+            )
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                type=OpenApiTypes.STR,
+                description="Comma separated flight ids, at most 50 (ex. ?ids=1,2,3)",
+                required=True,
+            ),
+            OpenApiParameter(
+                "seats",
+                type=OpenApiTypes.BOOL,
+                description="Include taken seats as [row, seat] pairs (ex. ?seats=true)",
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        values = ",".join(request.query_params.getlist("ids")).split(",")
+        try:
+            flight_ids = list(dict.fromkeys(int(value) for value in values if value.strip()))
+        except ValueError:
+            raise ValidationError({"ids": "Comma separated integers are required."})
+        if not 1 <= len(flight_ids) <= self.max_availability_batch:
+            raise ValidationError(
+                {"ids": f"Between 1 and {self.max_availability_batch} flight ids are required."}
+            )
+        seats = request.query_params.get("seats", "").lower() in ("1", "true")
+        return Response(flight_availability(flight_ids, seats=seats))
 
 
 class OrderPagination(PageNumberPagination):
@@ -203,19 +545,26 @@ class OrderPagination(PageNumberPagination):
 
 
 class OrderViewSet(
+    ReferenceDataMixin,
+    IdempotentCreateMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
 ):
     queryset = Order.objects.prefetch_related(
-        "tickets__flight__route", "tickets__flight__airplane"
+        "tickets__flight__route",
+        "archived_tickets__flight__route",
     )
     serializer_class = OrderSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAuthenticated,)
+    query_budget = {
+        "list": QueryBudget(max_queries=16, max_db_time=2),
+        "create": QueryBudget(max_db_time=5),
+    }
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -225,3 +574,96 @@ class OrderViewSet(
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+class RouteDailyLoadViewSet(
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
+    queryset = RouteDailyLoad.objects.select_related(
+        "route__source", "route__destination"
+    )
+    serializer_class = RouteDailyLoadSerializer
+    permission_classes = (IsAdminUser,)
+
+    def get_queryset(self):
+        date_from = self.request.query_params.get("date_from")
+        date_to = self.request.query_params.get("date_to")
+        route_id_str = self.request.query_params.get("route")
+
+        queryset = self.queryset
+
+        if date_from:
+            date_from = datetime.strptime(date_from, "%Y-%m-%d").date()
+            queryset = queryset.filter(date__gte=date_from)
+
+        if date_to:
+            date_to = datetime.strptime(date_to, "%Y-%m-%d").date()
+            queryset = queryset.filter(date__lte=date_to)
+
+        if route_id_str:
+            queryset = queryset.filter(route_id=int(route_id_str))
+
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.DATE,
+                description="Filter from departure date (ex. ?date_from=2023-07-01)",
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.DATE,
+                description="Filter to departure date (ex. ?date_to=2023-07-31)",
+            ),
+            OpenApiParameter(
+                "route",
+                type=OpenApiTypes.INT,
+                description="Filter by route id (ex. ?route=2)",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class ChangeViewSet(GenericViewSet):
+    permission_classes = (IsAuthenticated,)
+    query_budget = {"list": QueryBudget(max_queries=10, max_db_time=2)}
+    default_limit = 500
+    max_limit = 1000
+
+    @staticmethod
+    def _int_param(request, name, default, low, high):
+        value = request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: "An integer is required."})
+        if not low <= value <= high:
+            raise ValidationError({name: f"Must be between {low} and {high}."})
+        return value
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "since",
+                type=OpenApiTypes.INT,
+                description="Cursor from the previous response, 0 by default (ex. ?since=1520)",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Change log entries to read, 500 by default (ex. ?limit=100)",
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    def list(self, request):
+        since = self._int_param(request, "since", 0, 0, 2 ** 63 - 1)
+        limit = self._int_param(request, "limit", self.default_limit, 1, self.max_limit)
+        return Response(read_changes(since, limit))
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
+import sys
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -33,6 +35,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
+    "daphne",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -48,12 +51,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "airport.middleware.LoadSheddingMiddleware",
+    "airport.middleware.ThresholdGZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "airport.middleware.QueryBudgetMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
@@ -77,6 +83,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "airport_api.wsgi.application"
+ASGI_APPLICATION = "airport_api.asgi.application"
 
 AUTH_USER_MODEL = "user.User"
 
@@ -94,6 +101,46 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Idempotency keys, cache version counters and cross-worker locks must be
+# seen by every worker, so the cache is shared: Redis when REDIS_URL is set,
+# the database otherwise. The test runner is a single process.
+# In-process indexes read their shared version at most once per
+# SCHEDULE_VERSION_CHECK_SECONDS, so changes made by another worker reach
+# them within that interval while warm reads make no cache round-trip.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+elif sys.argv[1:2] == ["test"]:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    SILENCED_SYSTEM_CHECKS = ["airport.W001"]
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "airport_cache",
+        }
+    }
+
+# Throttling touches its counters on every request, so they stay out of the
+# database: in Redis when it is set, otherwise per worker (the rates then
+# apply to each worker separately).
+CACHES["throttle"] = (
+    CACHES["default"]
+    if os.getenv("REDIS_URL")
+    else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "throttle"}
+)
+
+SCHEDULE_VERSION_CHECK_SECONDS = 1.0
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -138,9 +185,14 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "airport.renderers.ORJSONRenderer",
+        "airport.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport.throttling.AnonRateThrottle",
+        "airport.throttling.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -148,6 +200,48 @@ REST_FRAMEWORK = {
     ),
 }
 
+GZIP_MIN_LENGTH = 1024
+
+# Change feed entries are written on commit; the newest ones are held back
+# this long so concurrent writes with lower sequence numbers land first.
+CHANGE_FEED_SETTLE_SECONDS = float(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "5"))
+
+SEAT_STREAM_HEARTBEAT = 15
+SEAT_STREAM_QUEUE_SIZE = 1000
+
+OUTBOX = {
+    "ENDPOINTS": [
+        url for url in os.getenv("OUTBOX_ENDPOINTS", "").split(",") if url
+    ],
+}
+
+# The *_WARM_ON_BOOT flags build the in-process caches when a WSGI/ASGI
+# worker starts, so no request pays for a full-table build. All of them are
+# on unless set to anything but "1" in the environment.
+OPENAPI_SCHEMA_DIR = os.getenv(
+    "OPENAPI_SCHEMA_DIR", os.path.join(tempfile.gettempdir(), "airport_openapi")
+)
+OPENAPI_SCHEMA_WARM_ON_BOOT = os.getenv("OPENAPI_SCHEMA_WARM_ON_BOOT", "1") == "1"
+OPENAPI_SCHEMA_MAX_AGE = 300
+
+REFERENCE_DATA_WARM_ON_BOOT = os.getenv("REFERENCE_DATA_WARM_ON_BOOT", "1") == "1"
+
+AIRPORT_BOARD_WARM_ON_BOOT = os.getenv("AIRPORT_BOARD_WARM_ON_BOOT", "1") == "1"
+AIRPORT_BOARD_LOOKBACK_MINUTES = 30
+
+LOAD_SHEDDING = {
+    "ENABLED": os.getenv("LOAD_SHEDDING_ENABLED", "1") == "1",
+    "MAX_CONCURRENCY": int(os.getenv("LOAD_SHEDDING_MAX_CONCURRENCY", "64")),
+}
+
+# Over-budget requests fail loudly under the test runner, production samples them.
+QUERY_BUDGET = {
+    "ACTION": os.getenv(
+        "QUERY_BUDGET_ACTION", "raise" if sys.argv[1:2] == ["test"] else "log"
+    ),
+    "SAMPLE_RATE": float(os.getenv("QUERY_BUDGET_SAMPLE_RATE", "0.1")),
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport Service API",
     "DESCRIPTION": "Order airplane tickets",
@@ -16,13 +16,21 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
+
+from airport.load_shedding import load_shedding_metrics
+from airport.openapi import schema_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/airport/", include("airport.urls", namespace="airport")),
     path("api/user/", include("user.urls", namespace="user")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", schema_view, name="schema"),
+    path(
+        "api/metrics/load-shedding/",
+        load_shedding_metrics,
+        name="load-shedding-metrics",
+    ),
     path(
         "api/doc/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -9,8 +9,24 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'airport_api.settings')
 
 application = get_wsgi_application()
+
+if settings.OPENAPI_SCHEMA_WARM_ON_BOOT:
+    from airport.openapi import schema_cache
+
+    schema_cache.build()
+
+if settings.REFERENCE_DATA_WARM_ON_BOOT:
+    from airport.reference_data import warm_reference_data
+
+    warm_reference_data()
+
+if settings.AIRPORT_BOARD_WARM_ON_BOOT:
+    from airport.board import airport_board
+
+    airport_board.index()
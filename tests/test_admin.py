@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from airport.admin import EstimatedCountPaginator
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+TICKET_CHANGELIST_URL = reverse("admin:airport_ticket_changelist")
+FLIGHT_CHANGELIST_URL = reverse("admin:airport_flight_changelist")
+
+
+class AdminQueryCountTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser("admin@admin.com", "testpass")
+        self.client.force_login(self.admin)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.routes = []
+        for i in range(3):
+            source = Airport.objects.create(name=f"Source-{i}", closest_big_city="Kyiv")
+            destination = Airport.objects.create(name=f"Destination-{i}", closest_big_city="Lisbon")
+            self.routes.append(
+                Route.objects.create(source=source, destination=destination, distance=1000)
+            )
+        self.order = Order.objects.create(user=self.admin)
+        self.day = 1
+
+    def add_flights(self, count):
+        for _ in range(count):
+            flight = Flight.objects.create(
+                route=self.routes[self.day % len(self.routes)],
+                airplane=self.airplane,
+                departure_time=f"2023-07-{self.day:02d}T10:00:00Z",
+                arrival_time=f"2023-07-{self.day:02d}T12:00:00Z",
+            )
+            for seat in range(1, 4):
+                Ticket.objects.create(flight=flight, row=1, seat=seat, order=self.order)
+            self.day += 1
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params or {})
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def test_ticket_changelist_query_count_is_bounded(self):
+        self.add_flights(2)
+        few = self.count_queries(TICKET_CHANGELIST_URL)
+        self.add_flights(10)
+        many = self.count_queries(TICKET_CHANGELIST_URL)
+
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 10)
+
+    def test_filtered_ticket_changelist_query_count_is_bounded(self):
+        self.add_flights(2)
+        params = {
+            "route": self.routes[0].id,
+            "flight__departure_time__gte": "2023-07-01 00:00:00+00:00",
+        }
+        few = self.count_queries(TICKET_CHANGELIST_URL, params)
+        self.add_flights(10)
+
+        self.assertEqual(self.count_queries(TICKET_CHANGELIST_URL, params), few)
+
+    def test_flight_changelist_query_count_is_bounded(self):
+        self.add_flights(2)
+        few = self.count_queries(FLIGHT_CHANGELIST_URL)
+        self.add_flights(10)
+
+        self.assertEqual(self.count_queries(FLIGHT_CHANGELIST_URL), few)
+
+    def test_ticket_change_form_has_no_unbounded_dropdowns(self):
+        self.add_flights(1)
+        ticket = Ticket.objects.first()
+
+        res = self.client.get(reverse("admin:airport_ticket_change", args=[ticket.id]))
+
+        self.assertNotContains(res, '<select name="flight"')
+        self.assertNotContains(res, '<select name="order"')
+
+    def test_paginator_counts_exactly_below_limit(self):
+        self.add_flights(2)
+        paginator = EstimatedCountPaginator(Ticket.objects.all(), 2)
+        paginator.exact_count_limit = 3
+
+        self.assertEqual(paginator.count, 6)
+        self.assertEqual(paginator.num_pages, 3)
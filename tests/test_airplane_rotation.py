@@ -0,0 +1,158 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Flight,
+    Order,
+    Route,
+    RouteDailyLoad,
+    Ticket,
+)
+from airport.schedule import airplane_rotation
+from airport.serializers import FlightSerializer
+from airport.tail_assignment import apply_tail_assignment, optimize_tail_assignment
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class AirplaneRotationTests(TestCase):
+    def setUp(self):
+        airplane_rotation.reset()
+        self.user = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.kyiv = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        self.lisbon = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.paris = Airport.objects.create(name="Test-3", closest_big_city="Paris")
+        self.outbound = Route.objects.create(source=self.kyiv, destination=self.lisbon, distance=3000)
+        self.inbound = Route.objects.create(source=self.lisbon, destination=self.kyiv, distance=3000)
+        self.onward = Route.objects.create(source=self.paris, destination=self.kyiv, distance=2000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.small = Airplane.objects.create(
+            name="Small", rows=5, seats_in_row=4, airplane_type=airplane_type
+        )
+        self.large = Airplane.objects.create(
+            name="Large", rows=30, seats_in_row=6, airplane_type=airplane_type
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = Flight.objects.create(
+                route=self.outbound,
+                airplane=self.large,
+                departure_time="2023-07-25T10:00:00Z",
+                arrival_time="2023-07-25T15:00:00Z",
+            )
+
+    def tearDown(self):
+        airplane_rotation.reset()
+
+    def flight_payload(self, route, departure_time, arrival_time):
+        return {
+            "route": route.id,
+            "airplane": self.large.id,
+            "departure_time": departure_time,
+            "arrival_time": arrival_time,
+        }
+
+    def test_overlapping_airplane_assignment_rejected(self):
+        res = self.client.post(
+            FLIGHT_URL,
+            self.flight_payload(self.inbound, "2023-07-25T14:00:00Z", "2023-07-25T19:00:00Z"),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("airplane", res.data)
+
+    def test_leg_from_wrong_airport_rejected(self):
+        res = self.client.post(
+            FLIGHT_URL,
+            self.flight_payload(self.onward, "2023-07-25T17:00:00Z", "2023-07-25T20:00:00Z"),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("route", res.data)
+
+    def test_connecting_leg_allowed(self):
+        res = self.client.post(
+            FLIGHT_URL,
+            self.flight_payload(self.inbound, "2023-07-25T17:00:00Z", "2023-07-25T22:00:00Z"),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_optimizer_picks_smallest_fitting_airplane(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, row=2, seat=3, order=order)
+
+        result = optimize_tail_assignment(date(2023, 7, 25))
+
+        self.assertEqual(result["assignments"], {self.flight.id: self.small.id})
+        self.assertLess(result["unused_seats_after"], result["unused_seats_before"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = apply_tail_assignment(result["assignments"])
+
+        self.flight.refresh_from_db()
+        self.assertEqual(changed, 1)
+        self.assertEqual(self.flight.airplane, self.small)
+        self.assertEqual(
+            RouteDailyLoad.objects.get(route=self.outbound, date="2023-07-25").seats_offered, 20
+        )
+        self.assertEqual(
+            airplane_rotation.conflicts(
+                self.small.id, "2023-07-25T11:00:00Z", "2023-07-25T12:00:00Z"
+            ),
+            [self.flight.id],
+        )
+
+    def test_optimizer_respects_sold_seats(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, row=20, seat=3, order=order)
+
+        result = optimize_tail_assignment(date(2023, 7, 25))
+
+        self.assertEqual(result["assignments"], {self.flight.id: self.large.id})
+
+    def create_flight(self, route, airplane, departure_time, arrival_time):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=departure_time,
+                arrival_time=arrival_time,
+            )
+
+    def test_optimizer_keeps_next_day_leg_connected(self):
+        next_day = self.create_flight(
+            self.outbound, self.small, "2023-07-26T10:00:00Z", "2023-07-26T15:00:00Z"
+        )
+
+        result = optimize_tail_assignment(date(2023, 7, 25))
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_tail_assignment(result["assignments"])
+
+        self.assertEqual(result["assignments"], {self.flight.id: self.large.id})
+        self.assertTrue(FlightSerializer(next_day, data={}, partial=True).is_valid())
+
+    def test_optimizer_keeps_flights_an_airplane_needs(self):
+        self.create_flight(
+            self.inbound, self.large, "2023-07-24T10:00:00Z", "2023-07-24T15:00:00Z"
+        )
+        self.create_flight(
+            self.inbound, self.large, "2023-07-26T10:00:00Z", "2023-07-26T15:00:00Z"
+        )
+
+        result = optimize_tail_assignment(date(2023, 7, 25))
+
+        # Moving the flight to Small would strand Large in Kyiv.
+        self.assertEqual(result["assignments"], {self.flight.id: self.large.id})
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.analytics import rebuild_route_daily_loads
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Crew,
+    Flight,
+    FlightArchive,
+    Order,
+    OutboxEvent,
+    Route,
+    RouteDailyLoad,
+    Ticket,
+    TicketArchive,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class ArchiveFlightsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        now = timezone.now()
+        self.old_flight = Flight.objects.create(
+            route=self.route,
+            airplane=airplane,
+            departure_time=now - timedelta(days=100, hours=5),
+            arrival_time=now - timedelta(days=100),
+        )
+        self.old_flight.crews.add(Crew.objects.create(first_name="John", last_name="Doe"))
+        self.recent_flight = Flight.objects.create(
+            route=self.route,
+            airplane=airplane,
+            departure_time=now - timedelta(days=5, hours=5),
+            arrival_time=now - timedelta(days=5),
+        )
+        self.order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.old_flight, row=1, seat=1, order=self.order)
+        Ticket.objects.create(flight=self.recent_flight, row=1, seat=2, order=self.order)
+
+    def test_archive_moves_old_flights_and_tickets(self):
+        call_command("archive_flights", "--older-than-days=30", stdout=StringIO())
+
+        self.assertFalse(Flight.objects.filter(id=self.old_flight.id).exists())
+        self.assertTrue(Flight.objects.filter(id=self.recent_flight.id).exists())
+        archived = FlightArchive.objects.get(id=self.old_flight.id)
+        self.assertEqual(len(archived.crew_ids), 1)
+        self.assertEqual(TicketArchive.objects.get().flight, archived)
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertEqual(
+            OutboxEvent.objects.get(event_type="flight.archived").aggregate_id,
+            self.old_flight.id,
+        )
+
+    def test_archive_keeps_load_rollups(self):
+        expected = sorted(
+            RouteDailyLoad.objects.values_list("date", "flights", "seats_sold")
+        )
+
+        call_command("archive_flights", "--older-than-days=30", stdout=StringIO())
+        rebuild_route_daily_loads()
+
+        self.assertEqual(
+            sorted(RouteDailyLoad.objects.values_list("date", "flights", "seats_sold")),
+            expected,
+        )
+
+    def test_order_history_includes_archived_tickets(self):
+        call_command("archive_flights", "--older-than-days=30", stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        res = client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        order = res.data["results"][0]
+        self.assertEqual(len(order["tickets"]), 1)
+        self.assertEqual(len(order["archived_tickets"]), 1)
+        self.assertEqual(order["archived_tickets"][0]["flight"]["airplane_name"], "Airplane-1")
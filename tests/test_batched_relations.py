@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.serializers import FlightSerializer, OrderSerializer
+
+
+class BatchedRelationsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flights = [
+            Flight.objects.create(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=f"2023-07-{day}T10:00:00Z",
+                arrival_time=f"2023-07-{day}T15:00:00Z",
+            )
+            for day in (20, 21, 22)
+        ]
+        self.spare_airplane = Airplane.objects.create(
+            name="Airplane-2", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.crews = Crew.objects.bulk_create(
+            Crew(first_name=f"First-{i}", last_name=f"Last-{i}") for i in range(20)
+        )
+
+    def test_order_validation_query_count_is_constant(self):
+        tickets = [
+            {"row": row, "seat": seat, "flight": flight.id}
+            for flight in self.flights
+            for row in range(1, 5)
+            for seat in range(1, 4)
+        ]
+        serializer = OrderSerializer(data={"tickets": tickets})
+
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_taken_seat_rejected(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flights[0], row=1, seat=1, order=order)
+        serializer = OrderSerializer(
+            data={"tickets": [{"row": 1, "seat": 1, "flight": self.flights[0].id}]}
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("tickets", serializer.errors)
+
+    def test_duplicate_seat_in_payload_rejected(self):
+        ticket = {"row": 1, "seat": 1, "flight": self.flights[0].id}
+        serializer = OrderSerializer(data={"tickets": [ticket, ticket]})
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("tickets", serializer.errors)
+
+    def test_unknown_flight_reported(self):
+        serializer = OrderSerializer(
+            data={"tickets": [{"row": 1, "seat": 1, "flight": 999999}]}
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("flight", serializer.errors["tickets"][0])
+
+    def flight_serializer(self, crews):
+        return FlightSerializer(
+            data={
+                "route": self.route.id,
+                "airplane": self.spare_airplane.id,
+                "departure_time": "2023-07-30T10:00:00Z",
+                "arrival_time": "2023-07-30T15:00:00Z",
+                "crews": [crew.id for crew in crews],
+            }
+        )
+
+    def test_crews_query_count_does_not_grow_with_payload(self):
+        single = self.flight_serializer(self.crews[:1])
+        with CaptureQueriesContext(connection) as single_queries:
+            self.assertTrue(single.is_valid(), single.errors)
+
+        many = self.flight_serializer(self.crews)
+        with CaptureQueriesContext(connection) as many_queries:
+            self.assertTrue(many.is_valid(), many.errors)
+
+        self.assertEqual(len(many_queries), len(single_queries))
+        self.assertEqual(
+            [crew.id for crew in many.validated_data["crews"]],
+            [crew.id for crew in self.crews],
+        )
@@ -0,0 +1,187 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from airport.board import ARRIVALS, DEPARTURES, AirportBoard, airport_board
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.reference_data import REFERENCE_TABLES, warm_reference_data
+from airport.tail_assignment import apply_tail_assignment
+
+
+def board_url(airport_id):
+    return reverse("airport:airport-board", args=[airport_id])
+
+
+class BoardMixin:
+    def create_schedule(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.kyiv = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        self.lisbon = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=self.kyiv, destination=self.lisbon, distance=1000)
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type1"),
+        )
+        self.now = timezone.now()
+        self.flights = [self.create_flight(hours) for hours in (-3, 5, 1, 3)]
+
+    def create_flight(self, hours, route=None):
+        departure_time = self.now + timedelta(hours=hours)
+        return Flight.objects.create(
+            route=route or self.route,
+            airplane=self.airplane,
+            departure_time=departure_time,
+            arrival_time=departure_time + timedelta(hours=2),
+        )
+
+
+class AirportBoardTests(BoardMixin, TestCase):
+    def setUp(self):
+        self.create_schedule()
+
+    def test_departures_are_upcoming_and_sorted(self):
+        res = self.client.get(board_url(self.kyiv.id))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [flight["id"] for flight in res.data["flights"]],
+            [self.flights[2].id, self.flights[3].id, self.flights[1].id],
+        )
+        self.assertEqual(res.data["flights"][0]["destination"], "Test-2")
+        self.assertEqual(res.data["flights"][0]["airplane"], "Airplane-1")
+        self.assertIsNone(res.data["next"])
+
+    def test_arrivals_are_listed_at_destination(self):
+        res = self.client.get(board_url(self.lisbon.id), {"kind": ARRIVALS})
+
+        self.assertEqual(len(res.data["flights"]), 3)
+        self.assertEqual(res.data["flights"][0]["source"], "Test-1")
+        self.assertEqual(self.client.get(board_url(self.lisbon.id)).data["flights"], [])
+
+    def test_pages_continue_from_cursor(self):
+        first = self.client.get(board_url(self.kyiv.id), {"limit": 2})
+        second = self.client.get(
+            board_url(self.kyiv.id), {"limit": 2, "cursor": first.data["next"]}
+        )
+
+        self.assertEqual(len(first.data["flights"]), 2)
+        self.assertEqual([flight["id"] for flight in second.data["flights"]], [self.flights[1].id])
+        self.assertIsNone(second.data["next"])
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(
+            self.client.get(board_url(self.kyiv.id), {"kind": "gates"}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get(board_url(self.kyiv.id), {"cursor": "abc"}).status_code, 400
+        )
+        self.assertEqual(self.client.get(board_url(self.lisbon.id + 100)).status_code, 404)
+
+    def test_board_keeps_equal_times_apart(self):
+        board = AirportBoard()
+        rows = [
+            {
+                "id": flight_id,
+                "route_id": 1,
+                "route__source_id": 1,
+                "route__destination_id": 2,
+                "route__source__name": "A",
+                "route__destination__name": "B",
+                "airplane__name": "P",
+                "departure_time": self.now,
+                "arrival_time": self.now,
+            }
+            for flight_id in (3, 1, 2)
+        ]
+        for row in rows:
+            board.add(row)
+        board.remove(1)
+
+        first, cursor = board.page(1, DEPARTURES, (0, 0), 1)
+        second, cursor = board.page(1, DEPARTURES, cursor, 1)
+
+        self.assertEqual([first[0]["id"], second[0]["id"]], [2, 3])
+        self.assertIsNone(cursor)
+
+
+class AirportBoardUpdateTests(BoardMixin, TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        for index in (airport_board, *REFERENCE_TABLES.values()):
+            index.reset()
+            self.addCleanup(index.reset)
+        self.create_schedule()
+        warm_reference_data()
+        airport_board.index()
+
+    def departures(self):
+        return [flight["id"] for flight in self.client.get(board_url(self.kyiv.id)).data["flights"]]
+
+    def test_page_does_not_query_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(board_url(self.kyiv.id))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "test_cache",
+            },
+            "throttle": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+    )
+    def test_page_does_not_query_database_with_database_cache(self):
+        call_command("createcachetable", verbosity=0)
+        airport_board.reset()
+        airport_board.index()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(board_url(self.kyiv.id))
+
+        self.assertEqual(len(res.data["flights"]), 3)
+
+    def test_flight_changes_are_applied_incrementally(self):
+        board = airport_board.index()
+        added = self.create_flight(2)
+        self.flights[1].departure_time = self.now - timedelta(hours=2)
+        self.flights[1].save()
+        self.flights[3].delete()
+
+        self.assertIs(airport_board.index(), board)
+        self.assertEqual(self.departures(), [self.flights[2].id, added.id])
+
+    def test_tail_assignment_updates_the_board(self):
+        other = Airplane.objects.create(
+            name="Airplane-2", rows=5, seats_in_row=4, airplane_type=self.airplane.airplane_type
+        )
+        airport_board.index()
+
+        apply_tail_assignment({self.flights[2].id: other.id})
+
+        flights = self.client.get(board_url(self.kyiv.id)).data["flights"]
+        self.assertEqual(
+            [flight["airplane"] for flight in flights], ["Airplane-2", "Airplane-1", "Airplane-1"]
+        )
+
+    def test_route_changes_rebuild_the_board(self):
+        self.route.source = self.lisbon
+        self.route.destination = self.kyiv
+        self.route.save()
+
+        self.assertEqual(self.departures(), [])
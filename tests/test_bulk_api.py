@@ -0,0 +1,237 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airport, Airplane, AirplaneType, Crew, Flight, Route, RouteDailyLoad
+from airport.schedule import airplane_rotation, crew_roster
+
+AIRPORT_BULK_URL = reverse("airport:airport-bulk")
+ROUTE_BULK_URL = reverse("airport:route-bulk")
+FLIGHT_BULK_URL = reverse("airport:flight-bulk")
+
+
+class BulkApiTests(TestCase):
+    def setUp(self):
+        crew_roster.reset()
+        airplane_rotation.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+
+    def tearDown(self):
+        crew_roster.reset()
+        airplane_rotation.reset()
+
+    def test_bulk_requires_staff(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "testpass")
+        )
+
+        res = client.post(AIRPORT_BULK_URL, [{"name": "A", "closest_big_city": "B"}], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_create_airports(self):
+        payload = [
+            {"name": f"Airport-{i}", "closest_big_city": "Kyiv"} for i in range(10)
+        ]
+
+        res = self.client.post(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Airport.objects.count(), 10)
+        self.assertEqual(len(res.data), 10)
+
+    def test_bulk_create_returns_per_item_errors(self):
+        payload = [
+            {"name": "Airport-1", "closest_big_city": "Kyiv"},
+            {"name": "Airport-2"},
+        ]
+
+        res = self.client.post(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("closest_big_city", res.data[1])
+        self.assertEqual(Airport.objects.count(), 0)
+
+    def test_bulk_create_rejects_duplicate_and_taken_names(self):
+        Airport.objects.create(name="Taken", closest_big_city="Kyiv")
+        payload = [
+            {"name": "Airport-1", "closest_big_city": "Kyiv"},
+            {"name": "Taken", "closest_big_city": "Kyiv"},
+            {"name": "Airport-1", "closest_big_city": "Lviv"},
+        ]
+
+        res = self.client.post(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertEqual(res.data[1], {"name": ["airport with this name already exists."]})
+        self.assertEqual(res.data[2], {"name": ["Duplicates item 0 of this payload."]})
+        self.assertEqual(Airport.objects.count(), 1)
+
+    def test_bulk_create_checks_names_in_one_query(self):
+        def queries(count):
+            payload = [
+                {"name": f"Airport-{count}-{i}", "closest_big_city": "Kyiv"}
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as captured:
+                res = self.client.post(AIRPORT_BULK_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(captured)
+
+        self.assertEqual(queries(10), queries(40))
+
+    def test_bulk_update_may_swap_names(self):
+        first = Airport.objects.create(name="Airport-1", closest_big_city="Kyiv")
+        second = Airport.objects.create(name="Airport-2", closest_big_city="Kyiv")
+        payload = [{"id": first.id, "name": "Airport-3"}, {"id": second.id, "name": "Airport-1"}]
+
+        res = self.client.patch(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        second.refresh_from_db()
+        self.assertEqual(second.name, "Airport-1")
+
+    def test_bulk_create_routes_runs_model_clean(self):
+        airport = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+
+        res = self.client.post(
+            ROUTE_BULK_URL,
+            [{"source": airport.id, "destination": airport.id, "distance": 10}],
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Route.objects.count(), 0)
+
+    def test_bulk_update_airports(self):
+        airports = Airport.objects.bulk_create(
+            Airport(name=f"Airport-{i}", closest_big_city="Kyiv") for i in range(3)
+        )
+        payload = [{"id": airport.id, "closest_big_city": "Lviv"} for airport in airports]
+
+        res = self.client.patch(AIRPORT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Airport.objects.filter(closest_big_city="Lviv").count(), 3)
+
+
+class FlightBulkApiTests(TestCase):
+    def setUp(self):
+        crew_roster.reset()
+        airplane_rotation.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.airplanes = [
+            Airplane.objects.create(
+                name=f"Airplane-{i}", rows=10, seats_in_row=6, airplane_type=airplane_type
+            )
+            for i in range(3)
+        ]
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+
+    def tearDown(self):
+        crew_roster.reset()
+        airplane_rotation.reset()
+
+    def flight_payload(self, airplane, day, crews=()):
+        return {
+            "route": self.route.id,
+            "airplane": airplane.id,
+            "departure_time": f"2023-07-{day}T10:00:00Z",
+            "arrival_time": f"2023-07-{day}T15:00:00Z",
+            "crews": [crew.id for crew in crews],
+        }
+
+    def test_bulk_create_flights_with_crews(self):
+        payload = [
+            self.flight_payload(self.airplanes[0], 20, crews=[self.crew]),
+            self.flight_payload(self.airplanes[1], 21),
+        ]
+
+        res = self.client.post(FLIGHT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Flight.objects.count(), 2)
+        self.assertEqual(list(self.crew.flight_set.values_list("id", flat=True)), [res.data[0]["id"]])
+        self.assertEqual(RouteDailyLoad.objects.filter(route=self.route).count(), 2)
+
+    def test_bulk_create_rejects_overlaps_within_payload(self):
+        payload = [
+            self.flight_payload(self.airplanes[0], 20, crews=[self.crew]),
+            self.flight_payload(self.airplanes[1], 20, crews=[self.crew]),
+        ]
+
+        res = self.client.post(FLIGHT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("crews", res.data[1])
+        self.assertEqual(Flight.objects.count(), 0)
+
+    def test_bulk_create_rejects_disconnected_legs_within_payload(self):
+        elsewhere = Route.objects.create(
+            source=Airport.objects.create(name="Test-3", closest_big_city="Paris"),
+            destination=self.route.source,
+            distance=2000,
+        )
+        payload = [
+            self.flight_payload(self.airplanes[0], 20),
+            {**self.flight_payload(self.airplanes[0], 21), "route": elsewhere.id},
+        ]
+
+        res = self.client.post(FLIGHT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("in this payload (item 0)", res.data[1]["route"][0])
+
+    def test_bulk_create_checks_legs_against_schedule(self):
+        Flight.objects.create(
+            route=self.route,
+            airplane=self.airplanes[0],
+            departure_time="2023-07-22T10:00:00Z",
+            arrival_time="2023-07-22T15:00:00Z",
+        )
+        payload = [self.flight_payload(self.airplanes[0], 20)]
+
+        res = self.client.post(FLIGHT_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("route", res.data[0])
+
+    def test_bulk_update_replaces_crews(self):
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplanes[0],
+            departure_time="2023-07-20T10:00:00Z",
+            arrival_time="2023-07-20T15:00:00Z",
+        )
+
+        res = self.client.patch(
+            FLIGHT_BULK_URL, [{"id": flight.id, "crews": [self.crew.id]}], format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["crews"], [self.crew.id])
+        self.assertEqual(list(flight.crews.all()), [self.crew])
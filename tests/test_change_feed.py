@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from airport.archive import archive_flight_batch
+from airport.change_feed import read_changes
+from airport.geo import recompute_route_distances
+from airport.models import Airplane, AirplaneType, Airport, ChangeLogEntry, Crew, Flight, Route
+from airport.pricing import reprice_upcoming_flights
+from airport.tail_assignment import apply_tail_assignment
+
+CHANGES_URL = reverse("airport:change-list")
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTests(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(
+            source=self.source, destination=destination, distance=1000
+        )
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type1"),
+        )
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time="2023-07-20T06:00:00Z",
+            arrival_time="2023-07-20T09:00:00Z",
+        )
+        self.cursor = read_changes(0, 1000)["next"]
+
+    def test_initial_sync_lists_created_entities(self):
+        changes = read_changes(0, 1000)["changes"]
+
+        self.assertEqual(
+            [(change["entity"], change["action"]) for change in changes],
+            [
+                ("airport", "created"),
+                ("airport", "created"),
+                ("route", "created"),
+                ("airplane", "created"),
+                ("flight", "created"),
+            ],
+        )
+        self.assertEqual(changes[2]["data"]["source"], self.source.id)
+
+    def test_only_changes_after_cursor_are_returned(self):
+        self.assertEqual(read_changes(self.cursor, 1000)["changes"], [])
+
+        self.route.distance = 1200
+        self.route.save()
+        page = read_changes(self.cursor, 1000)
+
+        self.assertEqual(len(page["changes"]), 1)
+        self.assertEqual(page["changes"][0]["data"]["distance"], 1200)
+        self.assertGreater(page["next"], self.cursor)
+
+    def test_changes_to_one_entity_are_collapsed(self):
+        self.flight.fare = 150
+        self.flight.save()
+        self.flight.save()
+        airport_id, route_id, flight_id = self.source.id, self.route.id, self.flight.id
+        self.source.delete()
+
+        changes = read_changes(self.cursor, 1000)["changes"]
+
+        by_entity = {(change["entity"], change["id"]): change for change in changes}
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(by_entity[("airport", airport_id)]["action"], "deleted")
+        self.assertIsNone(by_entity[("airport", airport_id)]["data"])
+        # Deleting the airport cascaded to its route and the route's flight.
+        self.assertEqual(by_entity[("route", route_id)]["action"], "deleted")
+        self.assertEqual(by_entity[("flight", flight_id)]["action"], "deleted")
+
+    def test_crew_changes_are_recorded_on_the_flight(self):
+        crew = Crew.objects.create(first_name="John", last_name="Smith")
+        self.flight.crews.add(crew)
+        cursor = read_changes(self.cursor, 1000)["next"]
+        crew.flight_set.clear()
+
+        changes = read_changes(cursor, 1000)["changes"]
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]["entity"], "flight")
+        self.assertEqual(changes[0]["data"]["crews"], [])
+
+    def test_batch_jobs_record_updates(self):
+        other = Airplane.objects.create(
+            name="Airplane-2", rows=5, seats_in_row=4, airplane_type=self.airplane.airplane_type
+        )
+        Airport.objects.filter(id=self.source.id).update(latitude=50.45, longitude=30.52)
+        Airport.objects.filter(id=self.route.destination_id).update(
+            latitude=38.72, longitude=-9.14
+        )
+        departure = timezone.now() + timedelta(days=10)
+        Flight.objects.filter(id=self.flight.id).update(
+            departure_time=departure, arrival_time=departure + timedelta(hours=3)
+        )
+        cursor = read_changes(self.cursor, 1000)["next"]
+
+        recompute_route_distances()
+        apply_tail_assignment({self.flight.id: other.id})
+        reprice_upcoming_flights()
+
+        changes = read_changes(cursor, 1000)["changes"]
+
+        self.assertEqual(
+            sorted((change["entity"], change["action"]) for change in changes),
+            [("flight", "updated"), ("route", "updated")],
+        )
+        by_entity = {change["entity"]: change["data"] for change in changes}
+        self.assertEqual(by_entity["flight"]["airplane"], other.id)
+        self.assertIsNotNone(by_entity["flight"]["fare"])
+        self.assertNotEqual(by_entity["route"]["distance"], 1000)
+
+    def test_archived_flights_are_recorded_as_deleted(self):
+        archive_flight_batch(timezone.now(), 10)
+
+        changes = read_changes(self.cursor, 1000)["changes"]
+
+        self.assertEqual(
+            [(change["entity"], change["id"], change["action"]) for change in changes],
+            [("flight", self.flight.id, "deleted")],
+        )
+
+    def test_late_committing_writer_is_not_skipped(self):
+        later = timezone.now() + timedelta(minutes=10)
+        with transaction.atomic():
+            self.route.distance = 1300
+            self.route.save()
+            polled = read_changes(self.cursor, 1000, now=later)
+
+        page = read_changes(polled["next"], 1000, now=later)
+
+        self.assertEqual(polled["changes"], [])
+        self.assertEqual(len(page["changes"]), 1)
+        self.assertEqual(page["changes"][0]["data"]["distance"], 1300)
+
+    def test_pages_continue_from_next_cursor(self):
+        first = read_changes(0, 3)
+        second = read_changes(first["next"], 3)
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        self.assertEqual(len(first["changes"]) + len(second["changes"]), 5)
+
+    @override_settings(CHANGE_FEED_SETTLE_SECONDS=60)
+    def test_recent_entries_are_held_back(self):
+        self.route.save()
+
+        page = read_changes(self.cursor, 1000)
+
+        self.assertEqual(page["changes"], [])
+        self.assertEqual(page["next"], self.cursor)
+        self.assertTrue(ChangeLogEntry.objects.filter(id__gt=self.cursor).exists())
+
+    def test_endpoint_returns_deltas(self):
+        res = self.client.get(CHANGES_URL, {"since": self.cursor})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data, {"changes": [], "next": self.cursor, "has_more": False})
+
+    def test_endpoint_rejects_invalid_cursor(self):
+        res = self.client.get(CHANGES_URL, {"since": "abc"})
+
+        self.assertEqual(res.status_code, 400)
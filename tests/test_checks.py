@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase, override_settings
+
+from airport.checks import check_shared_cache
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_process_local_cache_is_reported(self):
+        warnings = check_shared_cache(None)
+
+        self.assertEqual([warning.id for warning in warnings], ["airport.W001"])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "airport_cache",
+            }
+        }
+    )
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,153 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from airport.coalesce import SingleFlight, flight_detail_cache_key
+from airport.models import Airport, Airplane, AirplaneType, Flight, Order, Route, Ticket
+
+KEY = "test:single_flight"
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.single_flight = SingleFlight()
+        self.calls = 0
+
+    def compute(self, value="fresh", delay=0.0):
+        def run():
+            self.calls += 1
+            time.sleep(delay)
+            return value
+
+        return run
+
+    def test_concurrent_misses_compute_once(self):
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.single_flight.get(KEY, self.compute(delay=0.2), 60)
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["fresh"] * 8)
+
+    def test_miss_waits_for_lock_holder_in_another_process(self):
+        cache.add(SingleFlight.lock_key(KEY), 1)
+        filler = threading.Timer(
+            0.1, lambda: cache.set(KEY, {"value": "remote", "fresh_until": time.time() + 60})
+        )
+        filler.start()
+        self.addCleanup(filler.cancel)
+
+        self.assertEqual(self.single_flight.get(KEY, self.compute(), 60), "remote")
+        self.assertEqual(self.calls, 0)
+
+    @override_settings(SINGLE_FLIGHT_WAIT_TIMEOUT=0.1)
+    def test_miss_computes_after_waiting_too_long(self):
+        cache.add(SingleFlight.lock_key(KEY), 1)
+
+        self.assertEqual(self.single_flight.get(KEY, self.compute(), 60), "fresh")
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_entry_served_while_revalidating(self):
+        self.single_flight.get(KEY, self.compute("old"), 60, stale_ttl=60)
+        self.single_flight.expire(KEY, 60)
+        cache.add(SingleFlight.lock_key(KEY), 1)
+
+        self.assertEqual(self.single_flight.get(KEY, self.compute("new"), 60, 60), "old")
+
+        cache.delete(SingleFlight.lock_key(KEY))
+        self.assertEqual(self.single_flight.get(KEY, self.compute("new"), 60, 60), "new")
+        self.assertEqual(self.single_flight.get(KEY, self.compute("newer"), 60, 60), "new")
+
+    def test_errors_are_not_cached(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            self.single_flight.get(KEY, fail, 60)
+
+        self.assertEqual(self.single_flight.get(KEY, self.compute(), 60), "fresh")
+        self.assertIsNone(cache.get(SingleFlight.lock_key(KEY)))
+
+
+class FlightDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="Test-1", closest_big_city="Kyiv"),
+            destination=Airport.objects.create(name="Test-2", closest_big_city="Lisbon"),
+            distance=1000,
+        )
+        airplane = Airplane.objects.create(
+            name="Airplane-1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type1"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-20T06:00:00Z",
+            arrival_time="2023-07-20T09:00:00Z",
+        )
+        self.url = reverse("airport:flight-detail", args=[self.flight.id])
+
+    def test_repeated_retrieve_hits_cache(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.data, first.data)
+
+    def test_ticket_sale_expires_cached_detail(self):
+        self.client.get(self.url)
+        order = Order.objects.create(user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(flight=self.flight, row=1, seat=1, order=order)
+
+        entry = cache.get(flight_detail_cache_key(self.flight.id))
+        self.assertEqual(entry["fresh_until"], 0)
+        self.client.get(self.url)
+        res = self.client.get(self.url)
+        self.assertEqual(res.data["taken_places"], [{"row": 1, "seat": 1}])
+
+    def test_flight_update_drops_cached_detail(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.save()
+
+        self.assertIsNone(cache.get(flight_detail_cache_key(self.flight.id)))
+
+    def test_padded_id_shares_the_cached_detail(self):
+        padded = reverse("airport:flight-detail", args=[f"0{self.flight.id}"])
+        self.client.get(padded)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.data["id"], self.flight.id)
+        self.assertEqual(
+            self.client.get(reverse("airport:flight-detail", args=["abc"])).status_code, 404
+        )
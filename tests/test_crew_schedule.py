@@ -0,0 +1,163 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airport, Airplane, AirplaneType, Crew, Flight, Route
+from airport.schedule import IntervalIndex, crew_roster
+
+FLIGHT_URL = reverse("airport:flight-list")
+CREW_AVAILABLE_URL = reverse("airport:crew-available")
+
+
+class IntervalIndexTests(TestCase):
+    def test_overlapping_respects_gap(self):
+        index = IntervalIndex()
+        index.add("crew", 100, 200, "a")
+        index.add("crew", 1000, 5000, "b")
+
+        self.assertEqual(index.overlapping("crew", 150, 160), ["a"])
+        self.assertEqual(index.overlapping("crew", 250, 300), [])
+        self.assertEqual(index.overlapping("crew", 250, 300, gap=60), ["a"])
+        self.assertEqual(index.overlapping("crew", 4000, 4100), ["b"])
+
+    def test_remove_item(self):
+        index = IntervalIndex()
+        index.add(1, 100, 200, "a")
+        index.add(2, 100, 200, "a")
+
+        index.remove_item("a")
+
+        self.assertEqual(len(index), 0)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "test_cache",
+        }
+    }
+)
+class SharedVersionTests(TransactionTestCase):
+    def setUp(self):
+        call_command("createcachetable", verbosity=0)
+        cache.clear()
+        crew_roster.reset()
+        self.addCleanup(crew_roster.reset)
+
+    def test_warm_index_makes_no_queries(self):
+        roster = crew_roster.index()
+
+        with self.assertNumQueries(0):
+            self.assertIs(crew_roster.index(), roster)
+
+    @override_settings(SCHEDULE_VERSION_CHECK_SECONDS=0)
+    def test_version_is_read_in_one_query(self):
+        crew_roster.index()
+
+        with self.assertNumQueries(1):
+            crew_roster.index()
+
+    def test_local_changes_keep_the_index(self):
+        roster = crew_roster.index()
+        crew_roster.unassign(1)
+
+        with self.assertNumQueries(0):
+            self.assertIs(crew_roster.index(), roster)
+
+
+class CrewScheduleTests(TestCase):
+    def setUp(self):
+        crew_roster.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.other_airplane = Airplane.objects.create(
+            name="Airplane-2", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.crew1 = Crew.objects.create(first_name="John", last_name="Doe")
+        self.crew2 = Crew.objects.create(first_name="Jane", last_name="Smith")
+        with self.captureOnCommitCallbacks(execute=True):
+            flight = Flight.objects.create(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time="2023-07-25T10:00:00Z",
+                arrival_time="2023-07-25T15:00:00Z",
+            )
+            flight.crews.add(self.crew1)
+
+    def tearDown(self):
+        crew_roster.reset()
+
+    def flight_payload(self, departure_time, arrival_time, crews):
+        return {
+            "route": self.route.id,
+            "airplane": self.other_airplane.id,
+            "departure_time": departure_time,
+            "arrival_time": arrival_time,
+            "crews": [crew.id for crew in crews],
+        }
+
+    def test_overlapping_crew_assignment_rejected(self):
+        payload = self.flight_payload(
+            "2023-07-25T14:00:00Z", "2023-07-25T18:00:00Z", [self.crew1]
+        )
+        res = self.client.post(FLIGHT_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crews", res.data)
+
+    def test_assignment_within_min_rest_rejected(self):
+        payload = self.flight_payload(
+            "2023-07-25T15:30:00Z", "2023-07-25T18:00:00Z", [self.crew1]
+        )
+        res = self.client.post(FLIGHT_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_overlapping_crew_assignment_allowed(self):
+        payload = self.flight_payload(
+            "2023-07-25T17:00:00Z", "2023-07-25T20:00:00Z", [self.crew1, self.crew2]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(FLIGHT_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            crew_roster.conflicts(
+                [self.crew2.id], "2023-07-25T18:00:00Z", "2023-07-25T19:00:00Z"
+            ),
+            {self.crew2.id: [res.data["id"]]},
+        )
+
+    def test_available_crew(self):
+        res = self.client.get(
+            CREW_AVAILABLE_URL,
+            {
+                "departure_time": "2023-07-25T12:00:00Z",
+                "arrival_time": "2023-07-25T13:00:00Z",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([crew["id"] for crew in res.data], [self.crew2.id])
+
+    def test_available_crew_requires_window(self):
+        res = self.client.get(CREW_AVAILABLE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,111 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, F, Max
+from django.test import TestCase
+
+from airport.dataset import generate_dataset
+from airport.models import (
+    Airport,
+    Airplane,
+    Flight,
+    Order,
+    Route,
+    RouteDailyLoad,
+    Ticket,
+)
+
+OPTIONS = {
+    "airports": 30,
+    "flights": 200,
+    "tickets": 3000,
+    "days": 7,
+    "start": date(2024, 3, 1),
+    "seed": 7,
+}
+
+
+def snapshot():
+    return (
+        list(Route.objects.order_by("id").values_list("source__name", "destination__name")),
+        list(
+            Flight.objects.order_by("id").values_list(
+                "route_id", "airplane_id", "departure_time", "fare"
+            )
+        ),
+        list(Ticket.objects.order_by("id").values_list("flight_id", "row", "seat", "order__user")),
+    )
+
+
+class GenerateDatasetTests(TestCase):
+    def test_requested_volumes_are_written(self):
+        call_command(
+            "generate_dataset",
+            "--airports=30",
+            "--flights=200",
+            "--tickets=3000",
+            "--users=100",
+            "--start-date=2024-03-01",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(Airport.objects.count(), 30)
+        self.assertEqual(Flight.objects.count(), 200)
+        self.assertEqual(Ticket.objects.count(), 3000)
+        self.assertEqual(get_user_model().objects.count(), 100)
+        self.assertGreater(RouteDailyLoad.objects.aggregate(sold=Max("seats_sold"))["sold"], 0)
+
+    def test_same_seed_reproduces_dataset(self):
+        generate_dataset(**OPTIONS)
+        first = snapshot()
+
+        for model in (Ticket, Order, Flight, Airplane, Route, Airport, get_user_model()):
+            model.objects.all().delete()
+        generate_dataset(**OPTIONS)
+
+        self.assertEqual(snapshot(), first)
+
+    def test_network_is_hub_and_spoke(self):
+        generate_dataset(**OPTIONS)
+
+        degrees = sorted(
+            Airport.objects.annotate(routes=Count("outgoing_routes")).values_list(
+                "routes", flat=True
+            ),
+            reverse=True,
+        )
+        self.assertGreater(degrees[0], 5)
+        self.assertLessEqual(degrees[-1], 2)
+
+    def test_tickets_fit_airplanes_and_orders_add_up(self):
+        generate_dataset(**OPTIONS)
+
+        self.assertFalse(Ticket.objects.filter(row__gt=F("flight__airplane__rows")).exists())
+        self.assertFalse(
+            Ticket.objects.filter(seat__gt=F("flight__airplane__seats_in_row")).exists()
+        )
+        order = Order.objects.annotate(tickets_count=Count("tickets")).first()
+        self.assertEqual(
+            order.total_price, order.tickets.first().flight.fare * order.tickets_count
+        )
+
+    def test_airplanes_never_double_booked(self):
+        generate_dataset(**OPTIONS)
+
+        legs = {}
+        for airplane_id, departure, arrival, source, destination in Flight.objects.order_by(
+            "departure_time"
+        ).values_list(
+            "airplane_id",
+            "departure_time",
+            "arrival_time",
+            "route__source_id",
+            "route__destination_id",
+        ):
+            previous = legs.get(airplane_id)
+            if previous:
+                self.assertGreater(departure, previous[0])
+                self.assertEqual(source, previous[1])
+            legs[airplane_id] = (arrival, destination)
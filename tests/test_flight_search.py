@@ -0,0 +1,194 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from airport.flight_search import search_cache_key, search_params
+from airport.models import Airplane, AirplaneType, Airport, Flight, Order, Route, Ticket
+from airport.tail_assignment import apply_tail_assignment
+
+FLIGHT_URL = reverse("airport:flight-list")
+AVAILABILITY_URL = reverse("airport:flight-availability")
+
+
+class FlightSearchCacheTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type1"),
+        )
+        self.flight = self.create_flight("2023-07-25T10:00:00Z", "2023-07-25T15:00:00Z")
+        self.create_flight("2023-07-26T10:00:00Z", "2023-07-26T15:00:00Z")
+
+    def create_flight(self, departure_time, arrival_time):
+        return Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        )
+
+    def search(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(FLIGHT_URL, params)
+        self.assertEqual(res.status_code, 200)
+        return res.data, len(queries)
+
+    def test_params_are_normalized(self):
+        first = search_params({"airplane": "007", "departure_time": "2023-7-25"})
+        second = search_params(
+            {"departure_time": "2023-07-25T00:00:00Z", "airplane": "7", "arrival_time": ""}
+        )
+
+        self.assertEqual(search_cache_key(first, 1), search_cache_key(second, 1))
+
+    def test_equivalent_search_is_served_from_cache(self):
+        first, _ = self.search({"departure_time": "2023-07-25", "airplane": self.airplane.id})
+        second, queries = self.search(
+            {"airplane": f"0{self.airplane.id}", "departure_time": "2023-07-25T08:00:00Z"}
+        )
+
+        self.assertEqual(queries, 0)
+        self.assertEqual(second, first)
+        self.assertEqual([flight["id"] for flight in second], [self.flight.id])
+        self.assertEqual(second[0]["tickets_available"], 60)
+
+    def test_ticket_sale_only_refreshes_availability(self):
+        self.search({})
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, row=1, seat=1, order=order)
+
+        flights, queries = self.search({})
+
+        self.assertEqual(queries, 1)
+        available = {flight["id"]: flight["tickets_available"] for flight in flights}
+        self.assertEqual(available[self.flight.id], 59)
+
+    def test_flight_changes_invalidate_searches(self):
+        self.search({"departure_time": "2023-07-25"})
+        added = self.create_flight("2023-07-25T18:00:00Z", "2023-07-25T21:00:00Z")
+
+        flights, _ = self.search({"departure_time": "2023-07-25"})
+
+        self.assertEqual({flight["id"] for flight in flights}, {self.flight.id, added.id})
+
+    def test_airplane_changes_refresh_capacity(self):
+        self.search({})
+        self.airplane.rows = 5
+        self.airplane.save()
+
+        flights, _ = self.search({})
+
+        self.assertEqual(flights[0]["airplane_capacity"], 30)
+        self.assertEqual(flights[0]["tickets_available"], 30)
+
+    def test_tail_assignment_refreshes_searches(self):
+        self.search({})
+        other = Airplane.objects.create(
+            name="Airplane-2", rows=5, seats_in_row=4, airplane_type=self.airplane.airplane_type
+        )
+        self.search({})
+
+        apply_tail_assignment({self.flight.id: other.id})
+
+        flights, _ = self.search({})
+        row = next(flight for flight in flights if flight["id"] == self.flight.id)
+        self.assertEqual(row["airplane_name"], "Airplane-2")
+        self.assertEqual(row["airplane_capacity"], 20)
+        self.assertEqual(row["tickets_available"], 20)
+
+    def test_invalid_params_are_rejected(self):
+        self.assertEqual(self.client.get(FLIGHT_URL, {"airplane": "one"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(FLIGHT_URL, {"departure_time": "tomorrow"}).status_code, 400
+        )
+
+
+class FlightAvailabilityBatchTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.flights = [
+            Flight.objects.create(
+                route=route,
+                airplane=Airplane.objects.create(
+                    name=f"Airplane-{rows}", rows=rows, seats_in_row=4, airplane_type=airplane_type
+                ),
+                departure_time=f"2023-07-2{rows}T10:00:00Z",
+                arrival_time=f"2023-07-2{rows}T15:00:00Z",
+            )
+            for rows in (5, 6, 7)
+        ]
+        order = Order.objects.create(user=self.user)
+        for seat in (2, 1):
+            Ticket.objects.create(flight=self.flights[1], row=3, seat=seat, order=order)
+
+    def ids(self, *flights):
+        return ",".join(str(flight.id) for flight in flights)
+
+    def test_availability_of_many_flights_in_two_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                AVAILABILITY_URL,
+                {"ids": self.ids(self.flights[1], self.flights[0]), "seats": "true"},
+            )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "id": self.flights[1].id,
+                    "capacity": 24,
+                    "tickets_available": 22,
+                    "rows": 6,
+                    "seats_in_row": 4,
+                    "taken": [[3, 1], [3, 2]],
+                },
+                {
+                    "id": self.flights[0].id,
+                    "capacity": 20,
+                    "tickets_available": 20,
+                    "rows": 5,
+                    "seats_in_row": 4,
+                    "taken": [],
+                },
+            ],
+        )
+
+    def test_seats_are_optional_and_unknown_ids_skipped(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                AVAILABILITY_URL, {"ids": f"{self.ids(self.flights[2])},{self.flights[2].id + 100}"}
+            )
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            res.data, [{"id": self.flights[2].id, "capacity": 28, "tickets_available": 28}]
+        )
+
+    def test_batch_size_is_limited(self):
+        too_many = ",".join(str(flight_id) for flight_id in range(1, 52))
+
+        self.assertEqual(self.client.get(AVAILABILITY_URL, {"ids": too_many}).status_code, 400)
+        self.assertEqual(self.client.get(AVAILABILITY_URL).status_code, 400)
+        self.assertEqual(self.client.get(AVAILABILITY_URL, {"ids": "1,x"}).status_code, 400)
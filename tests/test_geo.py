@@ -0,0 +1,112 @@
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.geo import SphericalKDTree, airport_index, haversine_km
+from airport.models import Airport, Route
+
+NEAREST_URL = reverse("airport:airport-nearest")
+AIRPORT_URL = reverse("airport:airport-list")
+
+
+class HaversineTests(TestCase):
+    def test_known_distance(self):
+        distance = haversine_km([40.6413], [-73.7781], [51.47], [-0.4543])
+
+        self.assertAlmostEqual(distance[0], 5540, delta=1)
+
+    def test_tree_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, 500)))
+        longitudes = rng.uniform(-180, 180, 500)
+        tree = SphericalKDTree(latitudes, longitudes, range(500))
+
+        for latitude, longitude in ((89.9, 10), (0, 179.9), (-45, -60)):
+            distances = haversine_km(
+                np.full(500, latitude), np.full(500, longitude), latitudes, longitudes
+            )
+            nearest = tree.nearest(latitude, longitude, limit=3)
+            self.assertEqual(
+                [item for item, _ in nearest], list(np.argsort(distances)[:3])
+            )
+            self.assertAlmostEqual(nearest[0][1], distances.min(), places=6)
+
+
+class AirportGeoTests(TestCase):
+    def setUp(self):
+        airport_index.reset()
+        self.user = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.kyiv = Airport.objects.create(
+            name="Boryspil", closest_big_city="Kyiv", latitude=50.345, longitude=30.8947
+        )
+        self.lviv = Airport.objects.create(
+            name="Lviv", closest_big_city="Lviv", latitude=49.8125, longitude=23.9561
+        )
+        self.lisbon = Airport.objects.create(
+            name="Humberto Delgado", closest_big_city="Lisbon", latitude=38.7742, longitude=-9.1342
+        )
+        Airport.objects.create(name="Unknown", closest_big_city="Nowhere")
+
+    def test_nearest_airports_ordered_by_distance(self):
+        res = self.client.get(NEAREST_URL, {"latitude": 50.45, "longitude": 30.52, "limit": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([airport["id"] for airport in res.data], [self.kyiv.id, self.lviv.id])
+        self.assertLess(res.data[0]["distance_km"], 50)
+
+    def test_radius_limits_results(self):
+        res = self.client.get(
+            NEAREST_URL, {"latitude": 50.45, "longitude": 30.52, "radius_km": 100}
+        )
+
+        self.assertEqual([airport["id"] for airport in res.data], [self.kyiv.id])
+
+    def test_new_airport_rebuilds_index(self):
+        self.client.get(NEAREST_URL, {"latitude": 50.45, "longitude": 30.52})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                AIRPORT_URL,
+                {
+                    "name": "Zhuliany",
+                    "closest_big_city": "Kyiv",
+                    "latitude": 50.4017,
+                    "longitude": 30.4519,
+                },
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.get(NEAREST_URL, {"latitude": 50.45, "longitude": 30.52, "limit": 1})
+        self.assertEqual(res.data[0]["name"], "Zhuliany")
+
+    def test_invalid_coordinates_rejected(self):
+        res = self.client.get(NEAREST_URL, {"latitude": 120, "longitude": 30})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("latitude", res.data)
+
+    def test_recompute_route_distances(self):
+        route = Route.objects.create(source=self.kyiv, destination=self.lisbon, distance=1)
+        untouched = Route.objects.create(
+            source=self.kyiv,
+            destination=Airport.objects.get(name="Unknown"),
+            distance=1,
+        )
+
+        call_command("recompute_route_distances", stdout=StringIO())
+
+        route.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertAlmostEqual(route.distance, 3373, delta=1)
+        self.assertEqual(untouched.distance, 1)
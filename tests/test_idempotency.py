@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airport, Airplane, AirplaneType, Flight, Order, Route, Ticket
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class IdempotentOrderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-25T10:00:00Z",
+            arrival_time="2023-07-25T15:00:00Z",
+        )
+        self.payload = {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]}
+
+    def tearDown(self):
+        cache.clear()
+
+    def post(self, payload, key="order-1"):
+        return self.client.post(ORDER_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self.post(self.payload)
+        second = self.post(self.payload)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_key_reused_with_different_payload_rejected(self):
+        self.post(self.payload)
+        other = {"tickets": [{"row": 1, "seat": 2, "flight": self.flight.id}]}
+
+        res = self.post(other)
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_scoped_per_user(self):
+        self.post(self.payload)
+        other_client = APIClient()
+        other_client.force_authenticate(
+            get_user_model().objects.create_user("other@test.com", "testpass")
+        )
+        payload = {"tickets": [{"row": 1, "seat": 2, "flight": self.flight.id}]}
+
+        res = other_client.post(ORDER_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY="order-1")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_without_key_orders_are_not_deduplicated(self):
+        self.client.post(ORDER_URL, self.payload, format="json")
+        payload = {"tickets": [{"row": 1, "seat": 2, "flight": self.flight.id}]}
+        self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(Order.objects.count(), 2)
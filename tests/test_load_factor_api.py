@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Flight,
+    Order,
+    Route,
+    RouteDailyLoad,
+    Ticket,
+)
+
+LOAD_FACTOR_URL = reverse("airport:routedailyload-list")
+
+
+def sample_flight(route, airplane, departure_time, arrival_time):
+    return Flight.objects.create(
+        route=route, airplane=airplane, departure_time=departure_time, arrival_time=arrival_time
+    )
+
+
+class RouteDailyLoadTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        self.airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = sample_flight(
+            self.route, self.airplane, "2023-07-25T10:00:00Z", "2023-07-25T15:00:00Z"
+        )
+        sample_flight(
+            self.route, self.airplane, "2023-07-25T18:00:00Z", "2023-07-25T23:00:00Z"
+        )
+        sample_flight(
+            self.route, self.airplane, "2023-07-26T10:00:00Z", "2023-07-26T15:00:00Z"
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, row=1, seat=1, order=order)
+        Ticket.objects.create(flight=self.flight, row=1, seat=2, order=order)
+
+    def test_rollup_updated_incrementally(self):
+        rollup = RouteDailyLoad.objects.get(route=self.route, date="2023-07-25")
+
+        self.assertEqual(rollup.flights, 2)
+        self.assertEqual(rollup.seats_offered, 120)
+        self.assertEqual(rollup.seats_sold, 2)
+
+    def test_rollup_updated_on_ticket_delete(self):
+        Ticket.objects.filter(flight=self.flight).first().delete()
+
+        rollup = RouteDailyLoad.objects.get(route=self.route, date="2023-07-25")
+        self.assertEqual(rollup.seats_sold, 1)
+
+    def test_rebuild_matches_incremental(self):
+        expected = list(
+            RouteDailyLoad.objects.values_list(
+                "route_id", "date", "flights", "seats_offered", "seats_sold"
+            )
+        )
+
+        call_command("rebuild_load_rollups", stdout=StringIO())
+
+        rebuilt = list(
+            RouteDailyLoad.objects.values_list(
+                "route_id", "date", "flights", "seats_offered", "seats_sold"
+            )
+        )
+        self.assertEqual(rebuilt, expected)
+
+    def test_rollup_follows_airplane_capacity(self):
+        self.airplane.rows = 5
+        self.airplane.save()
+
+        rollups = dict(
+            RouteDailyLoad.objects.filter(route=self.route).values_list("date", "seats_offered")
+        )
+        self.assertEqual([rollups[day] for day in sorted(rollups)], [60, 30])
+
+    def test_renaming_airplane_keeps_rollups(self):
+        RouteDailyLoad.objects.update(seats_offered=0)
+        self.airplane.name = "Renamed"
+        self.airplane.save()
+
+        self.assertFalse(RouteDailyLoad.objects.exclude(seats_offered=0).exists())
+
+    def test_list_requires_staff(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        res = client.get(LOAD_FACTOR_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_filtered_by_date_range(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+
+        res = client.get(
+            LOAD_FACTOR_URL, {"date_from": "2023-07-26", "date_to": "2023-07-31"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["date"], "2023-07-26")
+        self.assertEqual(res.data[0]["flights"], 1)
@@ -0,0 +1,92 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from airport.load_shedding import (
+    CRITICAL,
+    DEFAULT,
+    LOW,
+    LoadShedder,
+    load_shedder,
+    load_shedding_settings,
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+METRICS_URL = reverse("load-shedding-metrics")
+
+OVERLOADED = {"MAX_CONCURRENCY": 2, "MAX_QUEUE_TIME": {DEFAULT: 0, LOW: 0}}
+
+
+class LoadShedderTests(SimpleTestCase):
+    def setUp(self):
+        self.shedder = LoadShedder()
+
+    @override_settings(LOAD_SHEDDING=OVERLOADED)
+    def test_low_priority_shed_before_critical(self):
+        config = load_shedding_settings()
+
+        self.assertTrue(self.shedder.admit(LOW, config))
+        self.assertFalse(self.shedder.admit(LOW, config))
+        self.assertTrue(self.shedder.admit(CRITICAL, config))
+        self.assertFalse(self.shedder.admit(DEFAULT, config))
+        self.assertTrue(self.shedder.admit(CRITICAL, config))
+
+        classes = self.shedder.metrics(config)["classes"]
+        self.assertEqual(classes[LOW]["shed"], 1)
+        self.assertEqual(classes[DEFAULT]["shed"], 1)
+        self.assertEqual(classes[CRITICAL]["in_flight"], 2)
+
+    @override_settings(LOAD_SHEDDING={**OVERLOADED, "MAX_QUEUE_TIME": {LOW: 5}})
+    def test_queued_request_admitted_when_slot_frees(self):
+        config = load_shedding_settings()
+        self.shedder.admit(LOW, config)
+        releaser = threading.Timer(0.1, self.shedder.release, args=(LOW, 0.1))
+        releaser.start()
+
+        self.assertTrue(self.shedder.admit(LOW, config))
+        self.assertGreater(self.shedder.metrics(config)["classes"][LOW]["queue_time_p95"], 0)
+
+
+@override_settings(LOAD_SHEDDING=OVERLOADED)
+class LoadSheddingMiddlewareTests(TestCase):
+    def setUp(self):
+        load_shedder.reset()
+        self.addCleanup(load_shedder.reset)
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Another request is in flight, so low-priority reads are over their share.
+        load_shedder.admit(CRITICAL, load_shedding_settings())
+
+    def test_browse_request_shed_with_retry_after(self):
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res["Retry-After"], "2")
+
+    async def test_browse_request_shed_under_asgi(self):
+        res = await self.async_client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, 503)
+
+    def test_order_creation_still_admitted(self):
+        res = self.client.post(ORDER_URL, {"tickets": []}, format="json")
+
+        self.assertEqual(res.status_code, 400)
+
+    def test_metrics_report_shed_requests(self):
+        self.client.get(FLIGHT_URL)
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser("admin@admin.com", "testpass")
+        )
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["classes"][LOW]["shed"], 1)
+        self.assertEqual(res.data["classes"][CRITICAL]["admitted"], 2)
@@ -0,0 +1,62 @@
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from airport.openapi import schema_cache, schema_fingerprint
+
+SCHEMA_URL = reverse("schema")
+
+
+class OpenApiSchemaTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        override = override_settings(OPENAPI_SCHEMA_DIR=self.directory.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        schema_cache.reset()
+        self.addCleanup(schema_cache.reset)
+
+    def test_schema_served_with_etag(self):
+        res = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "application/vnd.oai.openapi+json")
+        self.assertIn("/api/airport/flights/", json.loads(res.content)["paths"])
+
+        cached = self.client.get(
+            SCHEMA_URL, {"format": "json"}, HTTP_IF_NONE_MATCH=res["ETag"]
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_schema_served_compressed(self):
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(res["Content-Type"], "application/vnd.oai.openapi")
+        self.assertTrue(gzip.decompress(res.content).startswith(b"openapi:"))
+
+    def test_build_command_stores_schema_on_disk(self):
+        call_command("build_openapi_schema", stdout=StringIO())
+
+        stored = Path(self.directory.name) / f"openapi-{schema_fingerprint()}.json.gz"
+        self.assertTrue(stored.exists())
+
+        schema_cache.reset()
+        res = self.client.get(SCHEMA_URL, {"format": "json"})
+        self.assertEqual(res.content, gzip.decompress(stored.read_bytes()))
+
+    def test_stale_versions_are_replaced(self):
+        stale = Path(self.directory.name) / "openapi-0000000000000000.json.gz"
+        stale.write_bytes(gzip.compress(b"{}"))
+
+        res = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertIn("paths", json.loads(res.content))
+        self.assertFalse(stale.exists())
@@ -0,0 +1,193 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Flight,
+    Order,
+    OutboxDelivery,
+    OutboxEvent,
+    Route,
+    Ticket,
+)
+from airport.outbox import dispatch_batch, outbox_stats, publish
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class StubConsumer(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append(json.loads(body))
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class OutboxTests(TestCase):
+    @staticmethod
+    def start_consumer():
+        server = HTTPServer(("127.0.0.1", 0), StubConsumer)
+        server.received = []
+        server.status = 200
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://127.0.0.1:{server.server_port}/events"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server, cls.endpoint = cls.start_consumer()
+        cls.other_server, cls.other_endpoint = cls.start_consumer()
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in (cls.server, cls.other_server):
+            server.shutdown()
+            server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        for server in (self.server, self.other_server):
+            server.received.clear()
+            server.status = 200
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-20T10:00:00Z",
+            arrival_time="2023-07-20T15:00:00Z",
+        )
+
+    def test_order_creation_writes_event(self):
+        res = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        event = OutboxEvent.objects.get(event_type="order.created")
+        self.assertEqual(event.aggregate_id, res.data["id"])
+        self.assertEqual(event.payload["user"], self.user.id)
+        self.assertEqual(event.payload["tickets"][0]["flight"], self.flight.id)
+
+    def test_flight_changes_write_events(self):
+        flight_id = self.flight.id
+        self.flight.delete()
+
+        self.assertEqual(
+            list(
+                OutboxEvent.objects.filter(aggregate_id=flight_id).values_list(
+                    "event_type", flat=True
+                )
+            ),
+            ["flight.created", "flight.deleted"],
+        )
+
+    def test_ticket_and_order_deletions_write_events(self):
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(flight=self.flight, row=1, seat=1, order=order)
+        ticket_id, order_id = ticket.id, order.id
+        order.delete()
+
+        self.assertEqual(
+            OutboxEvent.objects.get(event_type="ticket.deleted").aggregate_id, ticket_id
+        )
+        self.assertEqual(
+            OutboxEvent.objects.get(event_type="order.deleted").aggregate_id, order_id
+        )
+
+    def test_dispatch_delivers_batch(self):
+        with override_settings(OUTBOX={"ENDPOINTS": [self.endpoint]}):
+            result = dispatch_batch(batch_size=100)
+
+        self.assertEqual(result["delivered"], 1)
+        self.assertEqual(len(self.server.received), 1)
+        events = self.server.received[0]["events"]
+        self.assertEqual(events[0]["type"], "flight.created")
+        self.assertEqual(events[0]["aggregate_id"], self.flight.id)
+        self.assertFalse(OutboxEvent.objects.filter(delivered_at__isnull=True).exists())
+
+    def test_failed_delivery_backs_off(self):
+        self.server.status = 503
+        with override_settings(OUTBOX={"ENDPOINTS": [self.endpoint], "BACKOFF_BASE": 10}):
+            with self.assertLogs("airport.outbox", "WARNING"):
+                result = dispatch_batch()
+            self.assertEqual(result["failed"], 1)
+            self.assertEqual(dispatch_batch()["claimed"], 0)
+
+        delivery = OutboxDelivery.objects.get()
+        self.assertEqual(delivery.attempts, 1)
+        self.assertIsNone(delivery.delivered_at)
+        self.assertIsNone(delivery.event.delivered_at)
+        self.assertIn("503", delivery.last_error)
+        self.assertGreater(delivery.available_at, timezone.now() + timedelta(seconds=5))
+
+    def test_endpoints_are_retried_independently(self):
+        self.other_server.status = 503
+        endpoints = [self.endpoint, self.other_endpoint]
+        with override_settings(OUTBOX={"ENDPOINTS": endpoints}):
+            with self.assertLogs("airport.outbox", "WARNING"):
+                result = dispatch_batch()
+            self.assertEqual((result["delivered"], result["failed"]), (1, 1))
+
+            self.other_server.status = 200
+            result = dispatch_batch(now=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual((result["claimed"], result["delivered"]), (1, 1))
+        self.assertEqual(len(self.server.received), 1)
+        self.assertEqual(len(self.other_server.received), 2)
+        self.assertIsNotNone(OutboxEvent.objects.get().delivered_at)
+
+    def test_events_wait_for_endpoints(self):
+        with override_settings(OUTBOX={"ENDPOINTS": []}):
+            self.assertEqual(dispatch_batch()["claimed"], 0)
+
+        self.assertTrue(OutboxEvent.objects.filter(delivered_at__isnull=True).exists())
+        with override_settings(OUTBOX={"ENDPOINTS": [self.endpoint]}):
+            self.assertEqual(dispatch_batch()["delivered"], 1)
+
+    def test_events_past_max_attempts_are_not_claimed(self):
+        OutboxDelivery.objects.create(
+            event=OutboxEvent.objects.get(), endpoint=self.endpoint, attempts=3
+        )
+        with override_settings(OUTBOX={"ENDPOINTS": [self.endpoint], "MAX_ATTEMPTS": 3}):
+            self.assertEqual(dispatch_batch()["claimed"], 0)
+            self.assertEqual(outbox_stats()["dead"], 1)
+
+    def test_dispatch_command_drains_outbox(self):
+        for i in range(5):
+            publish("test.event", "test", i, {"index": i})
+
+        with override_settings(OUTBOX={"ENDPOINTS": [self.endpoint]}):
+            call_command("dispatch_outbox", "--batch-size=2", stdout=StringIO())
+
+        self.assertEqual(
+            sum(len(batch["events"]) for batch in self.server.received), 6
+        )
+        self.assertEqual(outbox_stats()["pending"], 0)
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airport, Airplane, AirplaneType, Flight, Order, Route, Ticket
+from airport.pricing import compute_fares, reprice_upcoming_flights
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class ComputeFaresTests(TestCase):
+    def test_fares_grow_with_load_and_urgency(self):
+        fares = compute_fares(
+            distances=[1000, 1000, 1000],
+            seats_sold=[0, 50, 0],
+            capacities=[100, 100, 100],
+            days_to_departure=[60, 60, 1],
+        )
+
+        self.assertEqual(fares.shape, (3,))
+        self.assertGreater(fares[1], fares[0])
+        self.assertGreater(fares[2], fares[0])
+
+    def test_route_base_fare_replaces_global_base(self):
+        fares = compute_fares(
+            distances=[1000, 1000],
+            seats_sold=[0, 0],
+            capacities=[100, 100],
+            days_to_departure=[60, 60],
+            route_base_fares=[None, Decimal("100.00")],
+        )
+
+        # Same multiplier: (100 + 0.08 * 1000) / (20 + 0.08 * 1000).
+        self.assertAlmostEqual(fares[1] / fares[0], 1.8, places=2)
+
+    def test_empty_capacity_does_not_divide_by_zero(self):
+        fares = compute_fares([500], [0], [0], [10])
+
+        self.assertTrue(np.isfinite(fares).all())
+
+
+class RepricingTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        departure = timezone.now() + timedelta(days=30)
+        self.upcoming = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=5),
+        )
+        self.past = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure - timedelta(days=60),
+            arrival_time=departure - timedelta(days=60, hours=-5),
+        )
+
+    def test_reprice_only_upcoming_flights(self):
+        count = reprice_upcoming_flights()
+
+        self.upcoming.refresh_from_db()
+        self.past.refresh_from_db()
+        self.assertEqual(count, 1)
+        self.assertIsNotNone(self.upcoming.fare)
+        self.assertIsNone(self.past.fare)
+
+    def test_fare_only_reprice_runs_bounded_queries(self):
+        Flight.objects.bulk_create(
+            Flight(
+                route=self.upcoming.route,
+                airplane=self.upcoming.airplane,
+                departure_time=self.upcoming.departure_time + timedelta(days=day),
+                arrival_time=self.upcoming.arrival_time + timedelta(days=day),
+            )
+            for day in range(1, 21)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                count = reprice_upcoming_flights()
+
+        self.assertEqual(count, 21)
+        self.assertFalse(Flight.objects.filter(departure_time__gt=timezone.now(), fare=None))
+        # Pricing rows, one load/update/outbox/change-log round per batch,
+        # the board refresh; no load rollups per route and day.
+        self.assertLessEqual(len(queries), 8)
+
+    def test_order_total_uses_stored_quote(self):
+        Flight.objects.filter(id=self.upcoming.id).update(fare=Decimal("150.00"))
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": self.upcoming.id},
+                {"row": 1, "seat": 2, "flight": self.upcoming.id},
+            ]
+        }
+        res = client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.get().total_price, Decimal("300.00"))
+        self.assertEqual(Ticket.objects.count(), 2)
@@ -0,0 +1,89 @@
+from django.db import OperationalError
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import path
+
+from airport.middleware import QueryBudgetMiddleware
+from airport.models import Airport
+from airport.query_budget import QueryBudgetExceeded, budget_for, query_budget
+from airport.views import FlightViewSet
+
+
+@query_budget(max_queries=2)
+def chatty(request):
+    for _ in range(3):
+        Airport.objects.exists()
+    return JsonResponse({})
+
+
+@query_budget(max_db_time=0)
+def slow(request):
+    Airport.objects.exists()
+    return JsonResponse({})
+
+
+def unbudgeted(request):
+    for _ in range(3):
+        Airport.objects.exists()
+    return JsonResponse({})
+
+
+urlpatterns = [
+    path("chatty/", chatty),
+    path("slow/", slow),
+    path("unbudgeted/", unbudgeted),
+]
+
+
+class QueryCanceled(Exception):
+    pgcode = "57014"
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class QueryBudgetTests(TestCase):
+    @override_settings(QUERY_BUDGET={"ACTION": "raise"})
+    def test_too_many_queries_raise(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/chatty/")
+
+    @override_settings(QUERY_BUDGET={"ACTION": "raise"})
+    def test_too_much_db_time_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/slow/")
+
+    @override_settings(QUERY_BUDGET={"ACTION": "raise"})
+    def test_views_without_budget_are_not_limited(self):
+        self.assertEqual(self.client.get("/unbudgeted/").status_code, 200)
+
+    @override_settings(QUERY_BUDGET={"ACTION": "log", "SAMPLE_RATE": 1.0})
+    def test_log_action_reports_once_and_serves(self):
+        with self.assertLogs("airport.query_budget", "WARNING") as logs:
+            res = self.client.get("/chatty/")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("GET /chatty/ ran more than 2 queries", logs.output[0])
+
+    @override_settings(QUERY_BUDGET={"ACTION": "log", "SAMPLE_RATE": 0})
+    def test_log_action_samples(self):
+        with self.assertNoLogs("airport.query_budget", "WARNING"):
+            self.client.get("/chatty/")
+
+    def test_viewset_budget_is_resolved_per_action(self):
+        request = RequestFactory().get("/")
+
+        list_budget = budget_for(FlightViewSet.as_view({"get": "list"}), request)
+        update_budget = budget_for(FlightViewSet.as_view({"put": "update"}), request)
+
+        self.assertEqual(list_budget, FlightViewSet.query_budget["list"])
+        self.assertIsNone(update_budget)
+
+    def test_statement_timeout_answered_with_503(self):
+        error = OperationalError("canceling statement due to statement timeout")
+        error.__cause__ = QueryCanceled()
+        middleware = QueryBudgetMiddleware(lambda request: None)
+
+        with self.assertLogs("airport.middleware", "WARNING"):
+            res = middleware.process_exception(RequestFactory().get("/flights/"), error)
+
+        self.assertEqual(res.status_code, 503)
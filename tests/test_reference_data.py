@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Order, Route, Ticket
+from airport.reference_data import (
+    REFERENCE_TABLES,
+    ReferenceTable,
+    airports,
+    warm_reference_data,
+)
+
+REFERENCE_SQL = ('FROM "airport_airport"', 'FROM "airport_airplane"', 'FROM "airport_crew"')
+
+
+def reference_queries(queries):
+    return [
+        query["sql"]
+        for query in queries
+        if any(table in query["sql"] for table in REFERENCE_SQL)
+    ]
+
+
+class ReferenceDataTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        for table in REFERENCE_TABLES.values():
+            table.reset()
+            self.addCleanup(table.reset)
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        route = Route.objects.create(source=self.source, destination=destination, distance=1000)
+        airplane = Airplane.objects.create(
+            name="Airplane-1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type1"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-20T06:00:00Z",
+            arrival_time="2023-07-20T09:00:00Z",
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, row=1, seat=1, order=order)
+        warm_reference_data()
+
+    def test_flight_and_route_lists_do_not_query_reference_data(self):
+        with CaptureQueriesContext(connection) as queries:
+            flights = self.client.get(reverse("airport:flight-list"))
+            routes = self.client.get(reverse("airport:route-list"))
+
+        self.assertEqual(reference_queries(queries), [])
+        self.assertEqual(flights.data[0]["route_source"], "Test-1")
+        self.assertEqual(flights.data[0]["airplane_name"], "Airplane-1")
+        self.assertEqual(routes.data[0]["destination"], "Test-2")
+
+    def test_order_list_does_not_query_reference_data(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(reverse("airport:order-list"))
+
+        self.assertEqual(reference_queries(queries), [])
+        self.assertEqual(res.data["results"][0]["tickets"][0]["flight"]["route_source"], "Test-1")
+
+    def test_ticket_validation_uses_cached_airplane(self):
+        ticket = Ticket(flight=Flight.objects.get(), row=2, seat=1, order=Order.objects.get())
+
+        with CaptureQueriesContext(connection) as queries:
+            ticket.clean()
+
+        self.assertEqual(reference_queries(queries), [])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "test_cache",
+            }
+        }
+    )
+    def test_warm_lookups_do_not_query_database_cache(self):
+        call_command("createcachetable", verbosity=0)
+        for table in REFERENCE_TABLES.values():
+            table.reset()
+        warm_reference_data()
+        ticket = Ticket(flight=Flight.objects.get(), row=2, seat=1, order=Order.objects.get())
+
+        with self.assertNumQueries(0):
+            ticket.clean()
+            self.assertEqual(airports.get(self.source.id).name, "Test-1")
+
+    @override_settings(SCHEDULE_VERSION_CHECK_SECONDS=0)
+    def test_other_workers_reload_after_change(self):
+        other_worker = ReferenceTable(Airport)
+        self.assertEqual(other_worker.get(self.source.id).closest_big_city, "Kyiv")
+
+        self.source.closest_big_city = "Boryspil"
+        self.source.save()
+
+        self.assertEqual(other_worker.get(self.source.id).closest_big_city, "Boryspil")
+
+    def test_uncommitted_rows_are_not_cached(self):
+        class Rollback(Exception):
+            pass
+
+        try:
+            with transaction.atomic():
+                added = Airport.objects.create(name="Test-3", closest_big_city="Porto")
+                self.assertEqual(airports.get(added.id), added)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.assertIsNone(airports.get(added.id))
@@ -0,0 +1,52 @@
+import msgpack
+import orjson
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airport
+
+AIRPORT_URL = reverse("airport:airport-list")
+
+
+class RendererTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        Airport.objects.create(name="Test", closest_big_city="Kyiv")
+
+    def test_json_is_default(self):
+        res = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(orjson.loads(res.content)[0]["name"], "Test")
+
+    def test_msgpack_selected_by_accept_header(self):
+        res = self.client.get(AIRPORT_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.content)[0]["name"], "Test")
+
+    @override_settings(GZIP_MIN_LENGTH=10)
+    def test_large_body_is_gzipped(self):
+        Airport.objects.bulk_create(
+            Airport(name=f"Airport-{i}", closest_big_city="Kyiv") for i in range(20)
+        )
+
+        res = self.client.get(AIRPORT_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+
+    def test_small_body_is_not_gzipped(self):
+        res = self.client.get(AIRPORT_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertFalse(res.has_header("Content-Encoding"))
@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.pricing import reprice_upcoming_flights
+
+
+def calendar_url(route_id):
+    return reverse("airport:route-calendar", args=[route_id])
+
+
+class RouteCalendarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        self.route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        small = Airplane.objects.create(
+            name="Airplane-1", rows=5, seats_in_row=4, airplane_type=airplane_type
+        )
+        large = Airplane.objects.create(
+            name="Airplane-2", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.morning = Flight.objects.create(
+            route=self.route,
+            airplane=large,
+            departure_time="2023-07-20T06:00:00Z",
+            arrival_time="2023-07-20T09:00:00Z",
+            fare=Decimal("120.00"),
+        )
+        self.evening = Flight.objects.create(
+            route=self.route,
+            airplane=small,
+            departure_time="2023-07-20T18:00:00Z",
+            arrival_time="2023-07-20T21:00:00Z",
+            fare=Decimal("90.00"),
+        )
+        self.order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.evening, row=1, seat=1, order=self.order)
+
+    def test_calendar_covers_month(self):
+        res = self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        days = res.data["days"]
+        self.assertEqual(len(days), 31)
+        self.assertEqual(days[0]["flights"], 0)
+        self.assertIsNone(days[0]["min_tickets_available"])
+
+        day = days[19]
+        self.assertEqual(str(day["date"]), "2023-07-20")
+        self.assertEqual(day["flights"], 2)
+        self.assertEqual(day["min_tickets_available"], 19)
+        self.assertEqual(day["min_fare"], Decimal("90.00"))
+        self.morning.refresh_from_db()
+        self.assertEqual(day["earliest_departure"], self.morning.departure_time)
+
+    def test_cached_calendar_skips_grouped_query(self):
+        self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+
+        with self.assertNumQueries(1):
+            res = self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+        self.assertEqual(res.data["days"][19]["flights"], 2)
+
+    def test_ticket_write_invalidates_month(self):
+        self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(flight=self.evening, row=1, seat=2, order=self.order)
+
+        res = self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+        self.assertEqual(res.data["days"][19]["min_tickets_available"], 18)
+
+    def test_flight_move_invalidates_both_months(self):
+        self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+        self.client.get(calendar_url(self.route.id), {"month": "2023-08"})
+
+        self.evening.departure_time = "2023-08-01T18:00:00Z"
+        self.evening.arrival_time = "2023-08-01T21:00:00Z"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evening.save()
+
+        july = self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+        august = self.client.get(calendar_url(self.route.id), {"month": "2023-08"})
+        self.assertEqual(july.data["days"][19]["flights"], 1)
+        self.assertEqual(august.data["days"][0]["flights"], 1)
+
+    def test_repricing_invalidates_month(self):
+        self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reprice_upcoming_flights(now=datetime(2023, 7, 1, tzinfo=timezone.utc))
+
+        res = self.client.get(calendar_url(self.route.id), {"month": "2023-07"})
+        self.morning.refresh_from_db()
+        self.evening.refresh_from_db()
+        self.assertEqual(
+            res.data["days"][19]["min_fare"], min(self.morning.fare, self.evening.fare)
+        )
+        self.assertNotEqual(res.data["days"][19]["min_fare"], Decimal("90.00"))
+
+    def test_invalid_month_rejected(self):
+        res = self.client.get(calendar_url(self.route.id), {"month": "July"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
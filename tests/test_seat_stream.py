@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import (
+    Airport,
+    Airplane,
+    AirplaneType,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.seat_stream import seat_broker, seat_events
+
+
+def stream_url(flight_id):
+    return reverse("airport:flight-seat-stream", args=[flight_id])
+
+
+def parse_event(chunk):
+    lines = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+class SeatStreamTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        source = Airport.objects.create(name="Test-1", closest_big_city="Kyiv")
+        destination = Airport.objects.create(name="Test-2", closest_big_city="Lisbon")
+        route = Route.objects.create(source=source, destination=destination, distance=1000)
+        airplane_type = AirplaneType.objects.create(name="Type1")
+        airplane = Airplane.objects.create(
+            name="Airplane-1", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2023-07-20T10:00:00Z",
+            arrival_time="2023-07-20T15:00:00Z",
+        )
+        self.order = Order.objects.create(user=self.user)
+        self.ticket = Ticket.objects.create(flight=self.flight, row=1, seat=1, order=self.order)
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    def test_stream_requires_authentication(self):
+        res = APIClient().get(stream_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_flight_returns_404(self):
+        res = APIClient().get(stream_url(999999), headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(seat_broker.subscriber_count(999999), 0)
+
+    def book(self, row, seat):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Ticket.objects.create(flight=self.flight, row=row, seat=seat, order=self.order)
+
+    def cancel(self, ticket):
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.delete()
+
+    async def test_stream_pushes_snapshot_and_deltas(self):
+        res = await AsyncClient().get(stream_url(self.flight.id), headers=self.headers)
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        events = res.streaming_content
+
+        event, data = parse_event(await events.__anext__())
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(data["tickets_available"], 59)
+        self.assertEqual(data["taken_places"], [{"row": 1, "seat": 1}])
+
+        await sync_to_async(self.book)(2, 3)
+        await sync_to_async(self.cancel)(self.ticket)
+
+        event, data = parse_event(await asyncio.wait_for(events.__anext__(), 2))
+        self.assertEqual(event, "seats")
+        self.assertEqual(data["taken"], [{"row": 2, "seat": 3}])
+        self.assertEqual(data["released"], [{"row": 1, "seat": 1}])
+        self.assertEqual(data["tickets_available"], 59)
+
+        await sync_to_async(res.close)()
+        self.assertEqual(seat_broker.subscriber_count(self.flight.id), 0)
+
+    async def test_cancelled_stream_drops_subscription(self):
+        subscription = seat_broker.subscribe(self.flight.id)
+        events = seat_events(self.flight.id, subscription, 60, {})
+        await events.__anext__()
+        waiting = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        self.assertEqual(seat_broker.subscriber_count(self.flight.id), 1)
+
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+        self.assertEqual(seat_broker.subscriber_count(self.flight.id), 0)
@@ -0,0 +1,83 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport.models import Airport, AirplaneType, Flight, Order, Route, SeedFixture
+from airport.seeding import seed_fixture
+
+FIXTURE = [
+    {"model": "airport.airport", "pk": 1, "fields": {"name": "Boryspil", "closest_big_city": "Kyiv"}},
+    {"model": "airport.airport", "pk": 2, "fields": {"name": "Heathrow", "closest_big_city": "London"}},
+    {"model": "airport.route", "pk": 1, "fields": {"source": 1, "destination": 2, "distance": 2100}},
+    {"model": "airport.flight", "pk": 1, "fields": {
+        "route": 1, "airplane": 1, "departure_time": "2023-12-13T10:00:00Z",
+        "arrival_time": "2023-12-13T14:00:00Z", "crews": [1],
+    }},
+    {"model": "airport.crew", "pk": 1, "fields": {"first_name": "John", "last_name": "Smith"}},
+    {"model": "airport.airplanetype", "pk": 1, "fields": {"name": "Boeing 747"}},
+    {"model": "airport.airplane", "pk": 1, "fields": {
+        "name": "Flight King", "rows": 20, "seats_in_row": 6, "airplane_type": 1,
+    }},
+    {"model": "airport.order", "pk": 1, "fields": {"created_at": "2023-12-13T12:30:00Z", "user": 1}},
+    {"model": "user.user", "pk": 1, "fields": {
+        "password": "", "email": "admin@admin.com", "is_staff": True,
+        "date_joined": "2023-01-24T09:39:39Z", "groups": [], "user_permissions": [],
+    }},
+]
+
+
+class SeedDataTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "seed.json"
+        self.write(FIXTURE)
+
+    def write(self, objects):
+        self.path.write_text(json.dumps(objects))
+
+    def test_fixture_is_applied_and_recorded(self):
+        self.assertEqual(seed_fixture(self.path), len(FIXTURE))
+
+        flight = Flight.objects.get()
+        self.assertEqual(flight.route.source.name, "Boryspil")
+        self.assertEqual(list(flight.crews.values_list("last_name", flat=True)), ["Smith"])
+        self.assertEqual(Order.objects.get().created_at.isoformat(), "2023-12-13T12:30:00+00:00")
+        self.assertEqual(SeedFixture.objects.get().name, "seed.json")
+
+    def test_unchanged_fixture_is_skipped_with_one_query(self):
+        seed_fixture(self.path)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(seed_fixture(self.path))
+
+    def test_changed_fixture_is_upserted_on_natural_keys(self):
+        existing = Airport.objects.create(name="Heathrow", closest_big_city="Unknown")
+        AirplaneType.objects.create(name="Boeing 747")
+        seed_fixture(self.path)
+
+        changed = json.loads(json.dumps(FIXTURE))
+        changed[1]["fields"]["closest_big_city"] = "Greater London"
+        changed[2]["fields"]["distance"] = 2150
+        self.write(changed)
+        seed_fixture(self.path)
+
+        self.assertEqual(Airport.objects.count(), 2)
+        self.assertEqual(AirplaneType.objects.count(), 1)
+        existing.refresh_from_db()
+        self.assertEqual(existing.closest_big_city, "Greater London")
+        route = Route.objects.get()
+        self.assertEqual(route.destination, existing)
+        self.assertEqual(route.distance, 2150)
+
+    def test_command_reports_skipped_fixtures(self):
+        out = StringIO()
+        call_command("seed_data", str(self.path), stdout=out)
+        call_command("seed_data", str(self.path), stdout=out)
+
+        self.assertIn(f"Applied {len(FIXTURE)} objects", out.getvalue())
+        self.assertIn("unchanged", out.getvalue())